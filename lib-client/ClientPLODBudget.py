@@ -0,0 +1,134 @@
+#!/usr/bin/python
+
+## @file
+# Contains class ClientPLODBudgetController.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+from avango.script import field_has_changed
+
+# import framework libraries
+from PLODBudget import PLODBudget, PLODBudgetAdjuster
+
+## Adjusts the PLOD budgets of this client to its own frame times and main memory.
+# The server distributes the name of the active scene, the target frame rate, a starting budget and the
+# budget limits in the name of the node below /net/plod_budget. Every scene starts with the distributed
+# budget and keeps the budget it was tuned to on this client when another scene is activated.
+class ClientPLODBudgetController(avango.script.Script):
+
+  ## @var sf_budget_string
+  # String field containing the budget values distributed by the server.
+  sf_budget_string = avango.SFString()
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(ClientPLODBudgetController).__init__()
+
+  ## Custom constructor.
+  # @param SCENEGRAPH Reference to the client scenegraph.
+  def my_constructor(self, SCENEGRAPH):
+
+    ## @var SCENEGRAPH
+    # Reference to the client scenegraph.
+    self.SCENEGRAPH = SCENEGRAPH
+
+    ## @var connected
+    # Boolean saying if sf_budget_string is connected to the distributed node.
+    self.connected = False
+
+    ## @var loader
+    # PLODLoader used to apply the budgets to the PLOD renderer. Created with the first budget.
+    self.loader = None
+
+    ## @var adjuster
+    # PLODBudgetAdjuster measuring the frame times or None if no budget was distributed yet.
+    self.adjuster = None
+
+    ## @var scene_name
+    # Name of the active scene with point clouds or None.
+    self.scene_name = None
+
+    ## @var min_budget
+    # PLODBudget with the lower limits.
+    self.min_budget = None
+
+    ## @var max_budget
+    # PLODBudget with the upper limits.
+    self.max_budget = None
+
+    ## @var scene_budgets
+    # Dictionary mapping scene names to the PLODBudgets they were tuned to on this client.
+    self.scene_budgets = {}
+
+    ## @var applied_budget
+    # The PLODBudget currently set on the loader or None.
+    self.applied_budget = None
+
+    ## @var frame_trigger
+    # Triggers framewise evaluation of frame_callback method.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = True)
+
+  ## Called whenever sf_budget_string changes.
+  @field_has_changed(sf_budget_string)
+  def sf_budget_string_changed(self):
+
+    if self.sf_budget_string.value == "":
+      self.scene_name = None
+      return
+
+    _splitted_string = self.sf_budget_string.value.split("#")
+
+    self.scene_name = _splitted_string[0]
+    self.min_budget = PLODBudget.from_string(_splitted_string[3])
+    self.max_budget = PLODBudget.from_string(_splitted_string[4])
+
+    if self.scene_name not in self.scene_budgets:
+      self.scene_budgets[self.scene_name] = PLODBudget.from_string(_splitted_string[2])
+
+    if self.loader == None:
+      self.loader = avango.gua.nodes.PLODLoader()
+      self.adjuster = PLODBudgetAdjuster(float(_splitted_string[1]))
+
+    self.adjuster.reset()
+    self.apply_budget(self.scene_budgets[self.scene_name])
+
+  ## Evaluated every frame. Connects to the distributed node and adjusts the budget of the active scene.
+  def frame_callback(self):
+
+    if self.connected == False:
+
+      try:
+        _info_node = self.SCENEGRAPH["/net/plod_budget"].Children.value[0]
+      except:
+        return
+
+      self.sf_budget_string.connect_from(_info_node.Name)
+      self.connected = True
+
+    if self.scene_name == None:
+      return
+
+    if self.adjuster.measure_frame() == True:
+      self.scene_budgets[self.scene_name] = self.adjuster.adjust(self.scene_budgets[self.scene_name], self.min_budget, self.max_budget)
+      self.apply_budget(self.scene_budgets[self.scene_name])
+
+  ## Sets a budget on the loader, touching only the values which changed.
+  # @param BUDGET The PLODBudget to be applied.
+  def apply_budget(self, BUDGET):
+
+    _upload = int(BUDGET.upload)
+    _render = int(BUDGET.render)
+    _out_of_core = int(BUDGET.out_of_core)
+
+    if self.applied_budget == None or self.applied_budget.upload != _upload:
+      self.loader.UploadBudget.value = _upload
+
+    if self.applied_budget == None or self.applied_budget.render != _render:
+      self.loader.RenderBudget.value = _render
+
+    if self.applied_budget == None or self.applied_budget.out_of_core != _out_of_core:
+      self.loader.OutOfCoreBudget.value = _out_of_core
+
+    self.applied_budget = PLODBudget(_upload, _render, _out_of_core)
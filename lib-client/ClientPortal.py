@@ -11,6 +11,7 @@ from avango.script import field_has_changed
 
 # import framework libraries
 from ConsoleIO import *
+from GroupNameRegistry import group_name_registry
 
 # import python libraries
 import math
@@ -228,7 +229,7 @@ class PortalPreView(avango.script.Script):
     self.camera.LeftEye.value = self.left_eye_node.Path.value
     self.camera.RightEye.value = self.right_eye_node.Path.value
 
-    self.camera.RenderMask.value = "(main_scene | " + self.SERVER_PORTAL_NODE.Name.value + "_" + self.transformed_head_node.Name.value + ") && !do_not_display_group && !portal_invisible_group"
+    self.camera.RenderMask.value = group_name_registry.build_render_mask([group_name_registry.get_token(self.SERVER_PORTAL_NODE.Name.value + "_" + self.transformed_head_node.Name.value)])
 
     ## @var pipeline
     # The pipeline used to render this PortalPreView. 
@@ -285,7 +286,7 @@ class PortalPreView(avango.script.Script):
                                                            Width = self.screen_node.Width.value,
                                                            Height = self.screen_node.Height.value
                                                            )
-    self.textured_quad.GroupNames.value = ["w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id)]
+    self.textured_quad.GroupNames.value = [group_name_registry.get_user_token(VIEW.workspace_id, VIEW.display_group_id, VIEW.user_id)]
     self.portal_matrix_node.Children.value.append(self.textured_quad)
 
 
@@ -293,14 +294,14 @@ class PortalPreView(avango.script.Script):
     # Geometry being displayed when portal pre view is seen from behind.
     self.back_geometry = _loader.create_geometry_from_file("back_w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id), "data/objects/plane.obj", "data/materials/ShadelessBlue.gmd", avango.gua.LoaderFlags.DEFAULTS)
     self.back_geometry.Transform.value = avango.gua.make_trans_mat(0.0, 0.0, -0.001) * avango.gua.make_rot_mat(90, 1, 0, 0) * avango.gua.make_scale_mat(self.screen_node.Width.value, 1.0, self.screen_node.Height.value)
-    self.back_geometry.GroupNames.value = ["portal_invisible_group", "w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id)]
+    self.back_geometry.GroupNames.value = ["portal_invisible_group", group_name_registry.get_user_token(VIEW.workspace_id, VIEW.display_group_id, VIEW.user_id)]
     self.portal_matrix_node.Children.value.append(self.back_geometry)
 
     ## @var portal_border
     # Geometry node containing the portal's frame.
     self.portal_border = _loader.create_geometry_from_file("border_w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id), "data/objects/screen.obj", "data/materials/ShadelessBlue.gmd", avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.LOAD_MATERIALS)
     self.portal_border.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.portal_border.GroupNames.value = ["w" + str(VIEW.workspace_id) + "_dg" + str(VIEW.display_group_id) + "_u" + str(VIEW.user_id)]
+    self.portal_border.GroupNames.value = [group_name_registry.get_user_token(VIEW.workspace_id, VIEW.display_group_id, VIEW.user_id)]
     self.portal_border.Transform.value = avango.gua.make_scale_mat(self.screen_node.Width.value, self.screen_node.Height.value, 1.0)
     self.portal_matrix_node.Children.value.append(self.portal_border)
 
@@ -390,7 +391,7 @@ class PortalPreView(avango.script.Script):
   def evaluate(self):
 
     # trigger frame callback activity
-    _server_view_node_name = "w" + str(self.VIEW.workspace_id) + "_dg" + str(self.VIEW.display_group_id) + "_u" + str(self.VIEW.user_id)
+    _server_view_node_name = group_name_registry.get_user_token(self.VIEW.workspace_id, self.VIEW.display_group_id, self.VIEW.user_id)
 
     if (len(self.portal_matrix_node.GroupNames.value) != 0 and \
        (_server_view_node_name) not in self.portal_matrix_node.GroupNames.value) or \
@@ -0,0 +1,44 @@
+#!/usr/bin/python
+
+## @file
+# Contains class ClientReadinessNotifier.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+import avango.script
+
+# import framework libraries
+from ClientLauncher import READY_MESSAGE
+
+## Reports on the standard output once the distributed scenegraph of the server has arrived.
+# The server's ClientLauncher reads this message to know when the client is ready.
+class ClientReadinessNotifier(avango.script.Script):
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(ClientReadinessNotifier).__init__()
+
+  ## Custom constructor.
+  # @param SCENEGRAPH Reference to the client scenegraph.
+  def my_constructor(self, SCENEGRAPH):
+
+    ## @var SCENEGRAPH
+    # Reference to the client scenegraph.
+    self.SCENEGRAPH = SCENEGRAPH
+
+    ## @var frame_trigger
+    # Triggers framewise evaluation of frame_callback method.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = True)
+
+  ## Evaluated every frame until the connection is setup.
+  def frame_callback(self):
+
+    try:
+      _pipeline_values_node = self.SCENEGRAPH["/net/pipeline_values"]
+    except:
+      return
+
+    if _pipeline_values_node != None:
+      print(READY_MESSAGE, flush = True)
+      self.frame_trigger.Active.value = False
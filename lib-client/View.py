@@ -14,6 +14,7 @@ from avango.script import field_has_changed
 from ClientTrackingReader import *
 from ClientPortal import *
 from ConsoleIO import *
+from GroupNameRegistry import group_name_registry
 
 # import python libraries
 import time
@@ -96,7 +97,7 @@ class View(avango.script.Script):
     self.camera.Mode.value = DISPLAY_INSTANCE.cameramode
 
     # set render mask for camera
-    _render_mask = "(main_scene | w" + str(WORKSPACE_ID) + "_dg" + str(DISPLAY_GROUP_ID) + "_u" + str(USER_ID) + ") && !do_not_display_group && !portal_invisible_group"
+    _render_mask = group_name_registry.build_render_mask([group_name_registry.get_user_token(WORKSPACE_ID, DISPLAY_GROUP_ID, USER_ID)])
     self.camera.RenderMask.value = _render_mask
     #print repr(self.camera.RenderMask.value)
 
@@ -13,6 +13,9 @@ import avango.oculus
 import ClientMaterialUpdaters
 from View import *
 from ClientPortal import *
+from ClientReadiness import *
+from ClientPLODBudget import *
+import MaterialPreloader
 from examples_common.GuaVE import GuaVE
 
 # import python libraries
@@ -54,8 +57,7 @@ def start():
   print("It is responsible for workspace", workspace_id, ", display group", display_group_id, "and screen", screen_id)
 
   # preload materials and shading models
-  avango.gua.load_shading_models_from("data/materials")
-  avango.gua.load_materials_from("data/materials")
+  MaterialPreloader.preload_materials(workspace_config_file)
   
   # create distribution node
   nettrans = avango.gua.nodes.NetTransform(
@@ -70,9 +72,6 @@ def start():
   graph.Root.value.Children.value = [nettrans]
 
   # create material updaters as this cannot be distributed
-  avango.gua.load_shading_models_from("data/materials")
-  avango.gua.load_materials_from("data/materials")
-  
   timer = avango.nodes.TimeSensor()
   
   water_updater = ClientMaterialUpdaters.TimedMaterialUniformUpdate()
@@ -185,6 +184,14 @@ def start():
   portal_manager = ClientPortalManager()
   portal_manager.my_constructor(graph, views)
 
+  # report to the server once the distributed scenegraph has arrived
+  readiness_notifier = ClientReadinessNotifier()
+  readiness_notifier.my_constructor(graph)
+
+  # adjust the PLOD budgets distributed by the server to the frame times of this client
+  plod_budget_controller = ClientPLODBudgetController()
+  plod_budget_controller.my_constructor(graph)
+
   shell_client = GuaVE()
   shell_client.start(locals(), globals())
 
@@ -14,11 +14,86 @@ from   examples_common.GuaVE import GuaVE
 from   ConsoleIO import *
 from   scene_config import scenegraphs
 from   Video3D import *
+from   ClientLauncher import *
+from   StartupProfiler import startup_profiler
+from   ButtonEvents import button_event_dispatcher
+from   GroupNameRegistry import group_name_registry
+from   HeadlessRunner import HeadlessRunner
 
 # import python libraries
+import functools
+import math
 import os
 import subprocess
-import time
+
+## Helper class caching the inverse portal matrix and a bounding sphere of a transit portal.
+# Both are only recomputed when the portal matrix changes.
+class PortalTransitCache(avango.script.Script):
+
+  ## @var sf_portal_matrix
+  # Field connected to the portal matrix node's Transform field.
+  sf_portal_matrix = avango.gua.SFMatrix4()
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(PortalTransitCache).__init__()
+
+  ## Custom constructor.
+  # @param PORTAL The Portal instance to cache the transformations for.
+  def my_constructor(self, PORTAL):
+
+    ## @var PORTAL
+    # The Portal instance to cache the transformations for.
+    self.PORTAL = PORTAL
+
+    ## @var inverse_portal_matrix
+    # Inverse of the portal matrix, transforms world coordinates into portal space.
+    self.inverse_portal_matrix = avango.gua.make_identity_mat()
+
+    ## @var center
+    # World position of the portal center.
+    self.center = avango.gua.Vec3(0.0, 0.0, 0.0)
+
+    ## @var radius
+    # World space radius of the bounding sphere around the portal rectangle.
+    self.radius = 0.0
+
+    ## @var cached_size
+    # Portal size the radius was computed for.
+    self.cached_size = None
+
+    self.update_cache(PORTAL.portal_matrix_node.Transform.value)
+    self.sf_portal_matrix.connect_from(PORTAL.portal_matrix_node.Transform)
+
+  ## Called whenever sf_portal_matrix changes.
+  @field_has_changed(sf_portal_matrix)
+  def sf_portal_matrix_changed(self):
+    self.update_cache(self.sf_portal_matrix.value)
+
+  ## Recomputes the inverse portal matrix and the bounding sphere center.
+  # @param PORTAL_MATRIX The current portal matrix.
+  def update_cache(self, PORTAL_MATRIX):
+
+    self.inverse_portal_matrix = avango.gua.make_inverse_mat(PORTAL_MATRIX)
+    self.center = PORTAL_MATRIX.get_translate()
+
+    _scale = PORTAL_MATRIX.get_scale()
+
+    ## @var scale
+    # Largest scale factor of the portal matrix.
+    self.scale = max(abs(_scale.x), abs(_scale.y), abs(_scale.z))
+    self.cached_size = None
+
+  ## Returns a boolean saying if a point can be close enough to the portal to transit it.
+  # @param POS World position to be checked.
+  # @param MARGIN Additional world space distance to be tolerated, e.g. the length of the movement direction.
+  def may_transit(self, POS, MARGIN):
+
+    if self.cached_size != self.PORTAL.size:
+      self.cached_size = self.PORTAL.size
+      self.radius = self.scale * math.sqrt((self.cached_size[0] / 2) ** 2 + (self.cached_size[1] / 2) ** 2)
+
+    return (POS - self.center).length() <= self.radius + MARGIN
 
 ## Class to build the scenegraph from the Workspaces, Display Groups and Users created.
 # Builds a server control monitor for debugging purposes.
@@ -94,17 +169,9 @@ class ApplicationManager(avango.script.Script):
     # Boolean saying if the client processes are to be started automatically.
     self.start_clients = START_CLIENTS
 
-    # kill all running python processes on display hosts
-    if self.start_clients:
-      _own_hostname = open('/etc/hostname', 'r').readline().strip(" \n")
-
-      for _workspace in workspaces:
-        for _display_group in _workspace.display_groups:
-          for _display in _display_group.displays:
-
-            if _display.hostname != _own_hostname:
-              _ssh_kill = subprocess.Popen(["ssh", _display.hostname, "killall python -9"], universal_newlines=True)
-
+    ## @var headless_runner
+    # HeadlessRunner driving the application loop without server control monitor or None if the monitor is rendered.
+    self.headless_runner = HeadlessRunner.create_from_environment(self.viewer)
 
     # viewing setup and start of client processes #
 
@@ -126,7 +193,24 @@ class ApplicationManager(avango.script.Script):
       # get directory name
       _directory_name = os.path.dirname(os.path.dirname(__file__))
 
+      ## @var client_launcher
+      # ClientLauncher instance killing and starting the client processes on all display hosts in parallel.
+      self.client_launcher = ClientLauncher()
+
+      # kill all running python processes on display hosts
+      _display_hostnames = []
+
+      for _workspace in workspaces:
+        for _display_group in _workspace.display_groups:
+          for _display in _display_group.displays:
+
+            if _display.hostname != _hostname:
+              _display_hostnames.append(_display.hostname)
+
+      self.client_launcher.kill_all(_display_hostnames)
+
     else:
+      self.client_launcher = None
       print_warning("Start of clients disabled for debugging reasons.")
 
     ## @var workspaces
@@ -138,17 +222,14 @@ class ApplicationManager(avango.script.Script):
     # Navigation instances which are switchable to by a button press on the device.
     self.requestable_navigations = []
 
-    ## @var requestable_navigations_last_button_states
-    # Last button states of the request buttons of requestable navigations to detect changes.
-    self.requestable_navigations_last_button_states = []
-
     ## @var workspace_navigations
     # List of all Navigation instances associated to display groups in a physical workspace.
     # Used for portal teleportation checks.
     self.workspace_navigations = []
 
     ## @var transit_portals
-    # List of Portal instances that have the transitable flag set true.
+    # List of tuples of portal display group, Portal instance, first virtual user representation
+    # and PortalTransitCache for all portals that have the transitable flag set true.
     self.transit_portals = []
 
     ## @var portal_display_groups
@@ -196,22 +277,25 @@ class ApplicationManager(avango.script.Script):
 
             self.workspace_navigations.append(_navigation)
 
-            if _navigation.is_requestable == True:
+            if _navigation.is_requestable == True and (_workspace, _display_group, _navigation) not in self.requestable_navigations:
               self.requestable_navigations.append( (_workspace, _display_group, _navigation) )
-              self.requestable_navigations_last_button_states.append(False)
+              button_event_dispatcher.subscribe(_navigation.sf_request_trigger
+                                              , ON_PRESS = functools.partial(self.handle_navigation_request, _workspace, _display_group, _navigation))
 
           # create view transform node only when free slot is availa
           _view_transform_node = avango.gua.nodes.TransformNode(Name = "w" + str(_w_id) + "_dg" + str(_dg_id) + "_u" + str(_u_id))
           self.NET_TRANS_NODE.Children.value.append(_view_transform_node)
 
           # create user representation in display group
-          _user_repr = _user.create_user_representation_for(_display_group
-                                                          , _view_transform_node)
+          with startup_profiler.phase("user representation " + _view_transform_node.Name.value, _view_transform_node):
+            _user_repr = _user.create_user_representation_for(_display_group
+                                                            , _view_transform_node)
           ApplicationManager.all_user_representations.append(_user_repr)
 
           # create tool representation in display_group
           for _tool in _workspace.tools:
-            _tool_repr = _tool.create_tool_representation_for(_display_group, _user_repr)
+            with startup_profiler.phase("tool representation " + _view_transform_node.Name.value + " tool " + str(_workspace.tools.index(_tool)), _user_repr.view_transform_node):
+              _tool_repr = _tool.create_tool_representation_for(_display_group, _user_repr)
 
             # register portal display groups if this tool representation is a PortalCameraRepresentation
             try:
@@ -238,19 +322,20 @@ class ApplicationManager(avango.script.Script):
 
               if _display.hostname != _hostname:
 
-                # run client process on host
+                # register client process on host
                 # command line parameters: server ip, platform id, display name, screen number
-                _ssh_run = subprocess.Popen(["ssh", _display.hostname, _directory_name + \
+                self.client_launcher.add_client(_display.name, _display.hostname, _directory_name + \
                 "/start-client.sh " + _server_ip + " " + str(WORKSPACE_CONFIG) + " " + str(_w_id) + " " + \
-                str(_dg_id) + " " + str(_s_id) + " " + _display.name]
-                , stderr=subprocess.PIPE, universal_newlines=True)
-                time.sleep(1)
-
-                #print("ssh", _display.hostname, _directory_name + \
-                #"/start-client.sh " + _server_ip + " " + str(WORKSPACE_CONFIG) + " " + str(_w_id) + " " + \
-                #str(_dg_id) + " " + str(_s_id) + " " + _display.name)
+                str(_dg_id) + " " + str(_s_id) + " " + _display.name)
 
+    # start all client processes at once
+    if START_CLIENTS:
+      self.client_launcher.launch_all()
+      print_message("Started " + str(len(self.client_launcher.clients)) + " client processes.")
 
+    ## @var clients_ready_reported
+    # Boolean saying if the readiness of all client processes was already reported.
+    self.clients_ready_reported = False
 
 
     ## Handle virtual viewing setups ##
@@ -281,12 +366,13 @@ class ApplicationManager(avango.script.Script):
             _complex = False
 
 
-          _virtual_user_repr = _physical_user_repr.USER.create_user_representation_for(
-                               _display_group
-                             , _display.scene_matrix_node
-                             , _display_index
-                             , 'head_' + _physical_user_repr.view_transform_node.Name.value
-                             , _complex)
+          with startup_profiler.phase("virtual user representation " + _display.name + " head_" + _physical_user_repr.view_transform_node.Name.value, _display.scene_matrix_node):
+            _virtual_user_repr = _physical_user_repr.USER.create_user_representation_for(
+                                 _display_group
+                               , _display.scene_matrix_node
+                               , _display_index
+                               , 'head_' + _physical_user_repr.view_transform_node.Name.value
+                               , _complex)
 
           _virtual_user_repr.add_dependent_node(_physical_user_repr.head)
           _virtual_user_repr.add_existing_screen_node(_display.portal_screen_node)
@@ -294,7 +380,9 @@ class ApplicationManager(avango.script.Script):
 
           # collect transit portals
           if _display.transitable and _transit_entry_added == False:
-            self.transit_portals.append( (_display_group, _display, _virtual_user_repr) )
+            _transit_cache = PortalTransitCache()
+            _transit_cache.my_constructor(_display)
+            self.transit_portals.append( (_display_group, _display, _virtual_user_repr, _transit_cache) )
             _transit_entry_added = True
 
     for _virtual_user_representation in _virtual_user_representations:
@@ -379,43 +467,38 @@ class ApplicationManager(avango.script.Script):
     self.camera.Mode.value = 1
 
     # set render mask properly
-    _render_mask = "(main_scene"
-
-    for _user_repr in ApplicationManager.all_user_representations:
-
-      if _user_repr.view_transform_node.Name.value == "scene_matrix":
-        _render_mask = _render_mask + " | " + _user_repr.view_transform_node.Parent.value.Name.value + "_" + _user_repr.head.Name.value
-      else:
-        _render_mask = _render_mask + " | " + _user_repr.view_transform_node.Name.value
-
-    _render_mask = _render_mask + ") && !do_not_display_group && !portal_invisible_group"
-
-    self.camera.RenderMask.value = _render_mask
-
-    ## @var window
-    # Window displaying the server control view.
-    self.window = avango.gua.nodes.Window()
-    self.window.Title.value = "Server Control Monitor"
-    self.window.Size.value = avango.gua.Vec2ui(1280, 1024)
-    self.window.LeftResolution.value = avango.gua.Vec2ui(1280, 1024)
-
-    ## @var pipeline
-    # Pipeline repsonsible for rendering the server control monitor.
-    self.pipeline = avango.gua.nodes.Pipeline()
-    self.pipeline.BackgroundMode.value = avango.gua.BackgroundMode.COLOR
-    self.pipeline.Window.value = self.window
-    self.pipeline.LeftResolution.value = self.window.LeftResolution.value
-    self.pipeline.EnableStereo.value = False
-    self.pipeline.Camera.value = self.camera
-    self.pipeline.EnableFrustumCulling.value = True
-    self.pipeline.EnableSsao.value = False
-    self.pipeline.EnableFPSDisplay.value = True
-    #self.pipeline.Enabled.value = False
-    
-    # add pipeline and scenegraph to viewer
-    self.viewer.Pipelines.value = [self.pipeline]
+    _group_tokens = [_user_repr.get_visibility_group_name() for _user_repr in ApplicationManager.all_user_representations]
+    self.camera.RenderMask.value = group_name_registry.build_render_mask(_group_tokens)
+
+    # add scenegraph to viewer
     self.viewer.SceneGraphs.value = [self.SCENEGRAPH]
 
+    # do not open a window in headless mode
+    if self.headless_runner == None:
+
+      ## @var window
+      # Window displaying the server control view.
+      self.window = avango.gua.nodes.Window()
+      self.window.Title.value = "Server Control Monitor"
+      self.window.Size.value = avango.gua.Vec2ui(1280, 1024)
+      self.window.LeftResolution.value = avango.gua.Vec2ui(1280, 1024)
+
+      ## @var pipeline
+      # Pipeline repsonsible for rendering the server control monitor.
+      self.pipeline = avango.gua.nodes.Pipeline()
+      self.pipeline.BackgroundMode.value = avango.gua.BackgroundMode.COLOR
+      self.pipeline.Window.value = self.window
+      self.pipeline.LeftResolution.value = self.window.LeftResolution.value
+      self.pipeline.EnableStereo.value = False
+      self.pipeline.Camera.value = self.camera
+      self.pipeline.EnableFrustumCulling.value = True
+      self.pipeline.EnableSsao.value = False
+      self.pipeline.EnableFPSDisplay.value = True
+      #self.pipeline.Enabled.value = False
+    
+      # add pipeline to viewer
+      self.viewer.Pipelines.value = [self.pipeline]
+
     self.always_evaluate(True)
 
   ## Called whenever sf_key1 changes.
@@ -565,6 +648,13 @@ class ApplicationManager(avango.script.Script):
   ## Evaluated every frame.
   def evaluate(self):
 
+    # report once when all client processes are connected
+    if self.client_launcher != None and self.clients_ready_reported == False:
+
+      if self.client_launcher.all_clients_ready():
+        print_message("All " + str(len(self.client_launcher.clients)) + " clients connected after " + str(round(self.client_launcher.get_startup_time(), 2)) + " s.")
+        self.clients_ready_reported = True
+
     # handle portal transitions
     for _nav in self.workspace_navigations:
 
@@ -587,15 +677,20 @@ class ApplicationManager(avango.script.Script):
 
       _nav_device_pos2 = _nav_device_mat * avango.gua.Vec3(0.0,0.0,1.0)
       _nav_device_pos2 = avango.gua.Vec3(_nav_device_pos2.x, _nav_device_pos2.y, _nav_device_pos2.z)
+      _nav_device_step = (_nav_device_pos2 - _nav_device_pos).length()
 
       for _tuple in self.transit_portals:
 
         _portal_display_group = _tuple[0]
         _portal = _tuple[1]
         _first_virtual_user_repr = _tuple[2]
+        _transit_cache = _tuple[3]
+
+        # broad phase: skip portals whose bounding sphere is out of reach
+        if _portal.viewing_mode != "3D" or _transit_cache.may_transit(_nav_device_pos, _nav_device_step) == False:
+          continue
 
-        _active_navigation = _portal_display_group.navigations[_first_virtual_user_repr.connected_navigation_id]
-        _mat = avango.gua.make_inverse_mat(_portal.portal_matrix_node.Transform.value)
+        _mat = _transit_cache.inverse_portal_matrix
 
         _nav_device_portal_space_mat = _mat * _nav_device_mat
         _nav_device_portal_space_pos = _mat * _nav_device_pos
@@ -608,8 +703,9 @@ class ApplicationManager(avango.script.Script):
             _nav_device_portal_space_pos.y > -_portal.size[1]/2     and \
             _nav_device_portal_space_pos.y <  _portal.size[1]/2     and \
             _nav_device_portal_space_pos.z < 0.0                    and \
-            _nav_device_portal_space_pos2.z >= 0.0                  and \
-            _portal.viewing_mode == "3D":
+            _nav_device_portal_space_pos2.z >= 0.0:
+
+          _active_navigation = _portal_display_group.navigations[_first_virtual_user_repr.connected_navigation_id]
 
           _nav.inputmapping.set_abs_mat(avango.gua.make_trans_mat(_portal.portal_screen_node.Transform.value.get_translate()) * \
                                         _active_navigation.sf_abs_mat.value * \
@@ -626,53 +722,33 @@ class ApplicationManager(avango.script.Script):
           _nav.inputmapping.scale_stop_time = None
           _nav.inputmapping.set_scale(_active_navigation.sf_scale.value, False)
 
+  ## Triggers or resets the coupling of a requestable navigation. Called when its request button is pressed.
+  # @param WORKSPACE The workspace the navigation belongs to.
+  # @param DISPLAY_GROUP The display group the navigation belongs to.
+  # @param NAVIGATION The requestable navigation whose request button was pressed.
+  # @param EVENT The ButtonEvent of the button press.
+  def handle_navigation_request(self, WORKSPACE, DISPLAY_GROUP, NAVIGATION, EVENT):
 
-    # handle requestable navigations
-    for _requestable_nav in self.requestable_navigations:
-
-      _workspace = _requestable_nav[0]
-      _display_group = _requestable_nav[1]
-      _navigation = _requestable_nav[2]
-      _requestable_nav_index = self.requestable_navigations.index(_requestable_nav)
-      _last_button_state = self.requestable_navigations_last_button_states[_requestable_nav_index]
-
-      # if button change from negative to positive, trigger action
-      #print _navigation.sf_request_trigger.value
-
-      if _navigation.sf_request_trigger.value == True and \
-         _last_button_state == False:
-
-        self.requestable_navigations_last_button_states[_requestable_nav_index] = True
-
-        # trigger coupling
-        if _navigation.active_user_representations == []:
-          
-          _users_in_range = _workspace.get_all_users_in_range(avango.gua.make_inverse_mat(_display_group.offset_to_workspace) * _navigation.device.tracking_reader.sf_abs_vec.value, 0.8)
-
-          for _user in _users_in_range:
-            self.switch_navigation_for(_workspace.id, _display_group.id, _user.id, _display_group.navigations.index(_navigation))
-
-        # reset coupling
-        else:
-
-          # get user ids to be reset to navigation 0
-          _active_user_ids = []
-
-          for _user_repr in _navigation.active_user_representations:
-            _active_user_ids.append(_user_repr.USER.id)
-
-          # switch navigation for 
-          for _user_id in _active_user_ids:
-            self.switch_navigation_for(_workspace.id, _display_group.id, _user_id, 0)
+    # trigger coupling
+    if NAVIGATION.active_user_representations == []:
+      
+      _users_in_range = WORKSPACE.get_all_users_in_range(avango.gua.make_inverse_mat(DISPLAY_GROUP.offset_to_workspace) * NAVIGATION.device.tracking_reader.sf_abs_vec.value, 0.8)
 
-      # if button change from positive to negative, reset flag
-      elif _navigation.sf_request_trigger.value == False and \
-           _last_button_state == True:
+      for _user in _users_in_range:
+        self.switch_navigation_for(WORKSPACE.id, DISPLAY_GROUP.id, _user.id, DISPLAY_GROUP.navigations.index(NAVIGATION))
 
-        self.requestable_navigations_last_button_states[_requestable_nav_index] = False
+    # reset coupling
+    else:
 
+      # get user ids to be reset to navigation 0
+      _active_user_ids = []
 
+      for _user_repr in NAVIGATION.active_user_representations:
+        _active_user_ids.append(_user_repr.USER.id)
 
+      # switch navigation for 
+      for _user_id in _active_user_ids:
+        self.switch_navigation_for(WORKSPACE.id, DISPLAY_GROUP.id, _user_id, 0)
 
   ## Initializes the GroupNames field of all UserRepresentation's avatars.
   # Users cannot see the avatars in own display group, but the ones in others.
@@ -684,7 +760,7 @@ class ApplicationManager(avango.script.Script):
 
         if _user_repr_2.DISPLAY_GROUP != _user_repr_1.DISPLAY_GROUP:
 
-          _user_repr_1.append_to_avatar_group_names(_user_repr_2.view_transform_node.Name.value)
+          _user_repr_1.append_to_avatar_group_names(_user_repr_2.get_view_group_name())
 
   ## Switches the navigation for a user at a display group. 
   # @param WORKSPACE_ID The workspace id in which the user is active.
@@ -700,6 +776,12 @@ class ApplicationManager(avango.script.Script):
   # @param LOCALS Local variables.
   # @param GLOBALS Global variables.
   def run(self, LOCALS, GLOBALS):
+
+    # no interactive shell in headless mode, it is meant to run unattended
+    if self.headless_runner != None:
+      self.headless_runner.run()
+      return
+
     self.shell.start(LOCALS, GLOBALS)
     self.viewer.run()
 
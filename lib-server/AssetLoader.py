@@ -0,0 +1,233 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes AssetRequest and AssetLoader and the global instance asset_loader.
+
+# import framework libraries
+from ConsoleIO import *
+from FrameScheduler import frame_scheduler
+
+# import python libraries
+import concurrent.futures
+import contextlib
+import os
+import time
+
+## An asset whose files are read in the background and which is inserted on the main thread afterwards.
+class AssetRequest:
+
+  ## Custom constructor.
+  # @param FUTURE Future of the background read of the asset's files or None if the files are not read in the background.
+  # @param CALLBACK Function to be called on the main thread once the files were read.
+  def __init__(self, FUTURE, CALLBACK):
+
+    ## @var future
+    # Future of the background read of the asset's files or None if the files are not read in the background.
+    self.future = FUTURE
+
+    ## @var callback
+    # Function to be called on the main thread once the files were read.
+    self.callback = CALLBACK
+
+
+## Reads asset files concurrently on worker threads before they are loaded on the main thread.
+# Avango nodes must only be created and changed on the main thread, so the loaders themselves cannot run
+# in the background. Instead, all files of an asset are read on a worker thread first, which brings them
+# into the operating system's page cache; the loader call on the main thread then no longer waits for the
+# disk. Of out-of-core files such as PLOD point clouds, only the start holding the header and hierarchy is read,
+# since the renderer streams their data later on. Finished assets are inserted by a frame task, at most max_insertions_per_frame per frame, so the
+# application stays interactive while the remaining assets are still being read. Within deferred(), assets
+# are inserted by the frame task even without worker threads, e.g. for scenes built in the background; their
+# files are then read by the loader itself on insertion.
+class AssetLoader:
+
+  ## @var max_insertions_per_frame
+  # Maximum number of finished assets loaded and inserted on the main thread per frame.
+  max_insertions_per_frame = 1
+
+  ## @var chunk_size
+  # Number of bytes read at once by the worker threads.
+  chunk_size = 4 * 1024 * 1024
+
+  ## @var out_of_core_extensions
+  # Extensions of out-of-core files, e.g. PLOD point clouds, whose data is streamed by the renderer later on.
+  out_of_core_extensions = [".kdn"]
+
+  ## @var out_of_core_read_limit
+  # Number of bytes read from the start of out-of-core files, which covers the header and hierarchy the loader reads.
+  # Reading the whole multi-gigabyte point data would evict the page cache.
+  out_of_core_read_limit = 4 * 1024 * 1024
+
+  ## Custom constructor.
+  # @param THREAD_COUNT Number of worker threads. 0 to disable asynchronous loading.
+  def __init__(self, THREAD_COUNT):
+
+    ## @var thread_count
+    # Number of worker threads. 0 if asynchronous loading is disabled.
+    self.thread_count = THREAD_COUNT
+
+    ## @var executor
+    # Thread pool executing the file reads. Created with the first request.
+    self.executor = None
+
+    ## @var deferral_depth
+    # Number of nested deferred() blocks currently entered.
+    self.deferral_depth = 0
+
+    ## @var pending_requests
+    # List of AssetRequests which were not inserted yet, in order of request.
+    self.pending_requests = []
+
+    ## @var frame_task
+    # FrameTask executing frame_callback. Registered with the first request.
+    self.frame_task = None
+
+    ## @var inserted_count
+    # Number of assets inserted.
+    self.inserted_count = 0
+
+    ## @var read_bytes
+    # Number of bytes read by the worker threads.
+    self.read_bytes = 0
+
+    ## @var insert_time
+    # Accumulated time in seconds spent on the main thread loading and inserting finished assets.
+    self.insert_time = 0.0
+
+  ## Creates an AssetLoader with the number of worker threads given by the environment variable
+  # NVF_ASYNC_LOADING_THREADS. Without it, assets are loaded synchronously.
+  @staticmethod
+  def create_from_environment():
+
+    return AssetLoader(int(os.environ.get("NVF_ASYNC_LOADING_THREADS", "0")))
+
+  ## Returns a boolean saying if assets are read by worker threads.
+  def is_enabled(self):
+
+    return self.thread_count > 0
+
+  ## Returns a boolean saying if assets requested now are inserted later by the frame task.
+  def is_deferring(self):
+
+    return self.thread_count > 0 or self.deferral_depth > 0
+
+  ## Context manager deferring the insertion of all assets requested within, also if no worker threads are used.
+  # The insertions are spread over the following frames instead of blocking the current one.
+  @contextlib.contextmanager
+  def deferred(self):
+
+    self.deferral_depth += 1
+
+    try:
+      yield
+    finally:
+      self.deferral_depth -= 1
+
+  ## Requests the files of an asset to be read in the background, if worker threads are used, and the asset to be inserted afterwards.
+  # @param FILENAMES List of paths of the files belonging to the asset. Files which do not exist are skipped.
+  # @param CALLBACK Function to be called on the main thread once all files were read.
+  def request(self, FILENAMES, CALLBACK):
+
+    if self.frame_task == None:
+      self.frame_task = frame_scheduler.register("AssetLoader", self.frame_callback)
+
+    self.frame_task.active = True
+
+    if self.thread_count == 0: # deferred insertion only
+      self.pending_requests.append(AssetRequest(None, CALLBACK))
+      return
+
+    if self.executor == None:
+      self.executor = concurrent.futures.ThreadPoolExecutor(max_workers = self.thread_count)
+
+    self.pending_requests.append(AssetRequest(self.executor.submit(AssetLoader.read_files, FILENAMES), CALLBACK))
+
+  ## Reads files completely, out-of-core files up to out_of_core_read_limit, and returns the number of bytes read.
+  # Executed on a worker thread.
+  # @param FILENAMES List of paths of the files to be read.
+  @staticmethod
+  def read_files(FILENAMES):
+
+    _bytes = 0
+
+    for _filename in FILENAMES:
+
+      if os.path.isfile(_filename) == False:
+        continue
+
+      _remaining_bytes = os.path.getsize(_filename)
+
+      if os.path.splitext(_filename)[1].lower() in AssetLoader.out_of_core_extensions:
+        _remaining_bytes = min(_remaining_bytes, AssetLoader.out_of_core_read_limit)
+
+      with open(_filename, "rb") as _file:
+        _chunk = _file.read(min(_remaining_bytes, AssetLoader.chunk_size))
+
+        while len(_chunk) > 0:
+          _bytes += len(_chunk)
+          _remaining_bytes -= len(_chunk)
+          _chunk = _file.read(min(_remaining_bytes, AssetLoader.chunk_size))
+
+    return _bytes
+
+  ## Evaluated every frame while requests are pending. Inserts finished assets.
+  def frame_callback(self):
+
+    _inserted_count = 0
+
+    for _request in list(self.pending_requests):
+
+      if _inserted_count == AssetLoader.max_insertions_per_frame:
+        break
+
+      if _request.future != None and _request.future.done() == False:
+        continue
+
+      self.pending_requests.remove(_request)
+
+      try:
+        if _request.future != None:
+          self.read_bytes += _request.future.result()
+      except (IOError, OSError) as _error:
+        # the loader reports missing or unreadable files itself
+        print_warning("Reading asset failed: " + str(_error))
+
+      _start = time.time()
+      _request.callback()
+      self.insert_time += time.time() - _start
+
+      self.inserted_count += 1
+      _inserted_count += 1
+
+    if len(self.pending_requests) == 0:
+      self.frame_task.active = False
+
+  ## Returns the number of assets which were requested but not inserted yet.
+  def get_pending_count(self):
+
+    return len(self.pending_requests)
+
+  ## Returns a dictionary with the numbers of inserted and pending assets, the bytes read and the time spent inserting.
+  def get_statistics(self):
+
+    return {"inserted" : self.inserted_count
+          , "pending" : len(self.pending_requests)
+          , "read_bytes" : self.read_bytes
+          , "insert_time" : self.insert_time}
+
+  ## Prints the statistics on the console.
+  def print_statistics(self):
+
+    if self.is_enabled() == False and self.inserted_count == 0:
+      return
+
+    _statistics = self.get_statistics()
+    print_message("Asset loader: " + str(_statistics["inserted"]) + " assets inserted" + \
+                  ", " + str(_statistics["pending"]) + " pending" + \
+                  ", " + str(round(_statistics["read_bytes"] / (1024.0 * 1024.0), 2)) + " MiB read in the background" + \
+                  ", " + str(round(_statistics["insert_time"], 3)) + " s spent inserting")
+
+
+## @var asset_loader
+# Global AssetLoader instance used by the SceneObjects.
+asset_loader = AssetLoader.create_from_environment()
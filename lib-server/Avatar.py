@@ -10,6 +10,9 @@ import avango.script
 
 # import framework libraries
 from ApplicationManager import *
+from VisibilityHandler import apply_group_names
+from FrameScheduler import frame_scheduler
+from GeometryCache import geometry_cache
 import Utilities
 
 # import python libraries
@@ -32,11 +35,9 @@ class Avatar:
     # The UserRepresentation instance to which this Avatar belongs to.
     self.USER_REPRESENTATION = USER_REPRESENTATION
 
-    _loader = avango.gua.nodes.TriMeshLoader()
-    
     ## @var head_geometry
     # Scenegraph node representing the geometry and transformation of the basic avatar's head.
-    self.head_geometry = _loader.create_geometry_from_file('head_avatar',
+    self.head_geometry = geometry_cache.create_geometry_from_file('head_avatar',
                                                            'data/objects/Joseph/JosephHead.obj',
                                                            'data/materials/ShadelessWhite.gmd',
                                                            avango.gua.LoaderFlags.LOAD_MATERIALS)
@@ -46,7 +47,7 @@ class Avatar:
 
     ## @var body_geometry
     # Scenegraph node representing the geometry and transformation of the basic avatar's body.
-    self.body_geometry = _loader.create_geometry_from_file('body_avatar',
+    self.body_geometry = geometry_cache.create_geometry_from_file('body_avatar',
                                                            'data/objects/Joseph/JosephBody.obj',
                                                            'data/materials/ShadelessWhite.gmd',
                                                            avango.gua.LoaderFlags.LOAD_MATERIALS)
@@ -56,9 +57,9 @@ class Avatar:
     # Geometry nodes representing all the screens at the DisplayGroup the UserRepresentation belongs to.
     self.screen_visualizations = []
 
-    ## @var frame_trigger
-    # Triggers framewise evaluation of frame_callback method.
-    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = True)
+    ## @var frame_task
+    # FrameTask evaluating the frame_callback method whenever the head transformation changed.
+    self.frame_task = frame_scheduler.register("Avatar", self.frame_callback, [self.USER_REPRESENTATION.head.Transform])
     
 
   ## Adds a screen visualization for a display instance to the view transformation node.
@@ -73,11 +74,7 @@ class Avatar:
   # @param LIST_OF_STRINGS A list of group names to be set for the avatar parts.
   def set_group_names(self, LIST_OF_STRINGS):
 
-    self.head_geometry.GroupNames.value = LIST_OF_STRINGS
-    self.body_geometry.GroupNames.value = LIST_OF_STRINGS
-
-    for _screen_vis in self.screen_visualizations:
-      _screen_vis.GroupNames.value = LIST_OF_STRINGS
+    apply_group_names([self.head_geometry, self.body_geometry] + self.screen_visualizations, LIST_OF_STRINGS)
 
 
   ## Appends a string to the GroupNames field of all avatar parts.
@@ -101,7 +98,7 @@ class Avatar:
     for _screen_vis in self.screen_visualizations:
       _screen_vis.Material.value = SCREEN_MATERIAL
 
-  ## Evaluated every frame.
+  ## Evaluated whenever the head transformation changed.
   def frame_callback(self):
 
     # update avatar body matrix if present at this view transform node
@@ -0,0 +1,155 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes ButtonEvent, ButtonEventSource and ButtonEventDispatcher and the global instance button_event_dispatcher.
+
+# import avango-guacamole libraries
+import avango
+import avango.script
+from avango.script import field_has_changed
+
+# import python libraries
+import time
+
+## Event emitted when a button is pressed, held or released.
+class ButtonEvent:
+
+  ## Default constructor.
+  # @param TYPE Type of the event, either "PRESS", "HOLD" or "RELEASE".
+  # @param TIMESTAMP Point in time when the event occurred.
+  # @param PRESS_TIMESTAMP Point in time when the button was pressed.
+  def __init__(self, TYPE, TIMESTAMP, PRESS_TIMESTAMP):
+
+    ## @var type
+    # Type of the event, either "PRESS", "HOLD" or "RELEASE".
+    self.type = TYPE
+
+    ## @var timestamp
+    # Point in time when the event occurred.
+    self.timestamp = TIMESTAMP
+
+    ## @var hold_duration
+    # Time in seconds the button has been held down when the event occurred.
+    self.hold_duration = TIMESTAMP - PRESS_TIMESTAMP
+
+
+## Turns a single SFBool button field into press, hold and release events.
+# Press and release are edge-triggered. Hold events are emitted once per frame, but only
+# while the button is down and somebody subscribed to them, so idle buttons cost nothing.
+class ButtonEventSource(avango.script.Script):
+
+  ## @var sf_button
+  # Boolean field connected to the button field to be observed.
+  sf_button = avango.SFBool()
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(ButtonEventSource).__init__()
+
+    ## @var press_callbacks
+    # List of functions called with a ButtonEvent when the button is pressed.
+    self.press_callbacks = []
+
+    ## @var hold_callbacks
+    # List of functions called with a ButtonEvent every frame while the button is held.
+    self.hold_callbacks = []
+
+    ## @var release_callbacks
+    # List of functions called with a ButtonEvent when the button is released.
+    self.release_callbacks = []
+
+    ## @var last_state
+    # Button state of the last edge, used to filter repeated values.
+    self.last_state = False
+
+    ## @var press_timestamp
+    # Point in time when the button was pressed the last time.
+    self.press_timestamp = 0.0
+
+    ## @var frame_trigger
+    # Triggers framewise evaluation of frame_callback method while the button is held.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = False)
+
+  ## Custom constructor.
+  # @param SF_BUTTON The button field to be observed.
+  def my_constructor(self, SF_BUTTON):
+
+    self.sf_button.connect_from(SF_BUTTON)
+
+  ## Registers callbacks for the events of this button.
+  # @param ON_PRESS Function called with a ButtonEvent when the button is pressed or None.
+  # @param ON_RELEASE Function called with a ButtonEvent when the button is released or None.
+  # @param ON_HOLD Function called with a ButtonEvent every frame while the button is held or None.
+  def subscribe(self, ON_PRESS = None, ON_RELEASE = None, ON_HOLD = None):
+
+    if ON_PRESS != None:
+      self.press_callbacks.append(ON_PRESS)
+
+    if ON_RELEASE != None:
+      self.release_callbacks.append(ON_RELEASE)
+
+    if ON_HOLD != None:
+      self.hold_callbacks.append(ON_HOLD)
+
+  ## Called whenever sf_button changes.
+  @field_has_changed(sf_button)
+  def sf_button_changed(self):
+
+    if self.sf_button.value == self.last_state:
+      return
+
+    self.last_state = self.sf_button.value
+    _timestamp = time.time()
+
+    if self.last_state == True: # button pressed
+      self.press_timestamp = _timestamp
+      self.frame_trigger.Active.value = len(self.hold_callbacks) > 0
+      self.emit(self.press_callbacks, ButtonEvent("PRESS", _timestamp, self.press_timestamp))
+
+    else: # button released
+      self.frame_trigger.Active.value = False
+      self.emit(self.release_callbacks, ButtonEvent("RELEASE", _timestamp, self.press_timestamp))
+
+  ## Evaluated every frame while the button is held.
+  def frame_callback(self):
+
+    self.emit(self.hold_callbacks, ButtonEvent("HOLD", time.time(), self.press_timestamp))
+
+  ## Calls a list of callbacks with an event.
+  # @param CALLBACKS The functions to be called.
+  # @param EVENT The ButtonEvent to be passed.
+  def emit(self, CALLBACKS, EVENT):
+
+    for _callback in CALLBACKS:
+      _callback(EVENT)
+
+
+## Shares one ButtonEventSource per button field among all subscribers.
+class ButtonEventDispatcher:
+
+  ## Default constructor.
+  def __init__(self):
+
+    ## @var sources
+    # Dictionary mapping the id of a button field to a tuple of the field and its ButtonEventSource.
+    self.sources = {}
+
+  ## Registers callbacks for the events of a button field.
+  # @param SF_BUTTON The SFBool button field to be observed.
+  # @param ON_PRESS Function called with a ButtonEvent when the button is pressed or None.
+  # @param ON_RELEASE Function called with a ButtonEvent when the button is released or None.
+  # @param ON_HOLD Function called with a ButtonEvent every frame while the button is held or None.
+  def subscribe(self, SF_BUTTON, ON_PRESS = None, ON_RELEASE = None, ON_HOLD = None):
+
+    # keep a reference to the field, so its id is not reused
+    if id(SF_BUTTON) not in self.sources:
+      _source = ButtonEventSource()
+      _source.my_constructor(SF_BUTTON)
+      self.sources[id(SF_BUTTON)] = (SF_BUTTON, _source)
+
+    self.sources[id(SF_BUTTON)][1].subscribe(ON_PRESS, ON_RELEASE, ON_HOLD)
+
+
+## @var button_event_dispatcher
+# Global ButtonEventDispatcher instance shared by all framework classes.
+button_event_dispatcher = ButtonEventDispatcher()
@@ -0,0 +1,125 @@
+#!/usr/bin/python
+
+## @file
+# Contains class ClientLauncher.
+
+# import framework libraries
+from ConsoleIO import *
+
+# import python libraries
+import os
+import subprocess
+import threading
+import time
+
+## Message printed by a client process as soon as its scenegraph is connected to the server.
+READY_MESSAGE = "scenegraph connected"
+
+## Class to kill and start the client processes on all display hosts concurrently.
+# Each client reports READY_MESSAGE on its standard output once it received the distributed
+# scenegraph, so the server knows when the whole setup is ready instead of waiting fixed times.
+class ClientLauncher:
+
+  ## Default constructor.
+  # @param REMOTE_SHELL Command list used to execute a command on a display host. Hostname and command are appended.
+  #                     Defaults to the environment variable NVF_REMOTE_SHELL or ssh, so a local stand-in can be used for testing.
+  def __init__(self, REMOTE_SHELL = None):
+
+    if REMOTE_SHELL == None:
+      REMOTE_SHELL = os.environ.get("NVF_REMOTE_SHELL", "ssh").split()
+
+    ## @var remote_shell
+    # Command list used to execute a command on a display host.
+    self.remote_shell = REMOTE_SHELL
+
+    ## @var clients
+    # List of dictionaries describing the client processes to be started.
+    self.clients = []
+
+    ## @var launch_time
+    # Point in time when launch_all() was called or None if the clients were not launched yet.
+    self.launch_time = None
+
+    ## @var lock
+    # Condition guarding the ready states of the clients, notified whenever a client becomes ready.
+    self.lock = threading.Condition()
+
+  ## Kills all running python processes on the given hosts in parallel and waits until all kills are done.
+  # @param HOSTNAMES List of hostnames to kill the python processes on.
+  # @param TIMEOUT Maximum time in seconds to wait for all kill commands to return.
+  def kill_all(self, HOSTNAMES, TIMEOUT = 5.0):
+
+    _processes = []
+
+    for _hostname in set(HOSTNAMES):
+      _processes.append(subprocess.Popen(self.remote_shell + [_hostname, "killall python -9"]
+                                       , stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+
+    _deadline = time.time() + TIMEOUT
+
+    for _process in _processes:
+      try:
+        _process.wait(max(0.0, _deadline - time.time()))
+      except subprocess.TimeoutExpired:
+        _process.kill()
+
+  ## Registers a client process to be started by launch_all().
+  # @param NAME Name of the client used in console messages, e.g. the display name.
+  # @param HOSTNAME Host on which the client is to be started.
+  # @param COMMAND Command to be executed on the host.
+  def add_client(self, NAME, HOSTNAME, COMMAND):
+
+    self.clients.append({"name" : NAME, "hostname" : HOSTNAME, "command" : COMMAND
+                       , "process" : None, "ready_time" : None})
+
+  ## Starts all registered client processes at once without waiting between them.
+  def launch_all(self):
+
+    self.launch_time = time.time()
+
+    for _client in self.clients:
+
+      _client["process"] = subprocess.Popen(self.remote_shell + [_client["hostname"], _client["command"]]
+                                          , stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+
+      _reader = threading.Thread(target = self.read_client_output, args = (_client,))
+      _reader.daemon = True
+      _reader.start()
+
+  ## Reads the output of a client process until it terminates and marks the client ready on READY_MESSAGE.
+  # Runs in a separate thread per client.
+  # @param CLIENT The client dictionary to read the output for.
+  def read_client_output(self, CLIENT):
+
+    for _line in CLIENT["process"].stdout:
+
+      if READY_MESSAGE in _line and CLIENT["ready_time"] == None:
+
+        with self.lock:
+          CLIENT["ready_time"] = time.time()
+          self.lock.notify_all()
+
+      else:
+        print(CLIENT["hostname"] + ": " + _line.rstrip("\n"))
+
+    if CLIENT["ready_time"] == None:
+      print_warning("Client " + CLIENT["name"] + " on " + CLIENT["hostname"] + " terminated before connecting to the scenegraph.")
+
+  ## Returns the number of clients which reported a connected scenegraph.
+  def get_ready_count(self):
+
+    with self.lock:
+      return len([_client for _client in self.clients if _client["ready_time"] != None])
+
+  ## Returns a boolean saying if all launched clients reported a connected scenegraph.
+  def all_clients_ready(self):
+
+    return self.launch_time != None and self.get_ready_count() == len(self.clients)
+
+  ## Returns the time in seconds between launching and the last client becoming ready or None if not all clients are ready.
+  def get_startup_time(self):
+
+    if self.all_clients_ready() == False:
+      return None
+
+    return max([_client["ready_time"] for _client in self.clients] + [self.launch_time]) - self.launch_time
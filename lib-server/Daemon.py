@@ -396,6 +396,7 @@ def init_keyboard():
     keyboard.buttons[29] = "EV_KEY::KEY_F11"
     keyboard.buttons[30] = "EV_KEY::KEY_F12"
     keyboard.buttons[31] = "EV_KEY::KEY_HOME"
+    keyboard.buttons[32] = "EV_KEY::KEY_BACKSPACE"
 
 
 
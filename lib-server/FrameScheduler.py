@@ -0,0 +1,264 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes FrameTask, FrameTaskWatcher and FrameScheduler and the global instance frame_scheduler.
+
+# import avango-guacamole libraries
+import avango
+import avango.script
+
+# import framework libraries
+from ConsoleIO import *
+
+# import python libraries
+import os
+import time
+
+## A callback registered at the FrameScheduler together with the fields it depends on.
+class FrameTask:
+
+  ## Custom constructor.
+  # @param NAME Name of the task used in the statistics.
+  # @param CALLBACK Function to be called when the task is executed.
+  # @param PRIORITY Tasks with higher priorities are executed first.
+  # @param ALWAYS Boolean saying if the task is executed every frame regardless of its inputs.
+  def __init__(self, NAME, CALLBACK, PRIORITY, ALWAYS):
+
+    ## @var name
+    # Name of the task used in the statistics.
+    self.name = NAME
+
+    ## @var callback
+    # Function to be called when the task is executed.
+    self.callback = CALLBACK
+
+    ## @var priority
+    # Tasks with higher priorities are executed first.
+    self.priority = PRIORITY
+
+    ## @var always
+    # Boolean saying if the task is executed every frame regardless of its inputs.
+    self.always = ALWAYS
+
+    ## @var dirty
+    # Boolean saying if an input changed since the task was executed the last time.
+    self.dirty = True
+
+    ## @var active
+    # Boolean saying if the task is considered by the scheduler at all.
+    self.active = True
+
+    ## @var waiting_frames
+    # Number of frames the task has been deferred because the frame budget was exhausted.
+    self.waiting_frames = 0
+
+    ## @var watcher
+    # FrameTaskWatcher marking this task dirty or None if the task has no inputs.
+    self.watcher = None
+
+    ## @var executed_count
+    # Number of frames in which the task was executed.
+    self.executed_count = 0
+
+    ## @var skipped_count
+    # Number of frames in which the task was skipped because its inputs did not change.
+    self.skipped_count = 0
+
+    ## @var deferred_count
+    # Number of frames in which the task was deferred because the frame budget was exhausted.
+    self.deferred_count = 0
+
+    ## @var total_time
+    # Accumulated time in seconds spent executing the task.
+    self.total_time = 0.0
+
+  ## Forces the execution of the task in the next frame, e.g. when a non-field state it depends on changed.
+  def mark_dirty(self):
+
+    self.dirty = True
+
+  ## Returns a boolean saying if the task has to be executed.
+  def is_due(self):
+
+    return self.active and (self.always or self.dirty)
+
+
+## Script marking a FrameTask dirty whenever one of its input fields changes.
+# For each input field, a field of the same type is added and connected from it, so avango
+# only evaluates this script in frames in which an input was actually touched.
+class FrameTaskWatcher(avango.script.Script):
+
+  ## @var sf_change_count
+  # Number of evaluations, incremented whenever an input changed. Connected to the scheduler, so watchers are evaluated first.
+  sf_change_count = avango.SFInt()
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(FrameTaskWatcher).__init__()
+
+  ## Custom constructor.
+  # @param TASK The FrameTask to be marked dirty.
+  # @param INPUT_FIELDS List of fields the task depends on.
+  def my_constructor(self, TASK, INPUT_FIELDS):
+
+    ## @var TASK
+    # The FrameTask to be marked dirty.
+    self.TASK = TASK
+
+    ## @var input_fields
+    # Fields added to this script which are connected from the task's input fields.
+    self.input_fields = []
+
+    for _input_field in INPUT_FIELDS:
+
+      _field = type(_input_field)()
+      self.add_field(_field, "input_" + str(len(self.input_fields)))
+      _field.connect_from(_input_field)
+      self.input_fields.append(_field)
+
+  ## Evaluated when an input field changed.
+  def evaluate(self):
+
+    self.TASK.mark_dirty()
+    self.sf_change_count.value += 1
+
+
+## Executes registered FrameTasks once per frame instead of evaluating every component on its own.
+# Tasks are only executed when one of their input fields changed or they were marked dirty, in order
+# of descending priority. If a frame budget is set, the remaining tasks are deferred to the next frame
+# once it is exhausted; deferred tasks gain priority with every frame they wait, so none starves.
+class FrameScheduler(avango.script.Script):
+
+  # output fields
+  ## @var sf_frame_count
+  # Number of frames evaluated by the scheduler. Scripts connecting a field from it are evaluated after the scheduler.
+  sf_frame_count = avango.SFInt()
+
+  ## Default constructor.
+  def __init__(self):
+    self.super(FrameScheduler).__init__()
+
+    ## @var tasks
+    # List of all registered FrameTasks.
+    self.tasks = []
+
+    ## @var budget
+    # Maximum time in seconds spent on tasks per frame. 0 for no limit.
+    # Read from the environment variable NVF_FRAME_BUDGET_MS.
+    self.budget = float(os.environ.get("NVF_FRAME_BUDGET_MS", "0")) / 1000.0
+
+    ## @var frame_count
+    # Number of frames evaluated by the scheduler.
+    self.frame_count = 0
+
+    ## @var over_budget_count
+    # Number of frames in which tasks had to be deferred.
+    self.over_budget_count = 0
+
+    self.always_evaluate(True)
+
+  ## Registers a callback to be executed whenever one of its input fields changed.
+  # Returns the created FrameTask, which can be marked dirty or deactivated by the caller.
+  # @param NAME Name of the task used in the statistics.
+  # @param CALLBACK Function to be called when the task is executed.
+  # @param INPUT_FIELDS List of fields the task depends on. If empty, the task is executed every frame.
+  # @param PRIORITY Tasks with higher priorities are executed first.
+  def register(self, NAME, CALLBACK, INPUT_FIELDS = [], PRIORITY = 0):
+
+    _task = FrameTask(NAME, CALLBACK, PRIORITY, len(INPUT_FIELDS) == 0)
+
+    if len(INPUT_FIELDS) > 0:
+      _task.watcher = FrameTaskWatcher()
+      _task.watcher.my_constructor(_task, INPUT_FIELDS)
+      _field = avango.SFInt()
+      self.add_field(_field, "watcher_" + str(len(self.tasks)))
+      _field.connect_from(_task.watcher.sf_change_count)
+
+    self.tasks.append(_task)
+
+    return _task
+
+  ## Evaluated every frame.
+  def evaluate(self):
+
+    self.frame_count += 1
+    self.sf_frame_count.value = self.frame_count
+
+    _due_tasks = []
+
+    for _task in self.tasks:
+
+      if _task.is_due():
+        _due_tasks.append(_task)
+      elif _task.active:
+        _task.skipped_count += 1
+
+    _due_tasks.sort(key = lambda _task: _task.priority + _task.waiting_frames, reverse = True)
+
+    _frame_start = time.time()
+
+    for _i in range(len(_due_tasks)):
+
+      # always execute at least one task, so the budget cannot stall the application
+      if self.budget > 0 and _i > 0 and time.time() - _frame_start > self.budget:
+
+        for _task in _due_tasks[_i:]:
+          _task.waiting_frames += 1
+          _task.deferred_count += 1
+
+        self.over_budget_count += 1
+        break
+
+      self.execute_task(_due_tasks[_i])
+
+  ## Executes a single task and updates its statistics.
+  # @param TASK The FrameTask to be executed.
+  def execute_task(self, TASK):
+
+    TASK.dirty = False
+    TASK.waiting_frames = 0
+
+    _start = time.time()
+    TASK.callback()
+    TASK.total_time += time.time() - _start
+
+    TASK.executed_count += 1
+
+  ## Returns a dictionary mapping task names to their accumulated statistics.
+  def get_statistics(self):
+
+    _statistics = {}
+
+    for _task in self.tasks:
+
+      if _task.name not in _statistics:
+        _statistics[_task.name] = {"tasks" : 0, "executed" : 0, "skipped" : 0, "deferred" : 0, "time" : 0.0}
+
+      _entry = _statistics[_task.name]
+      _entry["tasks"] += 1
+      _entry["executed"] += _task.executed_count
+      _entry["skipped"] += _task.skipped_count
+      _entry["deferred"] += _task.deferred_count
+      _entry["time"] += _task.total_time
+
+    return _statistics
+
+  ## Prints the executed versus skipped work of all tasks, grouped by task name.
+  def print_statistics(self):
+
+    print_headline("Frame scheduler (" + str(self.frame_count) + " frames, " + str(self.over_budget_count) + " over budget)")
+
+    print("{0:>6} {1:>10} {2:>10} {3:>10} {4:>10}  {5}".format("tasks", "executed", "skipped", "deferred", "time [s]", "name"))
+
+    _statistics = self.get_statistics()
+
+    for _name in sorted(_statistics):
+      _entry = _statistics[_name]
+      print("{0:>6d} {1:>10d} {2:>10d} {3:>10d} {4:>10.3f}  {5}".format(_entry["tasks"], _entry["executed"], _entry["skipped"], _entry["deferred"], _entry["time"], _name))
+
+    print("")
+
+
+## @var frame_scheduler
+# Global FrameScheduler instance shared by all framework classes.
+frame_scheduler = FrameScheduler()
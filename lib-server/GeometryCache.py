@@ -0,0 +1,166 @@
+#!/usr/bin/python
+
+## @file
+# Contains class GeometryCache and its global instance geometry_cache.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from ConsoleIO import *
+
+# import python libraries
+import os
+
+## Process-wide cache of geometries loaded by the TriMeshLoader.
+# The first request of a combination of file, loader flags and material returns the loaded subtree itself.
+# Only when the combination is requested again, it is loaded once more as a template which is never attached
+# to a scenegraph; this and all further requests create new nodes referencing the template's geometry resources,
+# so the mesh data is shared by all instances. Templates are released when no scene uses them anymore.
+class GeometryCache:
+
+  ## Default constructor.
+  def __init__(self):
+
+    ## @var loader
+    # TriMeshLoader used for all loads.
+    self.loader = avango.gua.nodes.TriMeshLoader()
+
+    ## @var templates
+    # Dictionary mapping tuples of file name, loader flags and material to the template subtrees.
+    self.templates = {}
+
+    ## @var scene_users
+    # Dictionary mapping tuples of file name, loader flags and material to the list of scenes which requested them.
+    # None stands for requests of the framework itself, e.g. tool and avatar geometries, which are never released.
+    self.scene_users = {}
+
+    ## @var load_count
+    # Number of geometries actually loaded from disk.
+    self.load_count = 0
+
+    ## @var saved_load_count
+    # Number of geometries created as instances of a template instead of being loaded.
+    self.saved_load_count = 0
+
+    ## @var saved_bytes
+    # Memory saved by instancing, estimated from the file sizes of the instanced geometries.
+    self.saved_bytes = 0
+
+  ## Creates a geometry node from a file like TriMeshLoader.create_geometry_from_file, sharing the mesh data with earlier loads.
+  # @param NAME Name of the new node.
+  # @param FILENAME Path to the object file to be loaded.
+  # @param MATERIAL Material string to be used for the geometry.
+  # @param FLAGS Combination of avango.gua.LoaderFlags to be used for loading.
+  # @param SCENE The SceneObject the geometry belongs to or None for geometries of the framework itself.
+  def create_geometry_from_file(self, NAME, FILENAME, MATERIAL, FLAGS, SCENE = None):
+
+    _key = (FILENAME, int(FLAGS), MATERIAL)
+
+    # first request --> hand out the loaded subtree itself, nothing is kept
+    if _key not in self.scene_users:
+      self.scene_users[_key] = [SCENE]
+      self.load_count += 1
+
+      return self.loader.create_geometry_from_file(NAME, FILENAME, MATERIAL, FLAGS)
+
+    self.scene_users[_key].append(SCENE)
+
+    if _key in self.templates:
+
+      _node = self.create_instance(self.templates[_key])
+
+      if _node != None:
+        _node.Name.value = NAME
+
+        self.saved_load_count += 1
+
+        if os.path.isfile(FILENAME):
+          self.saved_bytes += os.path.getsize(FILENAME)
+
+        return _node
+
+    # requested again --> load it once more as a template for this and all further requests
+    _template = self.loader.create_geometry_from_file(NAME, FILENAME, MATERIAL, FLAGS)
+    self.load_count += 1
+
+    _node = self.create_instance(_template)
+
+    # templates containing node types that cannot be instanced are not kept, so the file is loaded again next time
+    if _node == None:
+      return _template
+
+    self.templates[_key] = _template
+
+    return _node
+
+  ## Releases the requests of a scene, e.g. when it is unloaded. Templates no scene uses anymore are released.
+  # @param SCENE The SceneObject whose requests are to be released.
+  def remove_scene(self, SCENE):
+
+    for _key in list(self.scene_users.keys()):
+
+      _users = [_user for _user in self.scene_users[_key] if _user != SCENE]
+
+      if len(_users) > 0:
+        self.scene_users[_key] = _users
+        continue
+
+      del self.scene_users[_key]
+
+      if _key in self.templates:
+        del self.templates[_key]
+
+  ## Returns a copy of a template subtree whose geometry nodes reference the template's geometry resources.
+  # Returns None if the subtree contains node types other than transform and triangle mesh nodes.
+  # @param TEMPLATE Root of the template subtree.
+  def create_instance(self, TEMPLATE):
+
+    _type = TEMPLATE.get_type()
+
+    if _type == "av::gua::TriMeshNode":
+      _node = avango.gua.nodes.TriMeshNode(Name = TEMPLATE.Name.value
+                                         , Geometry = TEMPLATE.Geometry.value
+                                         , Material = TEMPLATE.Material.value)
+
+    elif _type == "av::gua::TransformNode":
+      _node = avango.gua.nodes.TransformNode(Name = TEMPLATE.Name.value)
+
+    else:
+      return None
+
+    _node.Transform.value = TEMPLATE.Transform.value
+    _node.GroupNames.value = list(TEMPLATE.GroupNames.value)
+
+    for _child in TEMPLATE.Children.value:
+
+      _child_instance = self.create_instance(_child)
+
+      if _child_instance == None:
+        return None
+
+      _node.Children.value.append(_child_instance)
+
+    return _node
+
+  ## Returns a dictionary with the numbers of loaded and instanced geometries and the memory saved, estimated from file sizes.
+  def get_statistics(self):
+
+    return {"loaded" : self.load_count
+          , "templates" : len(self.templates)
+          , "saved_loads" : self.saved_load_count
+          , "saved_bytes" : self.saved_bytes}
+
+  ## Prints the statistics on the console.
+  def print_statistics(self):
+
+    _statistics = self.get_statistics()
+    print_message("Geometry cache: " + str(_statistics["loaded"]) + " loads" + \
+                  ", " + str(_statistics["saved_loads"]) + " loads saved by instancing" + \
+                  ", about " + str(round(_statistics["saved_bytes"] / (1024.0 * 1024.0), 2)) + " MiB of mesh data shared (estimated from file sizes)")
+
+
+## @var geometry_cache
+# Global GeometryCache instance shared by all framework classes.
+geometry_cache = GeometryCache()
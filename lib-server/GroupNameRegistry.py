@@ -0,0 +1,127 @@
+#!/usr/bin/python
+
+## @file
+# Contains class GroupNameRegistry and its global instance group_name_registry.
+
+# import framework libraries
+from ConsoleIO import *
+
+# import python libraries
+import json
+import os
+import zlib
+
+## Group names which are always part of a render mask.
+RENDER_MASK_INCLUDED_GROUPS = ["main_scene"]
+
+## Group names which are always excluded by a render mask.
+RENDER_MASK_EXCLUDED_GROUPS = ["do_not_display_group", "portal_invisible_group"]
+
+## Number of base 36 digits of a token, not counting its prefix.
+TOKEN_LENGTH = 6
+
+## Maps logical group names such as w0_dg1_u2 or portal_3_head_w0_dg0_u1 to short tokens.
+# The tokens are used in GroupNames fields and render masks instead of the long names. A token
+# only depends on the name it stands for, so server and clients derive the same tokens without
+# exchanging the mapping. The well-known groups such as main_scene are not tokenized.
+class GroupNameRegistry:
+
+  ## Default constructor.
+  def __init__(self):
+
+    ## @var tokens
+    # Dictionary mapping group names to their tokens.
+    self.tokens = {}
+
+    ## @var names
+    # Dictionary mapping tokens to the group names they were created for.
+    self.names = {}
+
+  ## Computes the token for a group name.
+  # @param NAME The group name to compute the token for.
+  @staticmethod
+  def compute_token(NAME):
+
+    _value = zlib.crc32(NAME.encode("utf-8")) % (36 ** TOKEN_LENGTH)
+    _digits = ""
+
+    for _i in range(TOKEN_LENGTH):
+      _digits = "0123456789abcdefghijklmnopqrstuvwxyz"[_value % 36] + _digits
+      _value //= 36
+
+    return "g" + _digits
+
+  ## Returns the token for a group name and registers it.
+  # @param NAME The group name to get the token for.
+  def get_token(self, NAME):
+
+    if NAME in self.tokens:
+      return self.tokens[NAME]
+
+    _token = GroupNameRegistry.compute_token(NAME)
+
+    if _token in self.names:
+      print_warning("Group names " + self.names[_token] + " and " + NAME + " share the token " + _token + ".")
+
+    self.tokens[NAME] = _token
+    self.names[_token] = NAME
+
+    return _token
+
+  ## Returns the token of the group of a user's view in a display group.
+  # @param WORKSPACE_ID Identification number of the workspace.
+  # @param DISPLAY_GROUP_ID Identification number of the display group within the workspace.
+  # @param USER_ID Identification number of the user within the workspace.
+  def get_user_token(self, WORKSPACE_ID, DISPLAY_GROUP_ID, USER_ID):
+
+    return self.get_token("w" + str(WORKSPACE_ID) + "_dg" + str(DISPLAY_GROUP_ID) + "_u" + str(USER_ID))
+
+  ## Returns the group name a token was created for or the token itself if it is unknown.
+  # @param TOKEN The token to look up.
+  def get_name(self, TOKEN):
+
+    return self.names.get(TOKEN, TOKEN)
+
+  ## Builds a render mask showing the well-known scene groups and the given groups.
+  # @param GROUP_TOKENS List of tokens of the groups to be shown additionally.
+  def build_render_mask(self, GROUP_TOKENS):
+
+    _included = RENDER_MASK_INCLUDED_GROUPS + GROUP_TOKENS
+    _excluded = ["!" + _name for _name in RENDER_MASK_EXCLUDED_GROUPS]
+
+    return "(" + " | ".join(_included) + ") && " + " && ".join(_excluded)
+
+  ## Prints the mapping of all registered tokens to their group names.
+  def print_mapping(self):
+
+    print_headline("Group name tokens")
+
+    for _token in sorted(self.names):
+      print(_token + "  " + self.names[_token])
+
+    print("")
+
+  ## Writes the mapping of all registered tokens to their group names to a JSON file.
+  # @param PATH File path to write to.
+  def write_json(self, PATH):
+
+    with open(PATH, "w") as _file:
+      json.dump(self.names, _file, indent = 2, sort_keys = True)
+
+  ## Prints the mapping if the environment variable NVF_GROUP_NAMES is set and
+  # writes it to the file named by NVF_GROUP_NAMES_JSON if that one is set.
+  def dump_from_environment(self):
+
+    if os.environ.get("NVF_GROUP_NAMES", "") not in ["", "0"]:
+      self.print_mapping()
+
+    _json_path = os.environ.get("NVF_GROUP_NAMES_JSON", "")
+
+    if _json_path != "":
+      self.write_json(_json_path)
+      print_message("Group name tokens written to " + _json_path)
+
+
+## @var group_name_registry
+# Global GroupNameRegistry instance shared by all framework classes.
+group_name_registry = GroupNameRegistry()
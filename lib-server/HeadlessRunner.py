@@ -0,0 +1,150 @@
+#!/usr/bin/python
+
+## @file
+# Contains class HeadlessRunner.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from ConsoleIO import *
+from FrameScheduler import frame_scheduler
+from TransformBatch import transform_batch
+from PickService import pick_service
+
+# import python libraries
+import os
+import time
+
+## Drives the application loop of the server without any window or pipeline.
+# Every frame evaluates all scripts and frame callbacks as in the normal loop, but nothing is rendered.
+# The time spent per frame is measured and reported periodically, which allows capacity tests
+# with many users, tools and portals on machines without a GPU.
+class HeadlessRunner:
+
+  ## Custom constructor.
+  # @param VIEWER The guacamole viewer whose frames are to be driven. Must not contain any pipelines.
+  # @param FPS Frame rate the loop is throttled to. 0 runs the frames as fast as possible.
+  # @param FRAME_COUNT Number of frames to run before returning. 0 runs forever.
+  # @param REPORT_INTERVAL Number of frames after which the frame time statistics are printed.
+  def __init__(self, VIEWER, FPS = 60.0, FRAME_COUNT = 0, REPORT_INTERVAL = 300):
+
+    ## @var VIEWER
+    # The guacamole viewer whose frames are to be driven.
+    self.VIEWER = VIEWER
+
+    ## @var fps
+    # Frame rate the loop is throttled to. 0 runs the frames as fast as possible.
+    self.fps = FPS
+
+    ## @var frame_count
+    # Number of frames to run before returning. 0 runs forever.
+    self.frame_count = FRAME_COUNT
+
+    ## @var report_interval
+    # Number of frames after which the frame time statistics are printed.
+    self.report_interval = REPORT_INTERVAL
+
+    ## @var frame_times
+    # Durations in seconds of the frames since the last report.
+    self.frame_times = []
+
+    ## @var total_frames
+    # Number of frames evaluated since the loop was started.
+    self.total_frames = 0
+
+    ## @var total_time
+    # Accumulated duration in seconds of all frames evaluated since the loop was started.
+    self.total_time = 0.0
+
+  ## Creates a HeadlessRunner if the environment variable NVF_HEADLESS is set, otherwise returns None.
+  # NVF_HEADLESS_FPS sets the frame rate (default 60, 0 for unthrottled), NVF_HEADLESS_FRAMES the
+  # number of frames to run (default 0 for endless) and NVF_HEADLESS_REPORT the report interval in frames.
+  # @param VIEWER The guacamole viewer whose frames are to be driven.
+  @staticmethod
+  def create_from_environment(VIEWER):
+
+    if os.environ.get("NVF_HEADLESS", "") in ["", "0"]:
+      return None
+
+    return HeadlessRunner(VIEWER
+                        , float(os.environ.get("NVF_HEADLESS_FPS", "60"))
+                        , int(os.environ.get("NVF_HEADLESS_FRAMES", "0"))
+                        , int(os.environ.get("NVF_HEADLESS_REPORT", "300")))
+
+  ## Evaluates a single frame and returns its duration in seconds.
+  def evaluate_frame(self):
+
+    _start = time.time()
+
+    if hasattr(self.VIEWER, "frame"):
+      self.VIEWER.frame()
+    else:
+      avango.evaluate()
+
+    return time.time() - _start
+
+  ## Runs the frame loop until FRAME_COUNT frames were evaluated or the loop is interrupted.
+  def run(self):
+
+    if self.fps > 0:
+      print_headline("Headless mode: " + str(self.fps) + " fps")
+      _frame_period = 1.0 / self.fps
+    else:
+      print_headline("Headless mode: unthrottled")
+      _frame_period = 0.0
+
+    _next_frame_time = time.time()
+
+    try:
+      while self.frame_count == 0 or self.total_frames < self.frame_count:
+
+        _duration = self.evaluate_frame()
+
+        self.frame_times.append(_duration)
+        self.total_frames += 1
+        self.total_time += _duration
+
+        if len(self.frame_times) >= self.report_interval:
+          self.print_report()
+
+        # throttle to the desired frame rate without accumulating lag
+        if _frame_period > 0:
+          _next_frame_time = max(_next_frame_time + _frame_period, time.time())
+          time.sleep(max(0.0, _next_frame_time - time.time()))
+
+    except KeyboardInterrupt:
+      pass
+
+    if len(self.frame_times) > 0:
+      self.print_report()
+
+    self.print_summary()
+
+  ## Prints the statistics of the frames since the last report and starts a new interval.
+  def print_report(self):
+
+    _frame_times = sorted(self.frame_times)
+    _mean = sum(_frame_times) / len(_frame_times)
+    _p95 = _frame_times[min(len(_frame_times) - 1, int(len(_frame_times) * 0.95))]
+
+    print_message("Frames " + str(self.total_frames - len(_frame_times) + 1) + "-" + str(self.total_frames) + \
+                  ": mean " + str(round(_mean * 1000, 3)) + " ms" + \
+                  ", p95 " + str(round(_p95 * 1000, 3)) + " ms" + \
+                  ", max " + str(round(_frame_times[-1] * 1000, 3)) + " ms")
+
+    self.frame_times = []
+
+  ## Prints the statistics of all frames evaluated since the loop was started.
+  def print_summary(self):
+
+    if self.total_frames == 0:
+      return
+
+    print_message("Headless run finished after " + str(self.total_frames) + " frames" + \
+                  ", mean frame time " + str(round(self.total_time / self.total_frames * 1000, 3)) + " ms.")
+
+    frame_scheduler.print_statistics()
+    transform_batch.print_statistics()
+    pick_service.print_statistics()
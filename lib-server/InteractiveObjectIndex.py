@@ -0,0 +1,114 @@
+#!/usr/bin/python
+
+## @file
+# Contains class InteractiveObjectIndex and its global instance interactive_object_index.
+
+## Dictionaries mapping object names, scenegraph paths and scenegraph nodes to InteractiveObject instances.
+# Objects are added on creation, their paths are updated when they are reparented and all entries
+# are removed on deletion, so lookups do not have to scan the object lists or walk hierarchies.
+class InteractiveObjectIndex:
+
+  ## Default constructor.
+  def __init__(self):
+
+    ## @var by_name
+    # Dictionary mapping node names to the lists of objects with that name, in order of creation.
+    self.by_name = {}
+
+    ## @var by_path
+    # Dictionary mapping scenegraph paths to objects.
+    self.by_path = {}
+
+    ## @var by_node
+    # Dictionary mapping scenegraph nodes to objects.
+    self.by_node = {}
+
+    ## @var paths
+    # Dictionary mapping objects to the paths they are currently indexed with.
+    self.paths = {}
+
+  ## Adds an object to the index.
+  # @param OBJECT The InteractiveObject to be added.
+  def add(self, OBJECT):
+
+    _node = OBJECT.get_node()
+
+    self.by_name.setdefault(_node.Name.value, []).append(OBJECT)
+    self.by_node[_node] = OBJECT
+    self.update_path(OBJECT)
+
+  ## Removes an object from the index.
+  # @param OBJECT The InteractiveObject to be removed.
+  def remove(self, OBJECT):
+
+    _node = OBJECT.get_node()
+    _objects = self.by_name.get(_node.Name.value, [])
+
+    if OBJECT in _objects:
+      _objects.remove(OBJECT)
+
+      if len(_objects) == 0:
+        del self.by_name[_node.Name.value]
+
+    if self.by_node.get(_node) == OBJECT:
+      del self.by_node[_node]
+
+    self.remove_path(OBJECT)
+
+  ## Updates the path entry of an object, e.g. after it was reparented. Objects not in the index are ignored.
+  # @param OBJECT The InteractiveObject whose path changed.
+  def update_path(self, OBJECT):
+
+    if self.by_node.get(OBJECT.get_node()) != OBJECT:
+      return
+
+    self.remove_path(OBJECT)
+
+    _path = OBJECT.get_path()
+
+    if _path != None:
+      self.by_path[_path] = OBJECT
+      self.paths[OBJECT] = _path
+
+  ## Removes the path entry of an object, e.g. after it was detached from the scenegraph.
+  # @param OBJECT The InteractiveObject whose path is to be removed.
+  def remove_path(self, OBJECT):
+
+    _path = self.paths.pop(OBJECT, None)
+
+    if _path != None and self.by_path.get(_path) == OBJECT:
+      del self.by_path[_path]
+
+  ## Returns the first created object with a given name or None.
+  # @param NAME The node name to be searched for.
+  def get_by_name(self, NAME):
+
+    _objects = self.by_name.get(NAME)
+
+    if _objects == None:
+      return None
+
+    return _objects[0]
+
+  ## Returns the object at a given scenegraph path or None.
+  # @param PATH The scenegraph path to be searched for.
+  def get_by_path(self, PATH):
+
+    return self.by_path.get(PATH)
+
+  ## Returns the object associated with a scenegraph node or None.
+  # Falls back to the node's InteractiveObject field if the wrapper of the node is not the indexed one.
+  # @param NODE The scenegraph node to be searched for.
+  def get_by_node(self, NODE):
+
+    _object = self.by_node.get(NODE)
+
+    if _object == None and NODE.has_field("InteractiveObject") == True:
+      _object = NODE.InteractiveObject.value
+
+    return _object
+
+
+## @var interactive_object_index
+# Global InteractiveObjectIndex instance containing the objects of all scenes, used to look up picked nodes.
+interactive_object_index = InteractiveObjectIndex()
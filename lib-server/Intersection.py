@@ -8,6 +8,10 @@ import avango
 import avango.gua
 import avango.script
 
+# import framework libraries
+from PickService import pick_service
+from FrameScheduler import frame_scheduler
+
 # import python libraries
 # ...
 
@@ -36,7 +40,8 @@ class Intersection(avango.script.Script):
   # @param PICK_LENGTH Length of the ray in meters.
   # @param PICK_MASK Picking mask of the intersection process.
   # @param PICK_ONLY_FIRST_OBJECT Boolean saying if only the first hit is to be taken.
-  def my_constructor(self, SCENEGRAPH, SF_PICK_MAT, PICK_LENGTH, PICK_MASK = "", PICK_ONLY_FIRST_OBJECT = True):
+  # @param COMPONENT Name of the component using this instance, used in the statistics of the PickService.
+  def my_constructor(self, SCENEGRAPH, SF_PICK_MAT, PICK_LENGTH, PICK_MASK = "", PICK_ONLY_FIRST_OBJECT = True, COMPONENT = "Intersection"):
     
     ## @var SCENEGRAPH
     # Reference to the scenegraph.
@@ -51,9 +56,9 @@ class Intersection(avango.script.Script):
     # nothing will be written in mf_pick_result.
     self.activated = True
   
-    ## @var ray
-    # The spatial ray to be analyzed.
-    self.ray = avango.gua.nodes.RayNode()
+    ## @var component
+    # Name of the component using this instance, used in the statistics of the PickService.
+    self.component = COMPONENT
   
     ## @var picking_options
     # Picking options for the intersection process.
@@ -73,26 +78,22 @@ class Intersection(avango.script.Script):
   
     # init field connections
     self.sf_pick_mat.connect_from(SF_PICK_MAT)
-  
-    self.always_evaluate(True)
+
+    ## @var frame_task
+    # FrameTask evaluating the frame_callback method every frame while activated. The picked nodes can move
+    # under a resting ray, so sf_pick_mat alone does not tell when the results change.
+    self.frame_task = frame_scheduler.register(COMPONENT, self.frame_callback)
     
-  ## Evaluated every frame.
-  def evaluate(self):
-  
-    if self.activated == True:
+  ## Evaluated every frame while activated.
+  def frame_callback(self):
      
-      # set ray properties
-      self.ray.Transform.value =  self.sf_pick_mat.value * \
-                                  avango.gua.make_scale_mat(1.0, 1.0, self.pick_length)
-
-      #print self.pick_length, self.ray.Transform.value, self.ray.Transform.value.get_rotate()
-          
-      # compute picking results
-      _pick_result = self.SCENEGRAPH.ray_test(self.ray, self.picking_options, self.picking_mask)
-      self.mf_pick_result.value = _pick_result.value
+    # compute picking results, shared with identical requests of other components in this frame
+    _pick_result = pick_service.ray_test(self.SCENEGRAPH, self.sf_pick_mat.value, self.pick_length, self.picking_options, self.picking_mask, self.component)
+    self.mf_pick_result.value = _pick_result.value
   
 
   ## Activate/Deactivate the intersection procedure.
   def activate(self, FLAG):
     self.activated = FLAG
+    self.frame_task.active = FLAG
 
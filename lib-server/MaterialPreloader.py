@@ -0,0 +1,214 @@
+#!/usr/bin/python
+
+## @file
+# Contains functions to preload only the materials and shading models referenced by the framework.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from ConsoleIO import *
+
+# import python libraries
+import ast
+import glob
+import hashlib
+import json
+import os
+
+## Directory containing all materials and shading models.
+MATERIAL_DIRECTORY = "data/materials"
+
+## Source directories which are scanned for material references in addition to the workspace configuration file.
+SOURCE_DIRECTORIES = ["configs", "lib-server", "lib-server/MultiTouch", "lib-client"]
+
+## Preloads the materials and shading models for the given workspace configuration.
+# The environment variable NVF_MATERIAL_PRELOAD selects the mode: "all" (default) loads the complete
+# material directory, "referenced" loads only the materials referenced by the scanned sources.
+# @param WORKSPACE_CONFIG_FILE Filepath of the active workspace configuration file.
+def preload_materials(WORKSPACE_CONFIG_FILE):
+
+  _referenced_mode = os.environ.get("NVF_MATERIAL_PRELOAD", "all") == "referenced"
+
+  if _referenced_mode == True and \
+     (hasattr(avango.gua, "load_shading_model") == False or hasattr(avango.gua, "load_material") == False):
+    print_warning("NVF_MATERIAL_PRELOAD=referenced needs avango.gua.load_shading_model and avango.gua.load_material, " + \
+                  "which are not available. Loading the complete " + MATERIAL_DIRECTORY + " directory instead.")
+    _referenced_mode = False
+
+  if _referenced_mode == False:
+    avango.gua.load_shading_models_from(MATERIAL_DIRECTORY)
+    avango.gua.load_materials_from(MATERIAL_DIRECTORY)
+    return
+
+  _shading_models, _materials = get_referenced_materials(WORKSPACE_CONFIG_FILE)
+
+  for _shading_model in _shading_models:
+    avango.gua.load_shading_model(_shading_model)
+
+  for _material in _materials:
+    avango.gua.load_material(_material)
+
+  print_message("Preloaded " + str(len(_materials)) + " referenced materials and " + str(len(_shading_models)) + " shading models.")
+
+## Returns the shading model and material paths referenced by the workspace configuration and the framework sources.
+# A manifest storing the result together with content hashes of all involved files and a hash of the
+# scanned directory listings is used to skip scanning and parsing as long as no file changed, was added or was removed.
+# @param WORKSPACE_CONFIG_FILE Filepath of the active workspace configuration file.
+def get_referenced_materials(WORKSPACE_CONFIG_FILE):
+
+  _source_files = [WORKSPACE_CONFIG_FILE]
+
+  for _directory in SOURCE_DIRECTORIES:
+    _source_files += sorted(glob.glob(os.path.join(_directory, "*.py")))
+
+  _listing_hash = hash_listing(_source_files)
+
+  _manifest_path = get_manifest_path(WORKSPACE_CONFIG_FILE)
+  _manifest = load_manifest(_manifest_path, _listing_hash)
+
+  if _manifest != None:
+    return _manifest["shading_models"], _manifest["materials"]
+
+  _materials = find_material_references(_source_files)
+  _shading_models = find_shading_model_references(_materials)
+
+  _hashes = {}
+
+  for _path in _source_files + _materials + _shading_models:
+    _hashes[_path] = hash_file(_path)
+
+  write_manifest(_manifest_path, {"hashes" : _hashes, "listing" : _listing_hash, "materials" : _materials, "shading_models" : _shading_models})
+
+  return _shading_models, _materials
+
+## Returns the material paths which are referenced by string literals in the given python sources.
+# Besides full paths, a material is also found if it is composed of two literals such as
+# a trace material name and a suffix like "Shadeless.gmd".
+# @param SOURCE_FILES List of python source files to be scanned.
+def find_material_references(SOURCE_FILES):
+
+  _literals = set()
+
+  for _path in set(SOURCE_FILES):
+
+    try:
+      _tree = ast.parse(open(_path, encoding = "utf-8", errors = "replace").read(), _path)
+    except (IOError, SyntaxError):
+      print_warning("Could not scan " + _path + " for material references.")
+      continue
+
+    for _node in ast.walk(_tree):
+
+      if type(_node).__name__ == "Str": # python versions before 3.8
+        _literals.add(_node.s)
+
+      elif type(_node).__name__ == "Constant" and isinstance(_node.value, str):
+        _literals.add(_node.value)
+
+  _names = set()
+  _suffixes = [_literal for _literal in _literals if _literal.endswith(".gmd") and "/" not in _literal]
+  _prefixes = [_literal for _literal in _literals if "/" not in _literal and "." not in _literal and _literal != ""]
+
+  for _literal in _literals:
+    if _literal.endswith(".gmd"):
+      _names.add(os.path.basename(_literal))
+
+  for _prefix in _prefixes:
+    for _suffix in _suffixes:
+      _names.add(_prefix + _suffix)
+
+  _materials = []
+
+  for _name in sorted(_names):
+    _path = MATERIAL_DIRECTORY + "/" + _name
+
+    if os.path.isfile(_path):
+      _materials.append(_path)
+
+  return _materials
+
+## Returns the shading model paths used by the given materials.
+# @param MATERIALS List of material paths to be parsed.
+def find_shading_model_references(MATERIALS):
+
+  _shading_models = set()
+
+  for _material in MATERIALS:
+
+    try:
+      _shading_model = json.load(open(_material))["shading_model"]
+    except (IOError, ValueError, KeyError):
+      print_warning("Could not read the shading model of " + _material + ".")
+      continue
+
+    _path = MATERIAL_DIRECTORY + "/" + os.path.basename(_shading_model)
+
+    if os.path.isfile(_path):
+      _shading_models.add(_path)
+
+  return sorted(_shading_models)
+
+## Returns the SHA-1 hash of a file's content or None if it cannot be read.
+# @param PATH The file to be hashed.
+def hash_file(PATH):
+
+  try:
+    return hashlib.sha1(open(PATH, "rb").read()).hexdigest()
+  except IOError:
+    return None
+
+## Returns the SHA-1 hash of the sorted list of scanned source files and material directory entries.
+# A new source or material file changes the hash even though no hashed file changed.
+# @param SOURCE_FILES List of python source files to be scanned.
+def hash_listing(SOURCE_FILES):
+
+  try:
+    _entries = [_name for _name in os.listdir(MATERIAL_DIRECTORY) if _name.startswith(".") == False]
+  except OSError:
+    _entries = []
+
+  return hashlib.sha1("\n".join(sorted(SOURCE_FILES) + sorted(_entries)).encode("utf-8")).hexdigest()
+
+## Returns the manifest file path for a workspace configuration file.
+# @param WORKSPACE_CONFIG_FILE Filepath of the active workspace configuration file.
+def get_manifest_path(WORKSPACE_CONFIG_FILE):
+
+  _config_name = os.path.basename(WORKSPACE_CONFIG_FILE).replace(".py", "")
+  return MATERIAL_DIRECTORY + "/.preload_manifest_" + _config_name + ".json"
+
+## Loads a manifest and returns it if all files it was built from and the directory listings are unchanged, otherwise None.
+# @param PATH Path of the manifest file.
+# @param LISTING_HASH Hash of the current directory listings as returned by hash_listing.
+def load_manifest(PATH, LISTING_HASH):
+
+  try:
+    _manifest = json.load(open(PATH))
+  except (IOError, ValueError):
+    return None
+
+  if _manifest.get("listing") != LISTING_HASH:
+    return None
+
+  for _path, _hash in _manifest["hashes"].items():
+    if hash_file(_path) != _hash:
+      return None
+
+  return _manifest
+
+## Writes a manifest atomically, so concurrently starting clients never read a partial file.
+# @param PATH Path of the manifest file.
+# @param MANIFEST Dictionary to be written.
+def write_manifest(PATH, MANIFEST):
+
+  _temp_path = PATH + "." + str(os.getpid())
+
+  try:
+    with open(_temp_path, "w") as _file:
+      json.dump(MANIFEST, _file, indent = 2, sort_keys = True)
+
+    os.replace(_temp_path, PATH)
+
+  except (IOError, OSError):
+    print_warning("Could not write material manifest " + PATH + ".")
@@ -1,6 +1,10 @@
 #!/bin/python
 
 from SceneManager import SceneManager 
+from InteractiveObjectIndex import interactive_object_index
+from GeometryCache import geometry_cache
+from TransformBatch import transform_batch
+from PickBroadPhase import pick_broad_phase
 from Intersection import *
 import Utilities
 
@@ -80,7 +84,7 @@ class MultiTouchDevice(avango.script.Script):
         """  """
         self._applicationManager = APPLICATION_MANAGER
 
-        self._intersection.my_constructor(self._sceneGraph, self._rayOrientation, self.ray_length, "") # parameters: SCENEGRAPH, SF_PICK_MATRIX, PICK_LENGTH, PICKMASK
+        self._intersection.my_constructor(self._sceneGraph, self._rayOrientation, self.ray_length, "", True, "MultiTouchDevice") # parameters: SCENEGRAPH, SF_PICK_MATRIX, PICK_LENGTH, PICKMASK, PICK_ONLY_FIRST_OBJECT, COMPONENT
 
         """ parent node of ray node """
         _parent_node = self._sceneGraph["/net"]
@@ -93,13 +97,11 @@ class MultiTouchDevice(avango.script.Script):
         self.ray_transform = avango.gua.nodes.TransformNode(Name = "ray_transform")
         _parent_node.Children.value.append(self.ray_transform)
 
-        _loader = avango.gua.nodes.TriMeshLoader()
-        
         """
         ## @var ray_geometry
         # Geometry node representing the ray graphically.
         """
-        self.ray_geometry = _loader.create_geometry_from_file("ray_geometry", "data/objects/cylinder.obj", "data/materials/White.gmd", avango.gua.LoaderFlags.DEFAULTS)
+        self.ray_geometry = geometry_cache.create_geometry_from_file("ray_geometry", "data/objects/cylinder.obj", "data/materials/White.gmd", avango.gua.LoaderFlags.DEFAULTS)
         self.ray_transform.Children.value.append(self.ray_geometry)
         self.ray_geometry.GroupNames.value = ["do_not_display_group"]
 
@@ -111,19 +113,19 @@ class MultiTouchDevice(avango.script.Script):
         @var intersection_point_geometry
         Geometry node representing the intersection point of the ray with an object in the scene.
         """
-        self.intersection_point_geometry = _loader.create_geometry_from_file("intersection_point_geometry", "data/objects/sphere.obj", "data/materials/White.gmd", avango.gua.LoaderFlags.DEFAULTS)
+        self.intersection_point_geometry = geometry_cache.create_geometry_from_file("intersection_point_geometry", "data/objects/sphere.obj", "data/materials/White.gmd", avango.gua.LoaderFlags.DEFAULTS)
         NET_TRANS_NODE.Children.value.append(self.intersection_point_geometry)
         self.intersection_point_geometry.GroupNames.value = ["do_not_display_group"] # set geometry invisible
 
         self.ray_transform.Transform.connect_from(self._rayOrientation)
 
         """ representation of fingercenterpos """
-        self.fingercenterpos_geometry = _loader.create_geometry_from_file("fingercenterpos", "data/objects/sphere.obj", "data/materials/Red.gmd", avango.gua.LoaderFlags.DEFAULTS)
+        self.fingercenterpos_geometry = geometry_cache.create_geometry_from_file("fingercenterpos", "data/objects/sphere.obj", "data/materials/Red.gmd", avango.gua.LoaderFlags.DEFAULTS)
         NET_TRANS_NODE.Children.value.append(self.fingercenterpos_geometry)
         self.fingercenterpos_geometry.GroupNames.value = ["do_not_display_group"]
 
         """ hand representation """
-        self.handPos_geometry = _loader.create_geometry_from_file("handpos", "data/objects/cube.obj", "data/materials/Red.gmd", avango.gua.LoaderFlags.DEFAULTS)
+        self.handPos_geometry = geometry_cache.create_geometry_from_file("handpos", "data/objects/cube.obj", "data/materials/Red.gmd", avango.gua.LoaderFlags.DEFAULTS)
         NET_TRANS_NODE.Children.value.append(self.handPos_geometry)
         self.handPos_geometry.GroupNames.value = ["do_not_display_group"]
 
@@ -295,8 +297,9 @@ class MultiTouchDevice(avango.script.Script):
         if self._objectMode:
             _node = self._lastIntersectionObject
 
-            if _node.has_field("InteractiveObject") == True:
-                _object = _node.InteractiveObject.value
+            _object = interactive_object_index.get_by_node(_node)
+
+            if _object != None:
               
                 if self.hierarchy_selection_level >= 0:          
                     _object = _object.get_higher_hierarchical_object(self.hierarchy_selection_level)
@@ -395,11 +398,24 @@ class MultiTouchDevice(avango.script.Script):
 
             """ object mode """
             if self._objectMode:
-                self._sceneGraph[objectNode].Transform.value = TransformMatrix
+                _object = interactive_object_index.get_by_node(self._sceneGraph[objectNode])
+
+                if _object != None:
+                    """ marks the object modified and updates its transform version, cached parent inverses and pick boxes """
+                    _object.set_local_transform(TransformMatrix)
+
+                else:
+                    self._sceneGraph[objectNode].Transform.value = TransformMatrix
+                    transform_batch.clear_cache()
+                    pick_broad_phase.invalidate()
             
             else:
                 self._sceneGraph[sceneNode].Transform.value = TransformMatrix
 
+                """ the scene root is moved directly, so cached parent inverses and pick boxes are outdated """
+                transform_batch.clear_cache()
+                pick_broad_phase.invalidate()
+
 
         """ reset all data """ 
         self._transMat   = avango.gua.make_identity_mat()
@@ -131,8 +131,8 @@ class Navigation(VisibilityHandler1D):
 
     for _user_repr in ApplicationManager.all_user_representations:
 
-      if self.visibility_list[_user_repr.DISPLAY_GROUP.visibility_tag]:
-        _trace_visible_for.append(_user_repr.view_transform_node.Name.value)
+      if self.is_visible_for(_user_repr.DISPLAY_GROUP.visibility_tag):
+        _trace_visible_for.append(_user_repr.get_view_group_name())
 
     if len(_trace_visible_for) == 0:
       self.trace.append_to_group_names("do_not_display_group")
@@ -0,0 +1,128 @@
+#!/usr/bin/python
+
+## @file
+# Contains class NodeDistributor and its global instance node_distributor.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from ConsoleIO import *
+from scene_config import scenegraphs
+
+## Registers scenegraph nodes at the NetTransform node for distribution.
+# Keeps track of all nodes that were already distributed, so registering a subtree
+# again only touches the nodes that were added since. Traversal is iterative. The NetTransform
+# node offers no batch API, so the new nodes are passed to distribute_object one by one.
+# Distributed nodes are marked by a Distributed field on the node itself, because the python wrappers
+# returned for the same node by different field accesses are not guaranteed to hash equally and paths
+# change when nodes are reparented or siblings share a name.
+class NodeDistributor:
+
+  ## Custom constructor.
+  # @param NET_TRANS_NODE The NetTransform node on which the nodes are marked distributable.
+  def __init__(self, NET_TRANS_NODE):
+
+    ## @var NET_TRANS_NODE
+    # The NetTransform node on which the nodes are marked distributable.
+    self.NET_TRANS_NODE = NET_TRANS_NODE
+
+    ## @var distributed_count
+    # Number of nodes currently marked as distributed.
+    self.distributed_count = 0
+
+    # the nettrans node is not distributed itself
+    self.mark_distributed(NET_TRANS_NODE, True)
+
+    ## @var visited_count
+    # Total number of nodes visited by all traversals.
+    self.visited_count = 0
+
+    ## @var last_delta_count
+    # Number of nodes newly distributed by the last call of distribute_subtree.
+    self.last_delta_count = 0
+
+  ## Distributes a node and all of its children that were not distributed yet.
+  # Returns the number of newly distributed nodes.
+  # @param NODE Root of the subtree to be distributed.
+  def distribute_subtree(self, NODE):
+
+    _delta_count = 0
+    _stack = [NODE]
+
+    while len(_stack) > 0:
+
+      _node = _stack.pop()
+      self.visited_count += 1
+
+      if self.is_distributed(_node) == False:
+        self.NET_TRANS_NODE.distribute_object(_node)
+        self.mark_distributed(_node, True)
+        self.distributed_count += 1
+        _delta_count += 1
+
+      _stack.extend(_node.Children.value)
+
+    self.last_delta_count = _delta_count
+    return _delta_count
+
+  ## Appends a node to a parent node and distributes the new subtree.
+  # @param PARENT_NODE The node to append the new subtree to.
+  # @param NODE Root of the new subtree.
+  def attach(self, PARENT_NODE, NODE):
+
+    PARENT_NODE.Children.value.append(NODE)
+    self.distribute_subtree(NODE)
+
+  ## Returns a boolean saying if a node was already distributed.
+  # @param NODE The node to be checked.
+  def is_distributed(self, NODE):
+
+    return NODE.has_field("Distributed") == True and NODE.Distributed.value == True
+
+  ## Sets the Distributed marker field of a node, adding it if necessary.
+  # @param NODE The node to be marked.
+  # @param FLAG Boolean saying if the node is distributed.
+  def mark_distributed(self, NODE, FLAG):
+
+    if NODE.has_field("Distributed") == False:
+      NODE.add_and_init_field(avango.SFBool(), "Distributed", FLAG)
+    else:
+      NODE.Distributed.value = FLAG
+
+  ## Removes the distributed marks of a subtree, e.g. before its nodes are destroyed.
+  # Reparented subtrees keep their marks, so they are not distributed twice.
+  # @param NODE Root of the subtree to be forgotten.
+  def forget_subtree(self, NODE):
+
+    _stack = [NODE]
+
+    while len(_stack) > 0:
+      _node = _stack.pop()
+
+      if self.is_distributed(_node) == True:
+        self.mark_distributed(_node, False)
+        self.distributed_count -= 1
+
+      _stack.extend(_node.Children.value)
+
+  ## Returns a dictionary with the numbers of distributed nodes, visited nodes and the last delta.
+  def get_statistics(self):
+
+    return {"distributed" : self.distributed_count
+          , "visited" : self.visited_count
+          , "last_delta" : self.last_delta_count}
+
+  ## Prints the statistics on the console.
+  def print_statistics(self):
+
+    _statistics = self.get_statistics()
+    print_message("Distributed nodes: " + str(_statistics["distributed"]) + \
+                  ", visited nodes: " + str(_statistics["visited"]) + \
+                  ", last delta: " + str(_statistics["last_delta"]))
+
+
+## @var node_distributor
+# Global NodeDistributor instance for the net node of the server scenegraph.
+node_distributor = NodeDistributor(scenegraphs[0]["/net"])
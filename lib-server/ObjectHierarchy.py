@@ -0,0 +1,92 @@
+#!/usr/bin/python
+
+## @file
+# Contains class ObjectHierarchy.
+
+## Flattened representation of the InteractiveObject hierarchies of a scene.
+# All objects are stored in depth-first order, so the subtree of an object is the contiguous range from its
+# own index to its subtree end. Ancestor queries are served by the hierarchy_ancestors lists of the objects.
+# The arrays are rebuilt lazily with the first query after the hierarchy changed, so a sequence of reparentings
+# costs a single rebuild.
+class ObjectHierarchy:
+
+  ## Custom constructor.
+  # @param SCENE Reference to the SceneObject whose objects are represented.
+  def __init__(self, SCENE):
+
+    ## @var SCENE
+    # Reference to the SceneObject whose objects are represented.
+    self.SCENE = SCENE
+
+    ## @var objects
+    # List of all objects of the scene in depth-first order.
+    self.objects = []
+
+    ## @var subtree_ends
+    # List of the indices behind the last object of each object's subtree.
+    self.subtree_ends = []
+
+    ## @var dirty
+    # Boolean saying if the arrays have to be rebuilt because objects were added, removed or reparented.
+    self.dirty = True
+
+    ## @var rebuild_count
+    # Number of times the arrays were rebuilt.
+    self.rebuild_count = 0
+
+  ## Marks the arrays to be rebuilt with the next query.
+  def invalidate(self):
+
+    self.dirty = True
+
+  ## Rebuilds the arrays from the child object lists and stores each object's position in its hierarchy_index.
+  def rebuild(self):
+
+    self.objects = []
+    self.subtree_ends = []
+
+    # objects at the top of a hierarchy in order of creation, reversed because the stack is processed from the end
+    _stack = [(_object, -1) for _object in reversed(self.SCENE.objects) if _object.hierarchy_level == 0]
+
+    # open subtrees as indices into the arrays, closed when the traversal leaves them
+    _open_indices = []
+
+    while len(_stack) > 0:
+      _object, _parent_index = _stack.pop()
+
+      while len(_open_indices) > 0 and _open_indices[-1] != _parent_index:
+        self.subtree_ends[_open_indices.pop()] = len(self.objects)
+
+      _index = len(self.objects)
+      _object.hierarchy_index = _index
+
+      self.objects.append(_object)
+      self.subtree_ends.append(_index + 1)
+
+      _open_indices.append(_index)
+
+      for _child_object in reversed(_object.child_objects):
+        _stack.append((_child_object, _index))
+
+    for _index in _open_indices:
+      self.subtree_ends[_index] = len(self.objects)
+
+    self.dirty = False
+    self.rebuild_count += 1
+
+  ## Returns the list of all objects of the scene in depth-first order.
+  def get_objects(self):
+
+    if self.dirty == True:
+      self.rebuild()
+
+    return self.objects
+
+  ## Returns the list of an object and all objects below it, in depth-first order.
+  # @param OBJECT The InteractiveObject at the top of the subtree.
+  def get_subtree(self, OBJECT):
+
+    if self.dirty == True:
+      self.rebuild()
+
+    return self.objects[OBJECT.hierarchy_index:self.subtree_ends[OBJECT.hierarchy_index]]
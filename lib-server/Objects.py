@@ -11,6 +11,19 @@ from avango.script import field_has_changed
 
 # import framework libraries
 from Visualization import *
+from GeometryCache import geometry_cache
+from StartupProfiler import startup_profiler
+from NodeDistributor import node_distributor
+from InteractiveObjectIndex import InteractiveObjectIndex, interactive_object_index
+from ObjectHierarchy import ObjectHierarchy
+from TransformBatch import transform_batch
+from SceneSnapshot import SceneSnapshotRing
+from PLODBudgetController import plod_budget_controller
+from AssetLoader import asset_loader
+from PickBroadPhase import pick_broad_phase
+
+# import python libraries
+import os
 
 ## Abstract base class to represent a scene which is a collection of interactive objects.
 # Not to be instantiated.
@@ -41,6 +54,30 @@ class SceneObject:
     # List of InteractiveObject instances that belong to this scene.
     self.objects = []
 
+    ## @var object_index
+    # InteractiveObjectIndex of the objects in this scene.
+    self.object_index = InteractiveObjectIndex()
+
+    ## @var hierarchy
+    # ObjectHierarchy storing the object hierarchies of this scene as flat arrays.
+    self.hierarchy = ObjectHierarchy(self)
+
+    ## @var snapshots
+    # SceneSnapshotRing of the most recent states of this scene, used to undo manipulations.
+    self.snapshots = SceneSnapshotRing.create_from_environment()
+
+    ## @var modified_objects
+    # List of objects whose transformations were changed since the scene was reset the last time.
+    self.modified_objects = []
+
+    ## @var enabled
+    # Boolean saying if the objects of this scene are currently enabled. Objects are enabled on creation.
+    self.enabled = True
+
+    ## @var placeholder_nodes
+    # List of tuples of placeholder node and render group for the assets which are still being loaded, see AssetLoader.
+    self.placeholder_nodes = []
+
     ## @var name
     # Name to be given to the scene.
     self.name = NAME
@@ -173,23 +210,29 @@ class SceneObject:
   # @param RENDER_GROUP The render group to be associated with the new geometry.
   def init_geometry(self, NAME, FILENAME, MATRIX, MATERIAL, GROUNDFOLLOWING_PICK_FLAG, MANIPULATION_PICK_FLAG, PARENT_NODE, RENDER_GROUP):
 
-    _loader = avango.gua.nodes.TriMeshLoader()
+    self.init_asset(NAME, [FILENAME, os.path.splitext(FILENAME)[0] + ".mtl"], MATRIX, PARENT_NODE, RENDER_GROUP,
+                    lambda: self.load_geometry(NAME, FILENAME, MATRIX, MATERIAL, GROUNDFOLLOWING_PICK_FLAG, MANIPULATION_PICK_FLAG, PARENT_NODE, RENDER_GROUP))
 
-    _loader_flags = "avango.gua.LoaderFlags.OPTIMIZE_GEOMETRY" # default loader flags
+  ## Loads a geometry file and initializes its interactive objects. Parameters as in init_geometry.
+  def load_geometry(self, NAME, FILENAME, MATRIX, MATERIAL, GROUNDFOLLOWING_PICK_FLAG, MANIPULATION_PICK_FLAG, PARENT_NODE, RENDER_GROUP):
 
-    if MATERIAL == None: # no material defined --> get materials from file description
-      _loader_flags += " | avango.gua.LoaderFlags.LOAD_MATERIALS"
-      MATERIAL = "data/materials/White.gmd" # default material
+    with startup_profiler.phase("init_geometry " + NAME):
+      _loader_flags = avango.gua.LoaderFlags.OPTIMIZE_GEOMETRY # default loader flags
 
-    if GROUNDFOLLOWING_PICK_FLAG == True or MANIPULATION_PICK_FLAG == True:
-      _loader_flags += " | avango.gua.LoaderFlags.MAKE_PICKABLE"
+      if MATERIAL == None: # no material defined --> get materials from file description
+        _loader_flags |= avango.gua.LoaderFlags.LOAD_MATERIALS
+        MATERIAL = "data/materials/White.gmd" # default material
 
-    _node = _loader.create_geometry_from_file(NAME, FILENAME, MATERIAL, eval(_loader_flags))
-    _node.Transform.value = MATRIX
+      if GROUNDFOLLOWING_PICK_FLAG == True or MANIPULATION_PICK_FLAG == True:
+        _loader_flags |= avango.gua.LoaderFlags.MAKE_PICKABLE
+
+      _node = geometry_cache.create_geometry_from_file(NAME, FILENAME, MATERIAL, _loader_flags, self)
+      _node.Transform.value = MATRIX
+      startup_profiler.count_created(_node)
   
-    #print "LOADED", _node, _node.Name.value#, _loader_flags
+      #print "LOADED", _node, _node.Name.value#, _loader_flags
   
-    self.init_interactive_objects(_node, PARENT_NODE, GROUNDFOLLOWING_PICK_FLAG, MANIPULATION_PICK_FLAG, RENDER_GROUP, True)
+      self.init_interactive_objects(_node, PARENT_NODE, GROUNDFOLLOWING_PICK_FLAG, MANIPULATION_PICK_FLAG, RENDER_GROUP, True)
 
   ## Creates and initializes a light node in the scene.
   # @param TYPE Type of the new light. 0 = sun light, 1 = point light, 2 = spot light
@@ -269,9 +312,7 @@ class SceneObject:
       elif TYPE == 2: # spot light
         _filename = "data/objects/lamp.obj"
 
-      _loader = avango.gua.nodes.TriMeshLoader()
-  
-      _light_geometry = _loader.create_geometry_from_file(_light_node.Name.value + "_geometry", _filename, "data/materials/White.gmd", avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.MAKE_PICKABLE)
+      _light_geometry = geometry_cache.create_geometry_from_file(_light_node.Name.value + "_geometry", _filename, "data/materials/White.gmd", avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.MAKE_PICKABLE, self)
       #_light_geometry.Transform.value = avango.gua.make_scale_mat(0.1)
       _light_geometry.Transform.value = avango.gua.make_scale_mat(3.0)
       _light_geometry.ShadowMode.value = avango.gua.ShadowMode.OFF
@@ -294,6 +335,10 @@ class SceneObject:
       _light_geometry.add_and_init_field(avango.script.SFObject(), "InteractiveObject", _node.InteractiveObject.value) # rework ??
       _light_geometry.InteractiveObject.dont_distribute(True)
 
+      # the light geometry stays pickable when the light object is disabled
+      _node.InteractiveObject.value.permanent_pick_groups = ["man_pick_group"]
+      pick_broad_phase.invalidate()
+
   ## Creates and initializes an interactive object responsible for grouping.
   def init_group(self, NAME, MATRIX, GROUNDFOLLOWING_PICK_FLAG, MANIPULATION_PICK_FLAG, PARENT_NODE, RENDER_GROUP):
  
@@ -316,24 +361,113 @@ class SceneObject:
 
   ## Creates and initializes an interactive object responsible for a point-based level-of-detail scene.
   def init_plod(self, NAME, FILENAME, MATRIX, GROUNDFOLLOWING_PICK_FLAG, MANIPULATION_PICK_FLAG, PARENT_NODE, RENDER_GROUP):
+
+    self.init_asset(NAME, [FILENAME], MATRIX, PARENT_NODE, RENDER_GROUP,
+                    lambda: self.load_plod(NAME, FILENAME, MATRIX, GROUNDFOLLOWING_PICK_FLAG, MANIPULATION_PICK_FLAG, PARENT_NODE, RENDER_GROUP))
+
+  ## Loads a point-based level-of-detail file and initializes its interactive object. Parameters as in init_plod.
+  def load_plod(self, NAME, FILENAME, MATRIX, GROUNDFOLLOWING_PICK_FLAG, MANIPULATION_PICK_FLAG, PARENT_NODE, RENDER_GROUP):
  
-    _loader = avango.gua.nodes.PLODLoader()
-    _loader.UploadBudget.value = 32
-    _loader.RenderBudget.value = 512
-    _loader.OutOfCoreBudget.value = 512
+    with startup_profiler.phase("init_plod " + NAME):
+      _loader = avango.gua.nodes.PLODLoader() # budgets are set by the plod_budget_controller
 
-    _loader_flags = "avango.gua.PLODLoaderFlags.DEFAULTS" # default loader flags
+      _loader_flags = avango.gua.PLODLoaderFlags.DEFAULTS # default loader flags
 
-    _loader_flags += " | avango.gua.PLODLoaderFlags.NORMALIZE_POSITION | avango.gua.PLODLoaderFlags.NORMALIZE_SCALE"
+      _loader_flags |= avango.gua.PLODLoaderFlags.NORMALIZE_POSITION | avango.gua.PLODLoaderFlags.NORMALIZE_SCALE
     
-    if GROUNDFOLLOWING_PICK_FLAG == True or MANIPULATION_PICK_FLAG == True:
-      _loader_flags += " | avango.gua.PLODLoaderFlags.MAKE_PICKABLE"      
+      if GROUNDFOLLOWING_PICK_FLAG == True or MANIPULATION_PICK_FLAG == True:
+        _loader_flags |= avango.gua.PLODLoaderFlags.MAKE_PICKABLE
 
-    _node = _loader.create_geometry_from_file(NAME, FILENAME, eval(_loader_flags))
-    _node.Transform.value = MATRIX
-    _node.ShadowMode.value = avango.gua.ShadowMode.OFF
+      _node = _loader.create_geometry_from_file(NAME, FILENAME, _loader_flags)
+      _node.Transform.value = MATRIX
+      _node.ShadowMode.value = avango.gua.ShadowMode.OFF
+      startup_profiler.count_created(_node)
  
-    self.init_interactive_objects(_node, PARENT_NODE, GROUNDFOLLOWING_PICK_FLAG, MANIPULATION_PICK_FLAG, RENDER_GROUP, False)
+      self.init_interactive_objects(_node, PARENT_NODE, GROUNDFOLLOWING_PICK_FLAG, MANIPULATION_PICK_FLAG, RENDER_GROUP, False)
+
+      plod_budget_controller.add_node(self, _node)
+
+  ## Loads an asset right away or, if the AssetLoader is deferring, requests it to be loaded in a later frame
+  # and shows a placeholder box at its position until it is loaded. The interactive objects of the asset are created
+  # when it is loaded, so they cannot be looked up before.
+  # @param NAME The name of the new node.
+  # @param FILENAMES List of paths of the files belonging to the asset.
+  # @param MATRIX The transformation matrix of the new node.
+  # @param PARENT_NODE Scenegraph node or InteractiveObject to append the asset to.
+  # @param RENDER_GROUP The render group to be associated with the new asset.
+  # @param LOAD_FUNCTION Function loading the asset and initializing its interactive objects.
+  def init_asset(self, NAME, FILENAMES, MATRIX, PARENT_NODE, RENDER_GROUP, LOAD_FUNCTION):
+
+    if asset_loader.is_deferring() == False:
+      LOAD_FUNCTION()
+      return
+
+    _placeholder = geometry_cache.create_geometry_from_file(NAME + "_placeholder"
+                                                           , "data/objects/box_wireframe.obj"
+                                                           , "data/materials/White.gmd"
+                                                           , avango.gua.LoaderFlags.DEFAULTS
+                                                           , self)
+    _placeholder.Transform.value = MATRIX
+    _placeholder.ShadowMode.value = avango.gua.ShadowMode.OFF
+
+    if self.enabled == True:
+      _placeholder.GroupNames.value = [RENDER_GROUP]
+    else:
+      _placeholder.GroupNames.value = ["do_not_display_group"]
+
+    self.get_parent_node(PARENT_NODE).Children.value.append(_placeholder)
+    self.placeholder_nodes.append((_placeholder, RENDER_GROUP))
+
+    asset_loader.request(FILENAMES, lambda: self.insert_asset(_placeholder, PARENT_NODE, LOAD_FUNCTION))
+
+  ## Replaces the placeholder of a deferred asset by the loaded asset.
+  # Called on the main thread by the AssetLoader.
+  # @param PLACEHOLDER The placeholder node to be removed.
+  # @param PARENT_NODE Scenegraph node or InteractiveObject to append the asset to.
+  # @param LOAD_FUNCTION Function loading the asset and initializing its interactive objects.
+  def insert_asset(self, PLACEHOLDER, PARENT_NODE, LOAD_FUNCTION):
+
+    # scene was unloaded in the meantime
+    if self not in self.SCENE_MANAGER.scenes:
+      return
+
+    _parent_node = self.get_parent_node(PARENT_NODE)
+
+    node_distributor.forget_subtree(PLACEHOLDER)
+
+    if PLACEHOLDER in _parent_node.Children.value:
+      _parent_node.Children.value.remove(PLACEHOLDER)
+
+    self.placeholder_nodes = [_entry for _entry in self.placeholder_nodes if _entry[0] != PLACEHOLDER]
+
+    _object_count = len(self.objects)
+
+    LOAD_FUNCTION()
+
+    _new_objects = self.objects[_object_count:]
+
+    if len(_new_objects) == 0:
+      return
+
+    for _object in _new_objects:
+      _object.enable_object(self.enabled)
+
+    # the first new object is the root of the loaded subtree
+    node_distributor.distribute_subtree(_new_objects[0].get_node())
+
+    if PARENT_NODE.get_type() == "Objects::InteractiveObject":
+
+      for _object in PARENT_NODE.hierarchy_ancestors:
+        _object.bb_vis.invalidate_bb()
+
+  ## Returns the scenegraph node of a parent given as scenegraph node or InteractiveObject.
+  # @param PARENT_NODE Scenegraph node or InteractiveObject.
+  def get_parent_node(self, PARENT_NODE):
+
+    if PARENT_NODE.get_type() == "Objects::InteractiveObject":
+      return PARENT_NODE.get_node()
+
+    return PARENT_NODE
 
 
   ## Creates and initializes an interactive object.
@@ -384,20 +518,43 @@ class SceneObject:
   def register_interactive_object(self, INTERACTIVE_OBJECT):
 
     self.objects.append(INTERACTIVE_OBJECT)
+    self.object_index.add(INTERACTIVE_OBJECT)
+    interactive_object_index.add(INTERACTIVE_OBJECT)
+    self.hierarchy.invalidate()
+    pick_broad_phase.invalidate()
+
+  ## Unregisters an interactive object from this scene object.
+  def unregister_interactive_object(self, INTERACTIVE_OBJECT):
+
+    if INTERACTIVE_OBJECT in self.objects:
+      self.objects.remove(INTERACTIVE_OBJECT)
+
+    self.object_index.remove(INTERACTIVE_OBJECT)
+    interactive_object_index.remove(INTERACTIVE_OBJECT)
+    self.hierarchy.invalidate()
+    pick_broad_phase.invalidate()
+
+  ## Updates the indexed path of an interactive object after it was reparented.
+  def update_interactive_object_path(self, INTERACTIVE_OBJECT):
+
+    self.object_index.update_path(INTERACTIVE_OBJECT)
+    interactive_object_index.update_path(INTERACTIVE_OBJECT)
   
   ## Searches for the interactive object with a given name and returns its instance.
   # @param NAME The name to be searched for.
   def get_interactive_object(self, NAME):
   
-    for _object in self.objects:
-
-      if _object.get_node().Name.value == NAME:
-        return _object
+    return self.object_index.get_by_name(NAME)
 
 
   ## Gets the interactive object for a given scenegraph path.
   # @param NAME The path in the scenegraph to be searched for.
   def get_object(self, NAME):
+
+    _object = self.object_index.get_by_path(self.scene_root.Path.value + "/" + NAME)
+
+    if _object != None:
+      return _object
   
     _node = self.SCENEGRAPH[self.scene_root.Path.value + "/" + NAME]
 
@@ -407,21 +564,121 @@ class SceneObject:
 
         return _node.InteractiveObject.value
 
-  ## Enables all objects in the scene.
-  # @param FLAG Boolean indicating if all objects should be reset first.
+  ## Enables or disables all objects in the scene. Objects are reset when the scene is enabled.
+  # Does not touch the objects if the scene already is in the requested state.
+  # @param FLAG Boolean indicating the activation or deactivation process.
   def enable_scene(self, FLAG):
   
     if FLAG == True:
       self.reset()
+
+    if FLAG == self.enabled:
+      return
+
+    self.enabled = FLAG
   
     for _object in self.objects:
       _object.enable_object(FLAG)
+
+    for _placeholder, _render_group in self.placeholder_nodes:
+
+      if FLAG == True:
+        _placeholder.GroupNames.value = [_render_group]
+      else:
+        _placeholder.GroupNames.value = ["do_not_display_group"]
+
+  ## Marks an object as moved, so it is reset the next time the scene is reset.
+  # @param INTERACTIVE_OBJECT The object whose transformation changed.
+  def mark_object_modified(self, INTERACTIVE_OBJECT):
+
+    if INTERACTIVE_OBJECT.modified == False:
+      INTERACTIVE_OBJECT.modified = True
+      self.modified_objects.append(INTERACTIVE_OBJECT)
     
-  ## Resets all objects in the scene.
+  ## Resets all objects in the scene. Only the objects moved since the last reset are touched.
   def reset(self):
+
+    _objects = self.modified_objects
   
+    for _object in _objects:
+      _object.reset(False)
+
+    for _object in _objects:
+      _object.modified = False
+
+    self.modified_objects = []
+
+    # one scenegraph cache update for all objects instead of one per object
+    calc_bounding_boxes([_object.bb_vis for _object in _objects])
+
+  ## Captures the transformations and enable and highlight states of all objects. Returns the new SceneSnapshot.
+  def take_snapshot(self):
+
+    return self.snapshots.capture(self)
+
+  ## Restores a former state of all objects. Returns the number of objects moved back or None if there is no such snapshot.
+  # @param INDEX Number of snapshots taken after the one to be restored, i.e. 0 for the most recent one.
+  def restore_snapshot(self, INDEX = 0):
+
+    _snapshot = self.snapshots.get(INDEX)
+
+    if _snapshot == None:
+      return None
+
+    return _snapshot.restore(self)
+
+  ## Restores the most recent snapshot and discards it, so repeated calls step further back.
+  # Returns the number of objects moved back or None if there is no snapshot left.
+  def undo(self):
+
+    _snapshot = self.snapshots.pop()
+
+    if _snapshot == None:
+      return None
+
+    return _snapshot.restore(self)
+
+  ## Returns the number of scenegraph nodes of this scene, including the existing bounding box visualizations.
+  def count_nodes(self):
+
+    _count = 0
+    _stack = [self.scene_root]
+
+    for _object in self.objects:
+      if _object.bb_vis.box_node != None:
+        _stack.append(_object.bb_vis.box_node)
+
+    while len(_stack) > 0:
+      _node = _stack.pop()
+      _count += 1
+      _stack.extend(_node.Children.value)
+
+    return _count
+
+  ## Removes the scene and all of its objects from the scenegraph and the distribution,
+  # so their nodes can be freed. The scene must not be used afterwards.
+  def unload(self):
+
+    # unregistered in bulk, removing them from self.objects one by one would be quadratic
     for _object in self.objects:
-      _object.reset()
+      interactive_object_index.remove(_object)
+      _object.destroy()
+
+    self.objects = []
+    self.object_index = InteractiveObjectIndex()
+    self.modified_objects = []
+    self.hierarchy.invalidate()
+    pick_broad_phase.invalidate()
+
+    plod_budget_controller.remove_scene(self)
+    geometry_cache.remove_scene(self)
+    node_distributor.forget_subtree(self.scene_root)
+
+    if self.scene_root in self.NET_TRANS_NODE.Children.value:
+      self.NET_TRANS_NODE.Children.value.remove(self.scene_root)
+
+    if self in self.SCENE_MANAGER.scenes:
+      self.SCENE_MANAGER.scenes.remove(self)
 
 
 ## Class to represent an object in a scene, associated to a scenegraph node.
@@ -432,6 +689,10 @@ class InteractiveObject(avango.script.Script):
   # Boolean field indicating if this object is to be highlighted.
   sf_highlight_flag = avango.SFBool()
 
+  ## @var last_transform_version
+  # Static attribute holding the transform_version given to the most recently moved object.
+  last_transform_version = 0
+
   ## Default constructor.
   def __init__(self):
     self.super(InteractiveObject).__init__()
@@ -453,6 +714,31 @@ class InteractiveObject(avango.script.Script):
     ## @var child_objects
     # List of children InteractiveObjects if present.
     self.child_objects = []
+
+    ## @var hierarchy_ancestors
+    # List of the objects from the top of the local hierarchy down to this object, indexed by hierarchy level.
+    self.hierarchy_ancestors = [self]
+
+    ## @var hierarchy_index
+    # Position of this object in the flat arrays of its scene's ObjectHierarchy.
+    self.hierarchy_index = 0
+
+    ## @var enabled
+    # Boolean saying if this object is currently enabled or None before it was enabled the first time.
+    self.enabled = None
+
+    ## @var modified
+    # Boolean saying if the transformation of this object was changed since it was reset the last time.
+    self.modified = False
+
+    ## @var transform_version
+    # Number identifying the current local transformation, 0 for the home transformation. See SceneSnapshot.
+    # Every write of the transformation must go through set_local_transform, reset or SceneSnapshot.restore to keep it valid.
+    self.transform_version = 0
+
+    ## @var permanent_pick_groups
+    # List of pick groups containing nodes below this object independent of its enable state, e.g. light geometries.
+    self.permanent_pick_groups = []
     
 
   ## Custom constructor.
@@ -470,8 +756,6 @@ class InteractiveObject(avango.script.Script):
     # Reference to the SceneObject instance this interactive object is belonging to.
     self.SCENE = SCENE
 
-    self.SCENE.register_interactive_object(self)
-
     # update variables    
     self.parent_object = PARENT_OBJECT
     self.render_group = RENDER_GROUP
@@ -502,6 +786,9 @@ class InteractiveObject(avango.script.Script):
     else: # scene root
       #print "append to scene root"
       self.parent_object.Children.value.append(self.node)
+
+    # register after appending, so the object is indexed with its final path
+    self.SCENE.register_interactive_object(self)
     
     #print "new object", self, self.hierarchy_level, self.node, self.node.Name.value, self.node.Transform.value.get_translate(), self.parent_object
 
@@ -522,6 +809,12 @@ class InteractiveObject(avango.script.Script):
   ## Enables or disables this object.
   # @param FLAG Boolean indicating the activation or deactivation process.
   def enable_object(self, FLAG):
+
+    if FLAG == self.enabled:
+      return
+
+    self.enabled = FLAG
+    pick_broad_phase.invalidate()
   
     if FLAG == True: # enable object
       self.node.GroupNames.value = [self.render_group] # set geometry visible
@@ -540,7 +833,8 @@ class InteractiveObject(avango.script.Script):
     else: # disable object
       self.node.GroupNames.value = ["do_not_display_group"] # set geometry invisible
       
-      self.enable_highlight(False)
+      if self.sf_highlight_flag.value == True:
+        self.enable_highlight(False)
       
       #for _child in self.transform.Children.value:
       #  _child.GroupNames.value = ["invisible_group"] # set geometry invisible
@@ -548,12 +842,16 @@ class InteractiveObject(avango.script.Script):
   ## Enables or disables the highlight for this object.
   # @param FLAG Boolean indicating the activation or deactivation process.
   def enable_highlight(self, FLAG):
-      
-    self.sf_highlight_flag.value = FLAG
-        
-    # highlight/dehighlight subgraph
-    for _child_object in self.child_objects:
-      _child_object.enable_highlight(FLAG)
+
+    # highlight/dehighlight subgraph, which is a slice of the flattened hierarchy
+    _objects = self.SCENE.hierarchy.get_subtree(self)
+
+    if FLAG == True:
+      # one scenegraph cache update for the bounding boxes of the whole subgraph instead of one per object
+      calc_bounding_boxes([_object.bb_vis for _object in _objects], True)
+
+    for _object in _objects:
+      _object.sf_highlight_flag.value = FLAG
 
   ## Appends another object as a child of this object.
   # @param OBJECT The object to be appended as a child.
@@ -563,7 +861,7 @@ class InteractiveObject(avango.script.Script):
 
     self.get_node().Children.value.append(OBJECT.get_node())
 
-    OBJECT.hierarchy_level = self.hierarchy_level + 1
+    OBJECT.update_hierarchy(self.hierarchy_ancestors)
 
   ## Removes another object as a child of this object.
   # @param OBJECT The object to be removed as a child.
@@ -575,8 +873,40 @@ class InteractiveObject(avango.script.Script):
 
       self.node.Children.value.remove(OBJECT.get_node())
 
-      OBJECT.hierarchy_level = 0
+      OBJECT.update_hierarchy([])
+
+
+  ## Updates the hierarchy levels, ancestors and indexed paths of this object and all objects below it after reparenting.
+  # @param PARENT_ANCESTORS The hierarchy_ancestors list of the new parent object or an empty list if there is none.
+  def update_hierarchy(self, PARENT_ANCESTORS):
+
+    self.SCENE.hierarchy.invalidate()
+    pick_broad_phase.invalidate()
+
+    _stack = [(self, PARENT_ANCESTORS)]
+
+    while len(_stack) > 0:
+      _object, _parent_ancestors = _stack.pop()
+      _object.hierarchy_ancestors = _parent_ancestors + [_object]
+      _object.hierarchy_level = len(_parent_ancestors)
+      _object.SCENE.update_interactive_object_path(_object)
+
+      for _child_object in _object.child_objects:
+        _stack.append((_child_object, _object.hierarchy_ancestors))
 
+  ## Returns the scenegraph path of the handled node derived from the object hierarchy or None if it is detached.
+  def get_path(self):
+
+    if self.hierarchy_level > 0: # interactive object
+      _parent_path = self.hierarchy_ancestors[-2].get_path()
+
+      if _parent_path != None:
+        return _parent_path + "/" + self.node.Name.value
+
+    elif self.parent_object != None and self.parent_object.get_type() != "Objects::InteractiveObject": # scene root
+      return self.parent_object.Path.value + "/" + self.node.Name.value
+
+    return None
 
   ## Gets the transformation of the handled scenegraph node.
   def get_local_transform(self):
@@ -593,13 +923,24 @@ class InteractiveObject(avango.script.Script):
 
     self.node.Transform.value = MATRIX
 
+    InteractiveObject.last_transform_version += 1
+    self.transform_version = InteractiveObject.last_transform_version
+
+    self.SCENE.mark_object_modified(self)
+    transform_batch.invalidate(self)
+    pick_broad_phase.mark_moved(self)
+
+    # the bounding boxes of the objects above contain this object
+    for _object in self.hierarchy_ancestors[:-1]:
+      _object.bb_vis.invalidate_bb()
+
   ## Sets the world ransformation of the handled scenegraph node.
   def set_world_transform(self, MATRIX):
 
     if self.parent_object.get_type() == "Objects::InteractiveObject": # interactive object    
-      _parent_world_transform = self.parent_object.get_world_transform()
+      _parent_inverse = transform_batch.get_parent_inverse(self.parent_object, {}) # cached until the parent moves
   
-      _mat = avango.gua.make_inverse_mat(_parent_world_transform) * MATRIX # matrix is transformed into world coordinate system of parent object in scenegraph
+      _mat = _parent_inverse * MATRIX # matrix is transformed into world coordinate system of parent object in scenegraph
   
       self.set_local_transform(_mat)
     
@@ -608,11 +949,24 @@ class InteractiveObject(avango.script.Script):
       self.set_local_transform(MATRIX)
 
   ## Resets the interactive object to the initial matrix.
-  def reset(self):
+  # @param UPDATE_BB Boolean saying if the bounding box is calculated immediately. Batched resets pass False and calculate all bounding boxes at once.
+  def reset(self, UPDATE_BB = True):
       
     self.set_local_transform(self.home_mat)
+    self.transform_version = 0
+    self.bb_vis.invalidate_bb()
 
-    self.bb_vis.calc_bb()
+    if UPDATE_BB == True:
+      calc_bounding_boxes([self.bb_vis])
+
+  ## Releases the bounding box visualization and the references between this object and its node.
+  def destroy(self):
+
+    self.bb_vis.destroy()
+    transform_batch.remove(self)
+    self.node.InteractiveObject.value = None
+    self.parent_object = None
+    self.child_objects = []
 
   ## Returns the material string belonging to this object's hierarchy level.
   def get_hierarchy_material(self):
@@ -635,16 +989,10 @@ class InteractiveObject(avango.script.Script):
   # @param HIERARCHY_LEVEL The hierarchy level to be started from.
   def get_higher_hierarchical_object(self, HIERARCHY_LEVEL):
 
-    if self.hierarchy_level == HIERARCHY_LEVEL:
-      return self
-    
-    else:
-    
-      if self.parent_object.get_type() == "Objects::InteractiveObject": # interactive object
-        return self.parent_object.get_higher_hierarchical_object(HIERARCHY_LEVEL)
+    if HIERARCHY_LEVEL < 0 or HIERARCHY_LEVEL > self.hierarchy_level:
+      return None
 
-      else: # scene root
-        return None
+    return self.hierarchy_ancestors[HIERARCHY_LEVEL]
 
 
 '''
@@ -0,0 +1,177 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes PLODBudget and PLODBudgetAdjuster, shared by the server and the clients.
+
+# import python libraries
+import time
+
+## Upload, render and out-of-core budgets of the PLOD renderer in megabytes.
+class PLODBudget:
+
+  ## Custom constructor.
+  # @param UPLOAD Upload budget in megabytes per frame.
+  # @param RENDER Render budget in megabytes of video memory.
+  # @param OUT_OF_CORE Out-of-core budget in megabytes of main memory.
+  def __init__(self, UPLOAD, RENDER, OUT_OF_CORE):
+
+    ## @var upload
+    # Upload budget in megabytes per frame.
+    self.upload = UPLOAD
+
+    ## @var render
+    # Render budget in megabytes of video memory.
+    self.render = RENDER
+
+    ## @var out_of_core
+    # Out-of-core budget in megabytes of main memory.
+    self.out_of_core = OUT_OF_CORE
+
+  ## Creates a PLODBudget from a string created by get_string.
+  # @param STRING The budget values separated by commas.
+  @staticmethod
+  def from_string(STRING):
+
+    _values = [float(_value) for _value in STRING.split(",")]
+
+    return PLODBudget(_values[0], _values[1], _values[2])
+
+  ## Returns the budget values separated by commas, e.g. to distribute them in a node name.
+  def get_string(self):
+
+    return str(int(self.upload)) + "," + str(int(self.render)) + "," + str(int(self.out_of_core))
+
+  ## Returns a copy of this budget.
+  def copy(self):
+
+    return PLODBudget(self.upload, self.render, self.out_of_core)
+
+  ## Returns a copy of this budget with every value clamped between the values of two other budgets.
+  # @param MIN_BUDGET PLODBudget with the lower limits.
+  # @param MAX_BUDGET PLODBudget with the upper limits.
+  def clamped(self, MIN_BUDGET, MAX_BUDGET):
+
+    return PLODBudget(min(max(self.upload, MIN_BUDGET.upload), MAX_BUDGET.upload)
+                    , min(max(self.render, MIN_BUDGET.render), MAX_BUDGET.render)
+                    , min(max(self.out_of_core, MIN_BUDGET.out_of_core), MAX_BUDGET.out_of_core))
+
+
+## Adjusts a PLODBudget to the frame times measured in the rendering process and its available main memory.
+# Has to run in the process rendering the point clouds, i.e. in the clients driving the displays.
+class PLODBudgetAdjuster:
+
+  ## @var adjust_interval
+  # Number of frames over which frame times are averaged before the budget is adjusted.
+  adjust_interval = 30
+
+  ## @var increase_factor
+  # Factor the upload and render budgets are multiplied with if frames are faster than the target.
+  increase_factor = 1.1
+
+  ## @var decrease_factor
+  # Factor the upload and render budgets are multiplied with if frames are slower than the target.
+  decrease_factor = 0.8
+
+  ## @var memory_reserve
+  # Megabytes of main memory which are to stay available. The out-of-core budget is reduced below this.
+  memory_reserve = 2048
+
+  ## Custom constructor.
+  # @param TARGET_FPS Frame rate the budget is adjusted to.
+  def __init__(self, TARGET_FPS):
+
+    ## @var target_frame_time
+    # Frame time in seconds the budget is adjusted to.
+    self.target_frame_time = 1.0 / TARGET_FPS
+
+    ## @var last_frame_timestamp
+    # Point in time of the last call of measure_frame.
+    self.last_frame_timestamp = None
+
+    ## @var frame_time_sum
+    # Sum of the frame times measured since the budget was adjusted the last time.
+    self.frame_time_sum = 0.0
+
+    ## @var frame_count
+    # Number of frame times measured since the budget was adjusted the last time.
+    self.frame_count = 0
+
+    ## @var increase_count
+    # Number of times the budget was increased.
+    self.increase_count = 0
+
+    ## @var decrease_count
+    # Number of times the budget was decreased.
+    self.decrease_count = 0
+
+  ## Measures the time since the last call. Returns a boolean saying if enough frames were measured to adjust the budget.
+  # To be called once per frame.
+  def measure_frame(self):
+
+    _now = time.time()
+
+    if self.last_frame_timestamp != None:
+      self.frame_time_sum += _now - self.last_frame_timestamp
+      self.frame_count += 1
+
+    self.last_frame_timestamp = _now
+
+    return self.frame_count >= PLODBudgetAdjuster.adjust_interval
+
+  ## Discards the frame times measured so far, e.g. because another budget was applied or frames were not measured.
+  def reset(self):
+
+    self.last_frame_timestamp = None
+    self.frame_time_sum = 0.0
+    self.frame_count = 0
+
+  ## Returns a copy of a budget adjusted to the average of the measured frame times and the available main memory,
+  # clamped between two other budgets, and discards the measured frame times.
+  # @param BUDGET The PLODBudget to be adjusted.
+  # @param MIN_BUDGET PLODBudget with the lower limits.
+  # @param MAX_BUDGET PLODBudget with the upper limits.
+  def adjust(self, BUDGET, MIN_BUDGET, MAX_BUDGET):
+
+    _average_frame_time = self.frame_time_sum / max(self.frame_count, 1)
+    self.frame_time_sum = 0.0
+    self.frame_count = 0
+
+    _budget = BUDGET.copy()
+
+    if _average_frame_time > self.target_frame_time * 1.1:
+      _budget.upload *= PLODBudgetAdjuster.decrease_factor
+      _budget.render *= PLODBudgetAdjuster.decrease_factor
+      self.decrease_count += 1
+
+    elif _average_frame_time < self.target_frame_time * 0.9:
+      _budget.upload *= PLODBudgetAdjuster.increase_factor
+      _budget.render *= PLODBudgetAdjuster.increase_factor
+      self.increase_count += 1
+
+    _available_memory = self.get_available_memory()
+
+    if _available_memory != None:
+
+      if _available_memory < PLODBudgetAdjuster.memory_reserve:
+        _budget.out_of_core *= PLODBudgetAdjuster.decrease_factor
+
+      elif _available_memory > 2 * PLODBudgetAdjuster.memory_reserve:
+        _budget.out_of_core *= PLODBudgetAdjuster.increase_factor
+
+    return _budget.clamped(MIN_BUDGET, MAX_BUDGET)
+
+  ## Returns the available main memory in megabytes or None if it cannot be determined.
+  def get_available_memory(self):
+
+    try:
+      with open("/proc/meminfo") as _file:
+
+        for _line in _file:
+
+          if _line.startswith("MemAvailable:"):
+            return int(_line.split()[1]) / 1024
+
+    except IOError:
+      pass
+
+    return None
@@ -0,0 +1,271 @@
+#!/usr/bin/python
+
+## @file
+# Contains class PLODBudgetController and the global instance plod_budget_controller.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from ConsoleIO import *
+from FrameScheduler import frame_scheduler
+from PLODBudget import PLODBudget
+
+# import python libraries
+import os
+
+## Assigns PLOD budgets to scenes and distributes the budget of the active scene to the clients.
+# The budgets are settings of the PLOD renderer of each process and therefore apply to all point clouds at once.
+# The point clouds are rendered by the clients, so the budgets are adjusted there by a ClientPLODBudgetController
+# to the client's own frame times and main memory, starting from the budget distributed here: every scene starts
+# with budgets proportional to its number of point clouds. The distributed string contains the name of the active
+# scene, the target frame rate, the starting budget and the lower and upper limits, separated by "#".
+# Per node, the error threshold is lowered for point clouds close to a user's head and raised for distant ones,
+# so nearby geometry gets the larger share of the budget; the thresholds are node fields and reach the clients
+# with the distributed nodes.
+class PLODBudgetController:
+
+  ## Custom constructor.
+  # @param TARGET_FPS Frame rate the budgets are adjusted to by the clients.
+  # @param MIN_BUDGET PLODBudget with the lower limits.
+  # @param MAX_BUDGET PLODBudget with the upper limits.
+  # @param NODE_BUDGET PLODBudget given to a scene per point cloud.
+  # @param MIN_ERROR_THRESHOLD Error threshold of point clouds at the head of a user.
+  # @param MAX_ERROR_THRESHOLD Error threshold of point clouds at FAR_DISTANCE or further from all users.
+  # @param FAR_DISTANCE Distance in meters from which on point clouds get the maximum error threshold.
+  def __init__(self, TARGET_FPS, MIN_BUDGET, MAX_BUDGET, NODE_BUDGET, MIN_ERROR_THRESHOLD, MAX_ERROR_THRESHOLD, FAR_DISTANCE):
+
+    ## @var target_fps
+    # Frame rate the budgets are adjusted to by the clients.
+    self.target_fps = TARGET_FPS
+
+    ## @var min_budget
+    # PLODBudget with the lower limits.
+    self.min_budget = MIN_BUDGET
+
+    ## @var max_budget
+    # PLODBudget with the upper limits.
+    self.max_budget = MAX_BUDGET
+
+    ## @var node_budget
+    # PLODBudget given to a scene per point cloud.
+    self.node_budget = NODE_BUDGET
+
+    ## @var min_error_threshold
+    # Error threshold of point clouds at the head of a user.
+    self.min_error_threshold = MIN_ERROR_THRESHOLD
+
+    ## @var max_error_threshold
+    # Error threshold of point clouds at far_distance or further from all users.
+    self.max_error_threshold = MAX_ERROR_THRESHOLD
+
+    ## @var far_distance
+    # Distance in meters from which on point clouds get the maximum error threshold.
+    self.far_distance = FAR_DISTANCE
+
+    ## @var loader
+    # PLODLoader used to apply the budgets to the PLOD renderer of the server. Created with the first point cloud.
+    self.loader = None
+
+    ## @var info_node
+    # Distributed node whose name contains the budget string of the active scene or None if not set.
+    self.info_node = None
+
+    ## @var scene_nodes
+    # Dictionary mapping SceneObjects to the lists of their PLOD nodes.
+    self.scene_nodes = {}
+
+    ## @var scene_budgets
+    # Dictionary mapping SceneObjects to their starting PLODBudgets.
+    self.scene_budgets = {}
+
+    ## @var active_scene
+    # The enabled SceneObject containing PLOD nodes whose budget is applied or None.
+    self.active_scene = None
+
+    ## @var applied_budget
+    # The PLODBudget currently set on the loader or None.
+    self.applied_budget = None
+
+    ## @var head_nodes
+    # List of the head nodes of all users, used to prioritize nearby point clouds.
+    self.head_nodes = []
+
+    ## @var frame_task
+    # FrameTask executing frame_callback. Registered with the first point cloud.
+    self.frame_task = None
+
+  ## Creates a PLODBudgetController configured by the environment variables NVF_PLOD_TARGET_FPS,
+  # NVF_PLOD_UPLOAD_BUDGET, NVF_PLOD_RENDER_BUDGET and NVF_PLOD_OUT_OF_CORE_BUDGET. The budget variables
+  # contain the lower and upper limit in megabytes separated by a comma, e.g. "128,2048".
+  @staticmethod
+  def create_from_environment():
+
+    _upload = [int(_value) for _value in os.environ.get("NVF_PLOD_UPLOAD_BUDGET", "8,64").split(",")]
+    _render = [int(_value) for _value in os.environ.get("NVF_PLOD_RENDER_BUDGET", "128,2048").split(",")]
+    _out_of_core = [int(_value) for _value in os.environ.get("NVF_PLOD_OUT_OF_CORE_BUDGET", "256,8192").split(",")]
+
+    return PLODBudgetController(float(os.environ.get("NVF_PLOD_TARGET_FPS", "60"))
+                              , PLODBudget(_upload[0], _render[0], _out_of_core[0])
+                              , PLODBudget(_upload[1], _render[1], _out_of_core[1])
+                              , PLODBudget(32, 512, 512)
+                              , 1.0
+                              , 4.0
+                              , 50.0)
+
+  ## Sets the node whose name is used to distribute the budget of the active scene to the clients.
+  # @param INFO_NODE A node below the nettrans node.
+  def set_info_node(self, INFO_NODE):
+
+    self.info_node = INFO_NODE
+    self.update_info_node()
+
+  ## Registers a PLOD node of a scene to be controlled.
+  # @param SCENE The SceneObject the node belongs to.
+  # @param NODE The PLOD node.
+  def add_node(self, SCENE, NODE):
+
+    if self.loader == None:
+      self.loader = avango.gua.nodes.PLODLoader()
+      self.frame_task = frame_scheduler.register("PLODBudgetController", self.frame_callback)
+
+    self.scene_nodes.setdefault(SCENE, []).append(NODE)
+
+    if SCENE not in self.scene_budgets:
+      self.scene_budgets[SCENE] = self.node_budget.copy()
+    else:
+      self.scene_budgets[SCENE].upload += self.node_budget.upload
+      self.scene_budgets[SCENE].render += self.node_budget.render
+      self.scene_budgets[SCENE].out_of_core += self.node_budget.out_of_core
+
+    self.scene_budgets[SCENE] = self.scene_budgets[SCENE].clamped(self.min_budget, self.max_budget)
+
+    # point clouds are loaded before their scene is enabled, so apply the budget right away
+    if self.active_scene == None or self.active_scene == SCENE:
+      self.active_scene = SCENE
+      self.apply_budget(self.scene_budgets[SCENE])
+
+  ## Unregisters all PLOD nodes of a scene, e.g. because it was unloaded.
+  # @param SCENE The SceneObject whose nodes are to be removed.
+  def remove_scene(self, SCENE):
+
+    self.scene_nodes.pop(SCENE, None)
+    self.scene_budgets.pop(SCENE, None)
+
+    if self.active_scene == SCENE:
+      self.active_scene = None
+      self.update_info_node()
+
+  ## Registers the head node of a user whose proximity raises the level of detail of point clouds.
+  # @param HEAD_NODE The head node of the user.
+  def add_head_node(self, HEAD_NODE):
+
+    self.head_nodes.append(HEAD_NODE)
+
+  ## Evaluated every frame once a point cloud was registered.
+  def frame_callback(self):
+
+    _active_scene = self.get_active_scene()
+
+    if _active_scene != self.active_scene:
+      self.active_scene = _active_scene
+
+      if _active_scene != None:
+        self.apply_budget(self.scene_budgets[_active_scene])
+      else:
+        self.update_info_node()
+
+    if _active_scene == None:
+      return
+
+    self.update_error_thresholds(self.scene_nodes[_active_scene])
+
+  ## Returns the first enabled scene containing PLOD nodes or None.
+  def get_active_scene(self):
+
+    for _scene in self.scene_nodes:
+
+      if _scene.enabled == True:
+        return _scene
+
+    return None
+
+  ## Sets a budget on the server's loader, touching only the values which changed, and distributes it to the clients.
+  # @param BUDGET The PLODBudget to be applied.
+  def apply_budget(self, BUDGET):
+
+    _upload = int(BUDGET.upload)
+    _render = int(BUDGET.render)
+    _out_of_core = int(BUDGET.out_of_core)
+
+    if self.applied_budget == None or self.applied_budget.upload != _upload:
+      self.loader.UploadBudget.value = _upload
+
+    if self.applied_budget == None or self.applied_budget.render != _render:
+      self.loader.RenderBudget.value = _render
+
+    if self.applied_budget == None or self.applied_budget.out_of_core != _out_of_core:
+      self.loader.OutOfCoreBudget.value = _out_of_core
+
+    self.applied_budget = PLODBudget(_upload, _render, _out_of_core)
+
+    self.update_info_node()
+
+  ## Writes the budget string of the active scene into the name of the info node, or an empty string if there is none.
+  def update_info_node(self):
+
+    if self.info_node == None:
+      return
+
+    if self.active_scene == None:
+      _string = ""
+    else:
+      _string = self.active_scene.name + "#" + str(self.target_fps) + \
+                "#" + self.scene_budgets[self.active_scene].get_string() + \
+                "#" + self.min_budget.get_string() + \
+                "#" + self.max_budget.get_string()
+
+    if self.info_node.Name.value != _string:
+      self.info_node.Name.value = _string
+
+  ## Sets the error threshold of each PLOD node depending on its distance to the nearest user head.
+  # @param NODES List of PLOD nodes to be updated.
+  def update_error_thresholds(self, NODES):
+
+    if len(self.head_nodes) == 0:
+      return
+
+    _head_positions = [_head_node.WorldTransform.value.get_translate() for _head_node in self.head_nodes]
+
+    for _node in NODES:
+
+      if _node.has_field("ErrorThreshold") == False:
+        continue
+
+      _node_position = _node.WorldTransform.value.get_translate()
+      _distance = min([(_node_position - _head_position).length() for _head_position in _head_positions])
+
+      _factor = min(_distance / self.far_distance, 1.0)
+      _error_threshold = round(self.min_error_threshold + _factor * (self.max_error_threshold - self.min_error_threshold), 1)
+
+      if _node.ErrorThreshold.value != _error_threshold:
+        _node.ErrorThreshold.value = _error_threshold
+
+  ## Prints the starting budgets of all scenes with point clouds. The budgets are adjusted by the clients.
+  def print_statistics(self):
+
+    if len(self.scene_budgets) == 0:
+      return
+
+    print_message("PLOD starting budgets, adjusted to the frame times of the clients:")
+
+    for _scene, _budget in self.scene_budgets.items():
+      print_message("  " + _scene.name + ": upload " + str(int(_budget.upload)) + " MB" + \
+                    ", render " + str(int(_budget.render)) + " MB" + \
+                    ", out-of-core " + str(int(_budget.out_of_core)) + " MB")
+
+
+## @var plod_budget_controller
+# Global PLODBudgetController instance controlling the budgets of all point clouds.
+plod_budget_controller = PLODBudgetController.create_from_environment()
@@ -10,6 +10,7 @@ import avango.gua
 # import framework libraries
 from Display import *
 from ConsoleIO import *
+from GeometryCache import geometry_cache
 
 ## Class representing a physical display. A physical display is a projection medium
 # running on a host and having certain resolution, size and transformation. It
@@ -136,9 +137,7 @@ class PhysicalDisplay(Display):
   ## Creates a visualization of the display's screen in the scene (white frame). Returns the scenegraph geometry node.
   def create_screen_visualization(self, NODE_NAME):
   
-    _loader = avango.gua.nodes.TriMeshLoader()
-  
-    _node = _loader.create_geometry_from_file(NODE_NAME, "data/objects/screen.obj", "data/materials/White.gmd", avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.LOAD_MATERIALS)
+    _node = geometry_cache.create_geometry_from_file(NODE_NAME, "data/objects/screen.obj", "data/materials/White.gmd", avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.LOAD_MATERIALS)
     _node.ShadowMode.value = avango.gua.ShadowMode.OFF
 
     _w, _h = self.size
@@ -152,9 +151,7 @@ class PhysicalDisplay(Display):
   # @param DISPLAY_NUM Integer saying which index in the DisplayGroup this Display has, starting from 0.
   def create_transformed_proxy_geometry(self, WORKSPACE_INSTANCE, DISPLAY_GROUP_INSTANCE, DISPLAY_NUM):
   
-    _loader = avango.gua.nodes.TriMeshLoader()
-  
-    _node = _loader.create_geometry_from_file("proxy_w" + str(WORKSPACE_INSTANCE.id) + "_dg" + str(DISPLAY_GROUP_INSTANCE.id) + "_s" + str(DISPLAY_NUM)
+    _node = geometry_cache.create_geometry_from_file("proxy_w" + str(WORKSPACE_INSTANCE.id) + "_dg" + str(DISPLAY_GROUP_INSTANCE.id) + "_s" + str(DISPLAY_NUM)
                                             , "data/objects/plane.obj"
                                             , "data/materials/White.gmd"
                                             , avango.gua.LoaderFlags.DEFAULTS | avango.gua.LoaderFlags.LOAD_MATERIALS | avango.gua.LoaderFlags.MAKE_PICKABLE)
@@ -0,0 +1,297 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes PickBVH and PickBroadPhase and the global instance pick_broad_phase.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from InteractiveObjectIndex import interactive_object_index
+
+## Bounding volume hierarchy over the world bounding boxes of the interactive objects in one pick group.
+# The nodes are stored in flat lists, children after their parents. Inner nodes have two children;
+# leaf nodes reference a single object. Moved objects are refitted by updating their leaf and the
+# boxes of all nodes above it, without rebuilding the hierarchy.
+class PickBVH:
+
+  ## @var padding
+  # Distance in meters the boxes are enlarged by, so rays grazing a box are never rejected by rounding errors.
+  padding = 0.0001
+
+  ## Custom constructor.
+  # @param OBJECTS List of InteractiveObjects whose nodes are in the pick group.
+  def __init__(self, OBJECTS):
+
+    ## @var mins
+    # List of the minimum corners of the node boxes as lists of three floats.
+    self.mins = []
+
+    ## @var maxs
+    # List of the maximum corners of the node boxes as lists of three floats.
+    self.maxs = []
+
+    ## @var children
+    # List of the child node index pairs, None for leaf nodes.
+    self.children = []
+
+    ## @var parents
+    # List of the parent node indices, -1 for the root node.
+    self.parents = []
+
+    ## @var leaf_nodes
+    # Dictionary mapping objects to the indices of their leaf nodes.
+    self.leaf_nodes = {}
+
+    _leaves = [(_object,) + self.get_object_box(_object) for _object in OBJECTS]
+
+    if len(_leaves) > 0:
+      self.build(_leaves, -1)
+
+  ## Returns a tuple of the minimum and maximum corner of the world bounding box of an object's node.
+  # The scenegraph cache must be up to date.
+  # @param OBJECT The InteractiveObject whose box is requested.
+  def get_object_box(self, OBJECT):
+
+    _bb = OBJECT.get_node().BoundingBox.value
+    _min = _bb.Min.value
+    _max = _bb.Max.value
+
+    return ([_min.x - PickBVH.padding, _min.y - PickBVH.padding, _min.z - PickBVH.padding]
+          , [_max.x + PickBVH.padding, _max.y + PickBVH.padding, _max.z + PickBVH.padding])
+
+  ## Appends the nodes for a list of leaves, split at the median of the longest axis. Returns the index of the created node.
+  # @param LEAVES List of tuples of object, minimum and maximum corner.
+  # @param PARENT_INDEX Index of the parent node or -1 for the root node.
+  def build(self, LEAVES, PARENT_INDEX):
+
+    _index = len(self.mins)
+
+    self.mins.append([min([_leaf[1][_axis] for _leaf in LEAVES]) for _axis in range(3)])
+    self.maxs.append([max([_leaf[2][_axis] for _leaf in LEAVES]) for _axis in range(3)])
+    self.children.append(None)
+    self.parents.append(PARENT_INDEX)
+
+    if len(LEAVES) == 1:
+      self.leaf_nodes[LEAVES[0][0]] = _index
+      return _index
+
+    _extents = [self.maxs[_index][_axis] - self.mins[_index][_axis] for _axis in range(3)]
+    _axis = _extents.index(max(_extents))
+
+    _leaves = sorted(LEAVES, key = lambda _leaf: _leaf[1][_axis] + _leaf[2][_axis])
+    _half = len(_leaves) // 2
+
+    _left_index = self.build(_leaves[:_half], _index)
+    _right_index = self.build(_leaves[_half:], _index)
+    self.children[_index] = (_left_index, _right_index)
+
+    return _index
+
+  ## Updates the boxes of moved objects and of all nodes above them. The scenegraph cache must be up to date.
+  # Objects which are not part of this hierarchy are ignored.
+  # @param OBJECTS List of moved InteractiveObjects.
+  def refit(self, OBJECTS):
+
+    _dirty_indices = set()
+
+    for _object in OBJECTS:
+
+      _index = self.leaf_nodes.get(_object)
+
+      if _index == None:
+        continue
+
+      self.mins[_index], self.maxs[_index] = self.get_object_box(_object)
+      _dirty_indices.add(self.parents[_index])
+
+    # parents have lower indices than their children, so processing in descending order visits children first
+    while len(_dirty_indices) > 0:
+
+      _index = max(_dirty_indices)
+      _dirty_indices.remove(_index)
+
+      if _index < 0:
+        continue
+
+      _left_index, _right_index = self.children[_index]
+      self.mins[_index] = [min(self.mins[_left_index][_axis], self.mins[_right_index][_axis]) for _axis in range(3)]
+      self.maxs[_index] = [max(self.maxs[_left_index][_axis], self.maxs[_right_index][_axis]) for _axis in range(3)]
+
+      _dirty_indices.add(self.parents[_index])
+
+  ## Returns a boolean saying if a ray segment intersects the box of any object.
+  # @param ORIGIN List of the three coordinates of the start of the segment.
+  # @param DIRECTION List of the three components of the vector from the start to the end of the segment.
+  def intersects(self, ORIGIN, DIRECTION):
+
+    if len(self.mins) == 0:
+      return False
+
+    _stack = [0]
+
+    while len(_stack) > 0:
+      _index = _stack.pop()
+
+      if self.intersects_box(ORIGIN, DIRECTION, self.mins[_index], self.maxs[_index]) == False:
+        continue
+
+      if self.children[_index] == None:
+        return True
+
+      _stack.extend(self.children[_index])
+
+    return False
+
+  ## Returns a boolean saying if a ray segment intersects an axis-aligned box, using the slab method.
+  # @param ORIGIN List of the three coordinates of the start of the segment.
+  # @param DIRECTION List of the three components of the vector from the start to the end of the segment.
+  # @param MIN List of the three coordinates of the minimum corner of the box.
+  # @param MAX List of the three coordinates of the maximum corner of the box.
+  def intersects_box(self, ORIGIN, DIRECTION, MIN, MAX):
+
+    _t_enter = 0.0
+    _t_exit = 1.0
+
+    for _axis in range(3):
+
+      if abs(DIRECTION[_axis]) < 1e-12:
+
+        if ORIGIN[_axis] < MIN[_axis] or ORIGIN[_axis] > MAX[_axis]:
+          return False
+
+      else:
+        _t1 = (MIN[_axis] - ORIGIN[_axis]) / DIRECTION[_axis]
+        _t2 = (MAX[_axis] - ORIGIN[_axis]) / DIRECTION[_axis]
+
+        _t_enter = max(_t_enter, min(_t1, _t2))
+        _t_exit = min(_t_exit, max(_t1, _t2))
+
+        if _t_enter > _t_exit:
+          return False
+
+    return True
+
+
+## Broad phase for ray tests against the pick groups of the interactive objects.
+# For each supported pick mask and scenegraph, a PickBVH over the world bounding boxes of the objects whose
+# nodes are in that group is kept. It is built lazily with a single scenegraph cache update after objects
+# were added, removed, reparented, enabled or disabled, and refitted after objects moved. Rays missing all
+# boxes do not need a scenegraph ray test at all.
+class PickBroadPhase:
+
+  ## @var supported_masks
+  # Pick masks handled by the broad phase. Other masks may contain nodes which are not interactive objects.
+  supported_masks = ["gf_pick_group", "man_pick_group"]
+
+  ## Default constructor.
+  def __init__(self):
+
+    ## @var bvhs
+    # Dictionary mapping tuples of scenegraph id and pick mask to PickBVHs.
+    self.bvhs = {}
+
+    ## @var moved_objects
+    # Set of objects moved since the hierarchies were refitted the last time.
+    self.moved_objects = set()
+
+    ## @var build_count
+    # Number of times the hierarchies were built.
+    self.build_count = 0
+
+    ## @var refit_count
+    # Number of times the hierarchies were refitted.
+    self.refit_count = 0
+
+  ## Discards all hierarchies, e.g. because objects were added, removed, reparented, enabled or disabled.
+  def invalidate(self):
+
+    self.bvhs = {}
+    self.moved_objects = set()
+
+  ## Marks an object as moved, so it and the objects above and below it are refitted before the next query.
+  # @param OBJECT The InteractiveObject which was moved.
+  def mark_moved(self, OBJECT):
+
+    if len(self.bvhs) > 0:
+      self.moved_objects.add(OBJECT)
+
+  ## Returns a boolean saying if a ray test can be skipped because the ray certainly hits nothing in the pick group.
+  # @param SCENEGRAPH The scenegraph the ray test is performed in.
+  # @param MATRIX Starting matrix of the ray.
+  # @param LENGTH Length of the ray in meters.
+  # @param MASK Picking mask of the ray test.
+  def can_skip(self, SCENEGRAPH, MATRIX, LENGTH, MASK):
+
+    if MASK not in PickBroadPhase.supported_masks:
+      return False
+
+    self.update(SCENEGRAPH)
+
+    _key = (id(SCENEGRAPH), MASK)
+
+    if _key not in self.bvhs:
+      self.bvhs[_key] = self.build(SCENEGRAPH, MASK)
+
+    _origin = MATRIX.get_translate()
+    _end = MATRIX * avango.gua.Vec3(0.0, 0.0, -LENGTH)
+
+    return self.bvhs[_key].intersects([_origin.x, _origin.y, _origin.z]
+                                    , [_end.x - _origin.x, _end.y - _origin.y, _end.z - _origin.z]) == False
+
+  ## Refits the existing hierarchies of a scenegraph to the objects moved since the last query.
+  # @param SCENEGRAPH The scenegraph to be queried.
+  def update(self, SCENEGRAPH):
+
+    if len(self.moved_objects) == 0:
+      return
+
+    # a moved object changes its own box, the boxes of the objects below and of the objects containing it
+    _objects = set()
+
+    for _object in self.moved_objects:
+      _objects.update(_object.SCENE.hierarchy.get_subtree(_object))
+      _objects.update(_object.hierarchy_ancestors)
+
+    self.moved_objects = set()
+
+    SCENEGRAPH.update_cache()
+
+    for _key in self.bvhs:
+      self.bvhs[_key].refit(_objects)
+
+    self.refit_count += 1
+
+  ## Builds the hierarchy of the objects of a scenegraph whose nodes are in a pick group.
+  # @param SCENEGRAPH The scenegraph the objects are located in.
+  # @param MASK The pick group.
+  def build(self, SCENEGRAPH, MASK):
+
+    _objects = []
+
+    for _object in interactive_object_index.by_node.values():
+
+      if id(_object.SCENE.get_scenegraph()) != id(SCENEGRAPH):
+        continue
+
+      if MASK in _object.permanent_pick_groups or \
+         (_object.enabled == True and MASK == "gf_pick_group" and _object.gf_pick_flag == True) or \
+         (_object.enabled == True and MASK == "man_pick_group" and _object.man_pick_flag == True):
+        _objects.append(_object)
+
+    SCENEGRAPH.update_cache()
+    self.build_count += 1
+
+    return PickBVH(_objects)
+
+  ## Returns a dictionary with the numbers of builds and refits.
+  def get_statistics(self):
+
+    return {"builds" : self.build_count
+          , "refits" : self.refit_count}
+
+
+## @var pick_broad_phase
+# Global PickBroadPhase instance used by the PickService.
+pick_broad_phase = PickBroadPhase()
@@ -0,0 +1,168 @@
+#!/usr/bin/python
+
+## @file
+# Contains class PickService and its global instance pick_service.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from ConsoleIO import *
+from FrameScheduler import frame_scheduler
+from PickBroadPhase import pick_broad_phase
+
+## Central service performing the ray tests of all components.
+# Requests with the same scenegraph, picking options and mask whose rays agree within position_tolerance and
+# direction_tolerance are answered by a single ray test per frame, e.g. when several navigations of the same
+# platform follow the same ground or several representations of a pointer share its pose. The results are keyed
+# on the frame count of the FrameScheduler, so they are valid for scheduler tasks and for scripts evaluated after
+# the scheduler, i.e. scripts connecting a field from frame_scheduler.sf_frame_count, regardless of the order
+# avango evaluates them in. Rays of the pick groups of the interactive objects which
+# miss all objects in the PickBroadPhase are answered with an empty result without a ray test. The number of
+# requests, skipped and performed ray tests are counted per component, so the cost of picking can be attributed.
+class PickService:
+
+  ## @var position_tolerance
+  # Distance in meters up to which ray origins and lengths are considered identical.
+  position_tolerance = 0.001
+
+  ## @var direction_tolerance
+  # Difference of the ray direction components up to which rays are considered parallel.
+  direction_tolerance = 0.001
+
+  ## Default constructor.
+  def __init__(self):
+
+    ## @var ray
+    # RayNode used for all ray tests.
+    self.ray = None
+
+    ## @var results
+    # Dictionary mapping request keys to the pick results of the current frame.
+    self.results = {}
+
+    ## @var results_frame
+    # Frame count of the FrameScheduler the results were computed in.
+    self.results_frame = -1
+
+    ## @var first_frame
+    # Frame count of the FrameScheduler at the first request or None if there was no request yet.
+    self.first_frame = None
+
+    ## @var frame_count
+    # Number of frames since the first request.
+    self.frame_count = 0
+
+    ## @var request_counts
+    # Dictionary mapping component names to their numbers of requests.
+    self.request_counts = {}
+
+    ## @var test_counts
+    # Dictionary mapping component names to the numbers of ray tests performed for them.
+    self.test_counts = {}
+
+    ## @var skip_counts
+    # Dictionary mapping component names to the numbers of ray tests skipped by the broad phase for them.
+    self.skip_counts = {}
+
+    ## @var empty_result
+    # Empty pick result returned for skipped ray tests. Created with the first request.
+    self.empty_result = None
+
+  ## Returns the pick results of a ray, performing the ray test only if no identical request was answered in this frame.
+  # @param SCENEGRAPH The scenegraph where to look for intersections of the ray.
+  # @param MATRIX Starting matrix of the ray.
+  # @param LENGTH Length of the ray in meters.
+  # @param OPTIONS Combination of avango.gua.PickingOptions.
+  # @param MASK Picking mask of the intersection process.
+  # @param COMPONENT Name of the requesting component used in the statistics.
+  def ray_test(self, SCENEGRAPH, MATRIX, LENGTH, OPTIONS, MASK, COMPONENT):
+
+    if self.first_frame == None:
+      self.ray = avango.gua.nodes.RayNode()
+      self.empty_result = avango.gua.MFPickResult()
+      self.first_frame = frame_scheduler.frame_count
+
+    # the results of previous frames are discarded on the first request of a new frame
+    if self.results_frame != frame_scheduler.frame_count:
+      self.results = {}
+      self.results_frame = frame_scheduler.frame_count
+      self.frame_count = frame_scheduler.frame_count - self.first_frame + 1
+
+    self.request_counts[COMPONENT] = self.request_counts.get(COMPONENT, 0) + 1
+
+    _key = (id(SCENEGRAPH), int(OPTIONS), MASK) + self.get_ray_key(MATRIX, LENGTH)
+
+    if _key in self.results:
+      return self.results[_key]
+
+    if pick_broad_phase.can_skip(SCENEGRAPH, MATRIX, LENGTH, MASK) == True:
+      self.results[_key] = self.empty_result
+      self.skip_counts[COMPONENT] = self.skip_counts.get(COMPONENT, 0) + 1
+      return self.empty_result
+
+    self.ray.Transform.value = MATRIX * avango.gua.make_scale_mat(1.0, 1.0, LENGTH)
+
+    _result = SCENEGRAPH.ray_test(self.ray, OPTIONS, MASK)
+
+    self.results[_key] = _result
+    self.test_counts[COMPONENT] = self.test_counts.get(COMPONENT, 0) + 1
+
+    return _result
+
+  ## Returns a tuple of the quantized origin, direction and length of a ray.
+  # @param MATRIX Starting matrix of the ray.
+  # @param LENGTH Length of the ray in meters.
+  def get_ray_key(self, MATRIX, LENGTH):
+
+    _position_step = PickService.position_tolerance
+    _direction_step = PickService.direction_tolerance
+
+    return (int(round(MATRIX.get_element(0, 3) / _position_step))
+          , int(round(MATRIX.get_element(1, 3) / _position_step))
+          , int(round(MATRIX.get_element(2, 3) / _position_step))
+          , int(round(MATRIX.get_element(0, 2) / _direction_step))
+          , int(round(MATRIX.get_element(1, 2) / _direction_step))
+          , int(round(MATRIX.get_element(2, 2) / _direction_step))
+          , int(round(LENGTH / _position_step)))
+
+  ## Returns a dictionary mapping component names to their numbers of requests, skipped and performed ray tests per frame.
+  def get_statistics(self):
+
+    _frame_count = max(self.frame_count, 1)
+    _statistics = {}
+
+    for _component in self.request_counts:
+      _statistics[_component] = {"requests" : self.request_counts[_component] / float(_frame_count)
+                               , "skipped" : self.skip_counts.get(_component, 0) / float(_frame_count)
+                               , "tests" : self.test_counts.get(_component, 0) / float(_frame_count)}
+
+    return _statistics
+
+  ## Prints the requests, skipped and performed ray tests per frame of all components and the broad phase statistics.
+  def print_statistics(self):
+
+    if self.frame_count == 0:
+      return
+
+    print_headline("Pick service (" + str(self.frame_count) + " frames)")
+
+    print("{0:>14} {1:>14} {2:>14}  {3}".format("requests/frame", "skipped/frame", "tests/frame", "component"))
+
+    _statistics = self.get_statistics()
+
+    for _component in sorted(_statistics):
+      _entry = _statistics[_component]
+      print("{0:>14.2f} {1:>14.2f} {2:>14.2f}  {3}".format(_entry["requests"], _entry["skipped"], _entry["tests"], _component))
+
+    _broad_phase_statistics = pick_broad_phase.get_statistics()
+    print_message("Broad phase: " + str(_broad_phase_statistics["builds"]) + " builds" + \
+                  ", " + str(_broad_phase_statistics["refits"]) + " refits")
+
+    print("")
+
+
+## @var pick_service
+# Global PickService instance used by all components performing ray tests.
+pick_service = PickService()
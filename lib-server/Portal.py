@@ -14,6 +14,7 @@ from ApplicationManager import *
 from Display import *
 from ConsoleIO import *
 from scene_config import scenegraphs
+from NodeDistributor import node_distributor
 import Utilities
 
 # import python libraries
@@ -190,28 +191,24 @@ class Portal(Display):
     # Grouping node for this portal below the group node for all portals.
     self.portal_node = avango.gua.nodes.TransformNode(Name = "portal_" + str(self.id) + "_" + self.portal_node_name_attachment)
     Portal.portal_group_node.Children.value.append(self.portal_node)
-    self.NET_TRANS_NODE.distribute_object(self.portal_node)
 
     ## @var settings_node
     # Node whose group names store information about the portal settings, such as viewing mode, etc.
     self.settings_node = avango.gua.nodes.TransformNode(Name = "settings")
     self.settings_node.GroupNames.value = ["0-" + self.viewing_mode, "1-" + self.camera_mode, "2-" + self.negative_parallax, "3-" + self.border_material, "4-" + self.visible]
     self.portal_node.Children.value.append(self.settings_node)
-    self.NET_TRANS_NODE.distribute_object(self.settings_node)
 
     ## @var portal_matrix_node
     # Scenegraph node representing the location where the portal display is located (entry).
     self.portal_matrix_node = avango.gua.nodes.TransformNode(Name = "portal_matrix")
     self.portal_matrix_node.Transform.value = self.portal_matrix
     self.portal_node.Children.value.append(self.portal_matrix_node)
-    self.NET_TRANS_NODE.distribute_object(self.portal_matrix_node)
 
     ## @var scene_matrix_node
     # Scenegraph node representing the location where the portal looks from (exit).
     self.scene_matrix_node = avango.gua.nodes.TransformNode(Name = "scene_matrix")
     self.scene_matrix_node.Transform.value = avango.gua.make_identity_mat()
     self.portal_node.Children.value.append(self.scene_matrix_node)
-    self.NET_TRANS_NODE.distribute_object(self.scene_matrix_node)
 
     ## @var portal_screen_node
     # Screen node representing the portal's screen in the scene.
@@ -219,7 +216,9 @@ class Portal(Display):
     self.portal_screen_node.Width.value = self.size[0]
     self.portal_screen_node.Height.value = self.size[1]
     self.scene_matrix_node.Children.value.append(self.portal_screen_node)
-    self.NET_TRANS_NODE.distribute_object(self.portal_screen_node)
+
+    # distribute the new portal subtree
+    node_distributor.distribute_subtree(self.portal_node)
 
   ## Deletes all nodes below a given node.
   # @param NODE The node to start deleting from.
@@ -232,6 +231,7 @@ class Portal(Display):
   ## Removes this portal from the portal group and destroys all the scenegraph nodes.
   def deactivate(self):
 
+    node_distributor.forget_subtree(self.portal_node)
     Portal.portal_group_node.Children.value.remove(self.portal_node)
 
     for _user_repr in ApplicationManager.all_user_representations:
@@ -15,6 +15,9 @@ from Portal import *
 from PortalCameraNavigation import *
 from TrackingReader import *
 from Tool import *
+from ButtonEvents import button_event_dispatcher
+from FrameScheduler import frame_scheduler
+from GroupNameRegistry import group_name_registry
 import Utilities
 
 # import python libraries
@@ -73,6 +76,11 @@ class PortalCameraRepresentation(ToolRepresentation):
   sf_portal_matrix = avango.gua.SFMatrix4()
   sf_portal_matrix.value = avango.gua.make_identity_mat()
 
+  ## @var sf_frame_count
+  # Frame count of the FrameScheduler. Connected, so this script is evaluated every frame after the scheduler
+  # transformed the tool node.
+  sf_frame_count = avango.SFInt()
+
   ## Default constructor.
   def __init__(self):
     self.super(PortalCameraRepresentation).__init__()
@@ -89,6 +97,8 @@ class PortalCameraRepresentation(ToolRepresentation):
                         , USER_REPRESENTATION
                         , "portal_cam_" + str(PORTAL_CAMERA_INSTANCE.id))
 
+    self.sf_frame_count.connect_from(frame_scheduler.sf_frame_count)
+
     ## @var portal
     # Portal display instance belonging to this representation.
     self.portal = Portal(PORTAL_MATRIX = avango.gua.make_identity_mat()
@@ -140,9 +150,6 @@ class PortalCameraRepresentation(ToolRepresentation):
   ## Evaluated every frame.
   def evaluate(self):
 
-    # base class evaluate
-    self.perform_tool_node_transformation()
-
     # wait for portal matrix node, then connect it if not already done
     if self.portal_matrix_connected == False:
 
@@ -152,7 +159,7 @@ class PortalCameraRepresentation(ToolRepresentation):
         return
 
       self.portal.connect_portal_matrix(self.sf_portal_matrix)
-      self.portal.portal_matrix_node.GroupNames.value.append(self.USER_REPRESENTATION.view_transform_node.Name.value)
+      self.portal.portal_matrix_node.GroupNames.value.append(self.USER_REPRESENTATION.get_view_group_name())
       self.portal_matrix_connected = True
       self.portal.set_visibility(False)
   
@@ -234,7 +241,7 @@ class PortalCameraRepresentation(ToolRepresentation):
   def append_to_visualization_group_names(self, STRING):
     
     # do not add portal head group nodes for visibility of this portal
-    if not STRING.startswith("portal"):
+    if not group_name_registry.get_name(STRING).startswith("portal"):
       self.portal.portal_matrix_node.GroupNames.value.append(STRING)
 
 
@@ -247,7 +254,15 @@ class PortalCameraRepresentation(ToolRepresentation):
   ## Resets the GroupNames field of this PortalCameraRepresentation's visualization to the user representation's view_transform_node.
   def reset_visualization_group_names(self):
 
-    self.portal.portal_matrix_node.GroupNames.value = [self.USER_REPRESENTATION.view_transform_node.Name.value]
+    self.portal.portal_matrix_node.GroupNames.value = [self.USER_REPRESENTATION.get_view_group_name()]
+
+  ## Sets the GroupNames field of this PortalCameraRepresentation's visualization to the reset state followed by a list of strings.
+  # @param LIST_OF_STRINGS The strings to be appended to the reset state.
+  def set_visualization_group_names(self, LIST_OF_STRINGS):
+
+    # do not add portal head group nodes for visibility of this portal
+    apply_group_names([self.portal.portal_matrix_node]
+                    , [self.USER_REPRESENTATION.get_view_group_name()] + [_string for _string in LIST_OF_STRINGS if not group_name_registry.get_name(_string).startswith("portal")])
 
   ## Enables the highlight for this PortalCameraRepresentation.
   def enable_highlight(self):
@@ -419,6 +434,10 @@ class PortalCamera(Tool):
     self.sf_negative_parallax_on_button.connect_from(self.device_sensor.Button12)
     self.sf_negative_parallax_off_button.connect_from(self.device_sensor.Button13)
 
+    # size changes are applied on hold events instead of polling the buttons
+    button_event_dispatcher.subscribe(self.sf_size_up_button, ON_HOLD = self.size_up_button_held)
+    button_event_dispatcher.subscribe(self.sf_size_down_button, ON_HOLD = self.size_down_button_held)
+
     # set evaluation policy
     self.always_evaluate(True)
 
@@ -498,34 +517,37 @@ class PortalCamera(Tool):
       for _tool_repr in self.tool_representations:
         _tool_repr.portal_nav.set_navigation_values(_shot_platform_matrix, _active_navigation.sf_scale.value)
 
-    
+  ## Enlarges the portals while the size up button is held.
+  # @param EVENT The ButtonEvent of the held button.
+  def size_up_button_held(self, EVENT):
 
-    # apply size changes
-    if self.sf_size_up_button.value == True:
-      self.portal_width += 0.005
-      self.portal_height += 0.005
+    self.portal_width += 0.005
+    self.portal_height += 0.005
 
-      if self.portal_width > 1.0:
-        self.portal_width = 1.0
+    if self.portal_width > 1.0:
+      self.portal_width = 1.0
 
-      if self.portal_height > 1.0:
-        self.portal_height = 1.0
+    if self.portal_height > 1.0:
+      self.portal_height = 1.0
 
-      for _tool_repr in self.tool_representations:
-        _tool_repr.update_size()
+    for _tool_repr in self.tool_representations:
+      _tool_repr.update_size()
 
-    if self.sf_size_down_button.value == True:
-      self.portal_width -= 0.005
-      self.portal_height -= 0.005
-      
-      if self.portal_width < 0.15:
-        self.portal_width = 0.15
+  ## Shrinks the portals while the size down button is held.
+  # @param EVENT The ButtonEvent of the held button.
+  def size_down_button_held(self, EVENT):
 
-      if self.portal_height < 0.15:
-        self.portal_height = 0.15
+    self.portal_width -= 0.005
+    self.portal_height -= 0.005
+    
+    if self.portal_width < 0.15:
+      self.portal_width = 0.15
 
-      for _tool_repr in self.tool_representations:
-        _tool_repr.update_size()
+    if self.portal_height < 0.15:
+      self.portal_height = 0.15
+
+    for _tool_repr in self.tool_representations:
+      _tool_repr.update_size()
 
   ## Sets the scale of the currently active shot or returns when no shot is active.
   # @param SCALE The new scale to be set.
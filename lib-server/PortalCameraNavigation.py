@@ -6,11 +6,13 @@
 # import avango-guacamole libraries
 import avango
 import avango.gua
+import avango.script
 from avango.script import field_has_changed
 
 # import framework libraries
 from Navigation import *
 from PortalCamera import *
+from ButtonEvents import button_event_dispatcher
 
 ## Special type of Navigation associated to a PortalCamera.
 # Allows moving and rotating by moving the device when a button is pressed and
@@ -50,12 +52,23 @@ class PortalCameraNavigation(Navigation):
     self.sf_scale_up_button.connect_from(self.portal_cam.sf_scale_up_button)
     self.sf_scale_down_button.connect_from(self.portal_cam.sf_scale_down_button)
 
-    # set evaluation policy
-    self.always_evaluate(True)
+    # scalings are applied on hold events instead of polling the buttons
+    button_event_dispatcher.subscribe(self.sf_scale_up_button, ON_HOLD = self.scale_up_button_held)
+    button_event_dispatcher.subscribe(self.sf_scale_down_button, ON_HOLD = self.scale_down_button_held)
 
-  ## Evaluated every frame.
+    ## @var frame_trigger
+    # Triggers framewise evaluation of frame_callback method while dragging.
+    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = False)
+
+  ## Evaluated whenever an input field changes.
   def evaluate(self):
 
+    # update nav mat
+    self.sf_nav_mat.value = self.sf_abs_mat.value * avango.gua.make_scale_mat(self.sf_scale.value)
+
+  ## Evaluated every frame while dragging.
+  def frame_callback(self):
+
     # update matrices in dragging    
     if self.drag_last_frame_camera_mat != None:
   
@@ -67,15 +80,19 @@ class PortalCameraNavigation(Navigation):
       self.sf_abs_mat.value = _new_scene_mat
       self.drag_last_frame_camera_mat = _current_camera_mat
 
-    # update scaling
-    if self.sf_scale_up_button.value == True and self.portal_cam.current_shot != None:
+  ## Scales the current shot down while the scale up button is held.
+  # @param EVENT The ButtonEvent of the held button.
+  def scale_up_button_held(self, EVENT):
+
+    if self.portal_cam.current_shot != None:
       self.portal_cam.set_current_shot_scale(self.portal_cam.current_shot.sf_scale.value * 0.995)
 
-    if self.sf_scale_down_button.value == True and self.portal_cam.current_shot != None:
-      self.portal_cam.set_current_shot_scale(self.portal_cam.current_shot.sf_scale.value * 1.005)
+  ## Scales the current shot up while the scale down button is held.
+  # @param EVENT The ButtonEvent of the held button.
+  def scale_down_button_held(self, EVENT):
 
-    # update nav mat
-    self.sf_nav_mat.value = self.sf_abs_mat.value * avango.gua.make_scale_mat(self.sf_scale.value)
+    if self.portal_cam.current_shot != None:
+      self.portal_cam.set_current_shot_scale(self.portal_cam.current_shot.sf_scale.value * 1.005)
 
 
   ## Sets sf_abs_mat and sf_scale.
@@ -95,9 +112,11 @@ class PortalCameraNavigation(Navigation):
 
       self.drag_last_frame_camera_mat = self.portal_cam.tracking_reader.sf_abs_mat.value * \
                                         avango.gua.make_trans_mat(0.0, self.portal_cam.portal_height/2, 0.0)
+      self.frame_trigger.Active.value = True
 
 
     # stop dragging
     else:
 
-      self.drag_last_frame_camera_mat = None
\ No newline at end of file
+      self.drag_last_frame_camera_mat = None
+      self.frame_trigger.Active.value = False
\ No newline at end of file
@@ -16,6 +16,11 @@ import Utilities
 from TrackingReader import TrackingTargetReader
 from scene_config import *
 from SceneManager import *
+from InteractiveObjectIndex import interactive_object_index
+from GeometryCache import geometry_cache
+from TransformBatch import transform_batch
+from PickService import pick_service
+from FrameScheduler import frame_scheduler
 
 
 ## Geometric representation of a RayPointer in a DisplayGroup.
@@ -41,36 +46,37 @@ class RayPointerRepresentation(ToolRepresentation):
                         , USER_REPRESENTATION
                         , "pick_ray_" + str(RAY_POINTER_INSTANCE.id))
 
-    _loader = avango.gua.nodes.TriMeshLoader()
-
     ## @var ray_geometry
     # Geometry node representing the ray graphically.
-    self.ray_geometry = _loader.create_geometry_from_file( "ray_geometry"
+    self.ray_geometry = geometry_cache.create_geometry_from_file( "ray_geometry"
                                                          , "data/objects/cylinder.obj"
                                                          , "data/materials/White.gmd"
                                                          , avango.gua.LoaderFlags.DEFAULTS)
-    self.ray_geometry.GroupNames.value.append(self.USER_REPRESENTATION.view_transform_node.Name.value)
+    self.ray_geometry.GroupNames.value.append(self.USER_REPRESENTATION.get_view_group_name())
     self.set_ray_distance(self.TOOL_INSTANCE.ray_length)
     self.tool_transform_node.Children.value.append(self.ray_geometry)
 
+    # the ray material follows the highlight and the navigation of the user representation, which are no fields
+    self.always_evaluate(True)
+
     ## @var intersection_point_geometry
     # Geometry node representing the intersection point of the ray if any.
-    self.intersection_point_geometry = _loader.create_geometry_from_file("intersection_point_geometry"
+    self.intersection_point_geometry = geometry_cache.create_geometry_from_file("intersection_point_geometry"
                                                                        , "data/objects/sphere.obj"
                                                                        , "data/materials/White.gmd"
                                                                        , avango.gua.LoaderFlags.DEFAULTS)
     self.intersection_point_geometry.GroupNames.value.append("do_not_display_group")
-    self.intersection_point_geometry.GroupNames.value.append(self.USER_REPRESENTATION.view_transform_node.Name.value)
+    self.intersection_point_geometry.GroupNames.value.append(self.USER_REPRESENTATION.get_view_group_name())
     self.tool_transform_node.Children.value.append(self.intersection_point_geometry)
 
     ## @var ray_start_geometry
     # Geometry node representing the origin of the ray graphically.
-    self.ray_start_geometry = _loader.create_geometry_from_file("ray_start_geometry"
+    self.ray_start_geometry = geometry_cache.create_geometry_from_file("ray_start_geometry"
                                                                , "data/objects/cube.obj"
                                                                , "data/materials/White.gmd"
                                                                , avango.gua.LoaderFlags.DEFAULTS)
     self.ray_start_geometry.Transform.value = avango.gua.make_scale_mat(0.015, 0.015, 0.015)
-    self.ray_start_geometry.GroupNames.value.append(self.USER_REPRESENTATION.view_transform_node.Name.value) 
+    self.ray_start_geometry.GroupNames.value.append(self.USER_REPRESENTATION.get_view_group_name()) 
     self.tool_transform_node.Children.value.append(self.ray_start_geometry)
 
     ## @var highlighted
@@ -120,9 +126,15 @@ class RayPointerRepresentation(ToolRepresentation):
 
   ## Resets the GroupNames field of this RayPointerRepresentation's visualization to the user representation's view_transform_node.
   def reset_visualization_group_names(self):
-    self.ray_geometry.GroupNames.value = [self.USER_REPRESENTATION.view_transform_node.Name.value]
-    self.intersection_point_geometry.GroupNames.value = [self.USER_REPRESENTATION.view_transform_node.Name.value]
-    self.ray_start_geometry.GroupNames.value = [self.USER_REPRESENTATION.view_transform_node.Name.value]
+    self.ray_geometry.GroupNames.value = [self.USER_REPRESENTATION.get_view_group_name()]
+    self.intersection_point_geometry.GroupNames.value = [self.USER_REPRESENTATION.get_view_group_name()]
+    self.ray_start_geometry.GroupNames.value = [self.USER_REPRESENTATION.get_view_group_name()]
+
+  ## Sets the GroupNames field of this RayPointerRepresentation's visualization to the reset state followed by a list of strings.
+  # @param LIST_OF_STRINGS The strings to be appended to the reset state.
+  def set_visualization_group_names(self, LIST_OF_STRINGS):
+    apply_group_names([self.ray_geometry, self.intersection_point_geometry, self.ray_start_geometry]
+                    , [self.USER_REPRESENTATION.get_view_group_name()] + LIST_OF_STRINGS)
 
   ## Enables a highlight for this RayPointerRepresentation.
   def enable_highlight(self):
@@ -143,9 +155,6 @@ class RayPointerRepresentation(ToolRepresentation):
   ## Evaluated every frame.
   def evaluate(self):
 
-    # base class evaluate
-    self.perform_tool_node_transformation()
-
     # update border color according to highlight enabled
     
     if self.highlighted:
@@ -174,6 +183,11 @@ class RayPointer(Tool):
   # Boolean field representing the third button of the pointer.
   sf_pointer_button2 = avango.SFBool()  
 
+  ## @var sf_frame_count
+  # Frame count of the FrameScheduler. Connected, so this script is evaluated after the scheduler and its ray tests
+  # share the results of the current frame in the PickService.
+  sf_frame_count = avango.SFInt()
+
   ## @var mf_pointer_pick_result
   # Intersections of the picking ray with the objects in the scene.
   mf_pointer_pick_result = avango.gua.MFPickResult()
@@ -233,6 +247,7 @@ class RayPointer(Tool):
     self.sf_pointer_button0.connect_from(self.device_sensor.Button0)
     self.sf_pointer_button1.connect_from(self.device_sensor.Button1)
     self.sf_pointer_button2.connect_from(self.device_sensor.Button2)
+    self.sf_frame_count.connect_from(frame_scheduler.sf_frame_count)
 
   ## Creates a RayPointerRepresentation for this RayPointer at a DISPLAY_GROUP.
   # @param DISPLAY_GROUP The DisplayGroup instance to create the representation for.
@@ -248,16 +263,13 @@ class RayPointer(Tool):
   # @param MATRIX The matrix to shoot the pick ray from.
   def compute_pick_result(self, MATRIX):
 
-    _ray = avango.gua.nodes.RayNode()
-    _ray.Transform.value = MATRIX * avango.gua.make_scale_mat(1.0, 1.0, self.ray_length)
-
     _picking_options = avango.gua.PickingOptions.PICK_ONLY_FIRST_OBJECT \
                      | avango.gua.PickingOptions.GET_WORLD_POSITIONS \
                      | avango.gua.PickingOptions.GET_WORLD_NORMALS
 
     _picking_mask = "man_pick_group"
 
-    _pick_result = scenegraphs[0].ray_test(_ray, _picking_options, _picking_mask)
+    _pick_result = pick_service.ray_test(scenegraphs[0], MATRIX, self.ray_length, _picking_options, _picking_mask, "RayPointer")
     return _pick_result
 
   ## Selects a list of potentially currently active RayPointerRepresentations by computing picks for them.
@@ -398,7 +410,7 @@ class RayPointer(Tool):
   def drag_object(self):
 
     _mat = self.dragging_tool_representation.get_world_transform() * self.dragging_offset
-    self.dragged_interactive_object.set_world_transform(_mat)
+    transform_batch.set_world_transform(self.dragged_interactive_object, _mat)
 
 
   ## Change the hierarchy selection level to a given level.
@@ -432,9 +444,9 @@ class RayPointer(Tool):
     if PICK_RESULT != None: # intersection found     
       
       _node = PICK_RESULT.Object.value
+      _object = interactive_object_index.get_by_node(_node)
       
-      if _node.has_field("InteractiveObject") == True:
-        _object = _node.InteractiveObject.value
+      if _object != None:
         #print _object
         
         if self.hierarchy_selection_level >= 0:          
@@ -484,11 +496,19 @@ class RayPointer(Tool):
         _hit_node = _pick_result.Object.value
 
         # retrieve InteractiveObject instance
-        if _hit_node.has_field("InteractiveObject"):
+        _object = interactive_object_index.get_by_node(_hit_node)
+
+        if _object != None:
 
-          _object = _hit_node.InteractiveObject.value
           self.dragged_interactive_object = _object
           self.dragging_tool_representation = _hit_tool_repr
+
+          # the object might still have a pending transformation from another pointer
+          transform_batch.flush()
+
+          # allow the manipulation to be undone
+          _object.SCENE.take_snapshot()
+
           self.dragging_offset = avango.gua.make_inverse_mat(self.dragging_tool_representation.get_world_transform()) * self.dragged_interactive_object.get_world_transform()
 
 
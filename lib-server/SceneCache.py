@@ -0,0 +1,155 @@
+#!/usr/bin/python
+
+## @file
+# Contains class SceneCache.
+
+# import framework libraries
+from ConsoleIO import *
+
+# import python libraries
+import collections
+import os
+
+## Keeps track of the loaded scenes in the order of their last activation and decides which ones
+# to unload. The budget is given in scenegraph nodes, which is the best memory estimate available
+# in Python, and optionally in a number of resident scenes. The least recently activated scenes are
+# evicted first; the active scene is never evicted, even if it exceeds the budget on its own.
+class SceneCache:
+
+  ## Custom constructor.
+  # @param MAX_NODES Maximum number of scenegraph nodes of all resident scenes. 0 for no limit.
+  # @param MAX_SCENES Maximum number of resident scenes. 0 for no limit.
+  def __init__(self, MAX_NODES = 0, MAX_SCENES = 0):
+
+    ## @var max_nodes
+    # Maximum number of scenegraph nodes of all resident scenes. 0 for no limit.
+    self.max_nodes = MAX_NODES
+
+    ## @var max_scenes
+    # Maximum number of resident scenes. 0 for no limit.
+    self.max_scenes = MAX_SCENES
+
+    ## @var entries
+    # Ordered dictionary mapping scene ids to their node counts, least recently activated first.
+    self.entries = collections.OrderedDict()
+
+    ## @var node_counts
+    # Dictionary mapping scene ids to their node counts when they were resident the last time, kept after eviction.
+    self.node_counts = {}
+
+    ## @var hit_count
+    # Number of activations of scenes which were resident.
+    self.hit_count = 0
+
+    ## @var miss_count
+    # Number of activations of scenes which had to be built first.
+    self.miss_count = 0
+
+    ## @var eviction_count
+    # Number of scenes unloaded to stay within the budget.
+    self.eviction_count = 0
+
+  ## Creates a SceneCache with the budget given by the environment variables NVF_SCENE_CACHE_NODES
+  # and NVF_SCENE_CACHE_SCENES. Without them, no scene is ever evicted.
+  @staticmethod
+  def create_from_environment():
+
+    return SceneCache(int(os.environ.get("NVF_SCENE_CACHE_NODES", "0"))
+                    , int(os.environ.get("NVF_SCENE_CACHE_SCENES", "0")))
+
+  ## Returns a boolean saying if a scene is resident.
+  # @param ID The id of the scene.
+  def contains(self, ID):
+
+    return ID in self.entries
+
+  ## Records the activation of a scene, counting a hit or a miss, and marks it as most recently used.
+  # Must be called before the scene is built, so a miss can be detected.
+  # @param ID The id of the scene to be activated.
+  def touch(self, ID):
+
+    if ID in self.entries:
+      self.hit_count += 1
+      self.entries.move_to_end(ID)
+    else:
+      self.miss_count += 1
+
+  ## Registers a newly built scene or updates the node count of a resident one.
+  # @param ID The id of the scene.
+  # @param NODE_COUNT Number of scenegraph nodes the scene consists of.
+  def insert(self, ID, NODE_COUNT):
+
+    self.entries[ID] = NODE_COUNT
+    self.node_counts[ID] = NODE_COUNT
+
+  ## Unregisters an unloaded scene.
+  # @param ID The id of the scene.
+  def remove(self, ID):
+
+    if ID in self.entries:
+      del self.entries[ID]
+
+  ## Returns the number of scenegraph nodes of all resident scenes.
+  def get_node_count(self):
+
+    return sum(self.entries.values())
+
+  ## Returns a boolean saying if a scene can be made resident next to some protected scenes without exceeding the budget.
+  # Scenes which were never built are assumed to fit, unless the number of scenes is exceeded.
+  # @param ID The id of the scene to be made resident.
+  # @param PROTECTED_IDS List of the ids of the scenes which must stay resident, e.g. the active scene.
+  def can_admit(self, ID, PROTECTED_IDS):
+
+    if self.max_scenes > 0 and len(PROTECTED_IDS) + 1 > self.max_scenes:
+      return False
+
+    if self.max_nodes > 0 and ID in self.node_counts:
+      return sum([self.entries.get(_id, 0) for _id in PROTECTED_IDS]) + self.node_counts[ID] <= self.max_nodes
+
+    return True
+
+  ## Returns a boolean saying if the resident scenes exceed the budget.
+  def is_over_budget(self):
+
+    return (self.max_nodes > 0 and self.get_node_count() > self.max_nodes) or \
+           (self.max_scenes > 0 and len(self.entries) > self.max_scenes)
+
+  ## Returns the ids of the scenes to be unloaded to get within the budget, least recently activated first,
+  # and unregisters them.
+  # @param PROTECTED_IDS List of scene ids which must not be evicted, e.g. the active scene.
+  def collect_evictions(self, PROTECTED_IDS):
+
+    _evicted_ids = []
+
+    for _id in list(self.entries.keys()):
+
+      if self.is_over_budget() == False:
+        break
+
+      if _id in PROTECTED_IDS:
+        continue
+
+      self.remove(_id)
+      _evicted_ids.append(_id)
+
+    self.eviction_count += len(_evicted_ids)
+
+    return _evicted_ids
+
+  ## Returns a dictionary with the numbers of hits, misses, evictions, resident scenes and nodes.
+  def get_statistics(self):
+
+    return {"hits" : self.hit_count
+          , "misses" : self.miss_count
+          , "evictions" : self.eviction_count
+          , "scenes" : len(self.entries)
+          , "nodes" : self.get_node_count()}
+
+  ## Prints the statistics on the console.
+  def print_statistics(self):
+
+    _statistics = self.get_statistics()
+    print_message("Scene cache: " + str(_statistics["hits"]) + " hits" + \
+                  ", " + str(_statistics["misses"]) + " misses" + \
+                  ", " + str(_statistics["evictions"]) + " evictions" + \
+                  ", " + str(_statistics["scenes"]) + " scenes with " + str(_statistics["nodes"]) + " nodes resident")
@@ -15,6 +15,12 @@ from ApplicationManager import *
 import Utilities
 from Scene import *
 from ConsoleIO import *
+from StartupProfiler import startup_profiler
+from NodeDistributor import node_distributor
+from SceneCache import SceneCache
+from PLODBudgetController import plod_budget_controller
+from FrameScheduler import frame_scheduler
+from AssetLoader import asset_loader
 
 from scene_config import scenegraphs
 from scene_config import scenes
@@ -187,6 +193,10 @@ class SceneManager(avango.script.Script):
   # Boolean field representing the home key.
   sf_key_home = avango.SFBool()
 
+  ## @var sf_key_backspace
+  # Boolean field representing the backspace key, which undoes the last drag in the active scene.
+  sf_key_backspace = avango.SFBool()
+
   ## @var hierarchy_materials
   # List of material strings to be used for representing the bounding box hierarchies.
   hierarchy_materials = ["data/materials/AvatarMagentaShadeless.gmd", "data/materials/AvatarGreenShadeless.gmd", "data/materials/AvatarOrangeShadeless.gmd", "data/materials/AvatarRedShadeless.gmd"]
@@ -199,6 +209,10 @@ class SceneManager(avango.script.Script):
   # Static attribute holding the far clippling distance of the currently active scene.
   current_far_clip = 1000.0
 
+  ## @var prefetch_delay_frames
+  # Number of frames to wait after a scene switch before the adjacent scene is built in the background.
+  prefetch_delay_frames = 60
+
 
   # Default constructor.
   def __init__(self):
@@ -219,6 +233,30 @@ class SceneManager(avango.script.Script):
     # A list of scenes that were loaded.
     self.scenes = []
 
+    ## @var scene_names
+    # List of the scene class names given in the configuration file. The index is the scene id.
+    self.scene_names = list(scenes)
+
+    ## @var loaded_scenes
+    # Dictionary mapping scene ids to the scenes which were already built.
+    self.loaded_scenes = {}
+
+    ## @var scene_cache
+    # SceneCache deciding which of the loaded scenes are unloaded to stay within the memory budget.
+    self.scene_cache = SceneCache.create_from_environment()
+
+    ## @var prefetch_scene_id
+    # Id of the scene to be built in the background or None if there is nothing to prefetch.
+    self.prefetch_scene_id = None
+
+    ## @var prefetched_scene_id
+    # Id of the scene built by the last prefetch, protected from eviction until the next activation, or None.
+    self.prefetched_scene_id = None
+
+    ## @var prefetch_wait_frames
+    # Number of frames left until the scene with id prefetch_scene_id is built.
+    self.prefetch_wait_frames = 0
+
     ## @var active_scene
     # Number of the currently active (displayed) scene.
     self.active_scene = None
@@ -241,6 +279,7 @@ class SceneManager(avango.script.Script):
       self.sf_key9.connect_from(self.keyboard_sensor.Button18) # key 9
       self.sf_key0.connect_from(self.keyboard_sensor.Button9)  # key 0
       self.sf_key_home.connect_from(self.keyboard_sensor.Button31) # key Pos1(Home)
+      self.sf_key_backspace.connect_from(self.keyboard_sensor.Button32) # key Backspace
 
     # init pipeline value node
     _pipeline_value_node = avango.gua.nodes.TransformNode(Name = "pipeline_values")
@@ -251,13 +290,20 @@ class SceneManager(avango.script.Script):
     self.pipeline_info_node = avango.gua.nodes.TransformNode()
     _pipeline_value_node.Children.value.append(self.pipeline_info_node)
 
-    # init scenes according to configuration file
-    _scene_id = 0
+    # init PLOD budget node, the clients adjust the budget distributed in the name of its child to their frame times
+    _plod_budget_node = avango.gua.nodes.TransformNode(Name = "plod_budget")
+    self.NET_TRANS_NODE.Children.value.append(_plod_budget_node)
+
+    _plod_budget_info_node = avango.gua.nodes.TransformNode()
+    _plod_budget_node.Children.value.append(_plod_budget_info_node)
+    plod_budget_controller.set_info_node(_plod_budget_info_node)
 
-    for _scene_name in scenes:
-      exec("self.scene_" + str(_scene_id) + " = " + str(_scene_name) + "(self, self.SCENEGRAPH, self.NET_TRANS_NODE)")
-      _scene_id += 1
+    ## @var prefetch_task
+    # FrameTask evaluating the prefetch_callback method every frame while a scene is waiting to be prefetched.
+    self.prefetch_task = frame_scheduler.register("SceneManager prefetch", self.prefetch_callback)
+    self.prefetch_task.active = False
 
+    # scenes are built on their first activation, only the first one is built at startup
     self.activate_scene(0) # activate first scene
         
 
@@ -339,22 +385,142 @@ class SceneManager(avango.script.Script):
     if self.sf_key_home.value == True: # key pressed
       self.print_active_scene()
 
+  ## Called whenever sf_key_backspace changes.
+  @field_has_changed(sf_key_backspace)
+  def sf_key_backspace_changed(self):
+
+    if self.sf_key_backspace.value == True: # key pressed
+      self.undo_active_scene()
+
   def getActiveSceneName(self):
     return self.active_scene.name
 
+  ## Evaluated every frame while a scene is waiting to be prefetched.
+  def prefetch_callback(self):
+
+    if self.prefetch_wait_frames > 0:
+      self.prefetch_wait_frames -= 1
+      return
+
+    self.prefetch_task.active = False
+
+    if self.prefetch_scene_id != None:
+
+      # only the scene structure and placeholders are built in this frame, the assets follow one per frame
+      with asset_loader.deferred():
+        self.load_scene(self.prefetch_scene_id)
+
+      self.prefetched_scene_id = self.prefetch_scene_id
+      self.prefetch_scene_id = None
+      self.evict_scenes()
+
   # functions
-  ## Sets one of the loaded scene to the active (displayed) one.
+  ## Returns the scene with a given id, building it first if it was not loaded yet.
+  # Newly built scenes are hidden and their nodes are distributed to the clients.
+  # @param ID The id of the scene to be returned.
+  def load_scene(self, ID):
+
+    if ID in self.loaded_scenes:
+      return self.loaded_scenes[ID]
+
+    _scene_name = self.scene_names[ID]
+    _start = time.time()
+
+    with startup_profiler.phase("scene " + str(_scene_name)):
+      _scene = eval(_scene_name)(self, self.SCENEGRAPH, self.NET_TRANS_NODE)
+
+    setattr(self, "scene_" + str(ID), _scene)
+    self.loaded_scenes[ID] = _scene
+
+    _scene.enable_scene(False)
+    node_distributor.distribute_subtree(_scene.scene_root)
+
+    self.scene_cache.insert(ID, _scene.count_nodes())
+
+    print_message("Built scene " + _scene.name + " in " + str(round(time.time() - _start, 3)) + " s.")
+
+    return _scene
+
+  ## Unloads a scene, removing all of its nodes from the scenegraph and the clients.
+  # It is built again on its next activation.
+  # @param ID The id of the scene to be unloaded.
+  def unload_scene(self, ID):
+
+    if ID not in self.loaded_scenes:
+      return
+
+    _scene = self.loaded_scenes.pop(ID)
+    _scene.unload()
+    delattr(self, "scene_" + str(ID))
+    self.scene_cache.remove(ID)
+
+    print_message("Unloaded scene " + _scene.name + ".")
+
+  ## Unloads the least recently activated scenes until the scene cache is within its budget.
+  # The active scene and a scene just prefetched are never unloaded.
+  def evict_scenes(self):
+
+    _protected_ids = []
+
+    for _id, _scene in self.loaded_scenes.items():
+      if _scene == self.active_scene or _id == self.prefetched_scene_id:
+        _protected_ids.append(_id)
+
+    for _id in self.scene_cache.collect_evictions(_protected_ids):
+      self.unload_scene(_id)
+
+  ## Schedules the construction of the scene most likely to be activated next, i.e. the one
+  # on the adjacent number key. It is built a few frames later, so the current switch is not delayed,
+  # and its assets are loaded by the AssetLoader one per frame, so no single frame builds the whole scene.
+  # @param ID The id of the currently active scene.
+  def schedule_prefetch(self, ID):
+
+    self.prefetch_scene_id = None
+
+    for _candidate_id in [ID + 1, ID - 1]:
+      if _candidate_id >= 0 and _candidate_id < len(self.scene_names) and _candidate_id not in self.loaded_scenes:
+
+        # a scene which does not fit next to the active one would be built and discarded right away
+        if self.scene_cache.can_admit(_candidate_id, [ID]) == True:
+          self.prefetch_scene_id = _candidate_id
+
+        break
+
+    self.prefetch_wait_frames = SceneManager.prefetch_delay_frames
+    self.prefetch_task.active = self.prefetch_scene_id != None
+
+  ## Sets one of the configured scenes to the active (displayed) one, building it if necessary.
+  # Only scenes whose state changes are touched: scenes that are already disabled are skipped and
+  # the target scene only resets the objects that were moved since it was shown the last time.
   # @param ID The scene id to be activated.
   def activate_scene(self, ID):
+
+    _target_scene = None
+
+    if ID < len(self.scene_names):
+      _resident = self.scene_cache.contains(ID)
+      self.scene_cache.touch(ID)
+      _target_scene = self.load_scene(ID)
+
+      # deferred assets of a prefetched scene may have been inserted since it was built
+      if _resident == True:
+        self.scene_cache.insert(ID, _target_scene.count_nodes())
     
-    # disable all scenes
+    # disable all other scenes
     for _scene in self.scenes:
-      _scene.enable_scene(False)
+      if _scene != _target_scene and _scene.enabled == True:
+        _scene.enable_scene(False)
   
-    if ID < len(self.scenes):
-      self.active_scene = self.scenes[ID]
+    if _target_scene != None:
+      self.active_scene = _target_scene
+      self.prefetched_scene_id = None
+      self.evict_scenes()
       self.active_scene.enable_scene(True)
-      self.pipeline_info_node.Name.value = self.active_scene.get_pipeline_value_string()
+
+      _pipeline_value_string = self.active_scene.get_pipeline_value_string()
+
+      if self.pipeline_info_node.Name.value != _pipeline_value_string:
+        self.pipeline_info_node.Name.value = _pipeline_value_string
 
       SceneManager.current_near_clip = self.active_scene.near_clip
       SceneManager.current_far_clip = self.active_scene.far_clip
@@ -369,7 +535,20 @@ class SceneManager(avango.script.Script):
 
   
       print("Switching to Scene: " + self.active_scene.name)
+
+      self.schedule_prefetch(ID)
   
+  ## Undoes the most recent manipulation of the active scene by restoring the snapshot taken when it started.
+  # Snapshots are taken whenever an object starts being dragged; repeated calls step further back.
+  def undo_active_scene(self):
+
+    _moved_count = self.active_scene.undo()
+
+    if _moved_count == None:
+      print_warning("Nothing to undo in scene " + self.active_scene.name + ".")
+    else:
+      print_message("Undid the last manipulation of scene " + self.active_scene.name + ", " + str(_moved_count) + " objects moved.")
+
   ## Prints all the nodes of the active scene on the console.
   def print_active_scene(self):
   
@@ -381,6 +560,8 @@ class SceneManager(avango.script.Script):
           print("Workspace:", _workspace.id, "Display Group:", _display_group.id, "Navigation:", _display_group.navigations.index(_navigation))
           print(_navigation.sf_nav_mat.value)
 
+    self.scene_cache.print_statistics()
+
     # print navigation nodes
     #for _i, _navigation in enumerate(self.navigation_list):
     #  print "platform_" + str(_i), _navigation.platform.sf_abs_mat.value.get_translate(), _navigation.platform.sf_abs_mat.value.get_rotate(), _navigation.platform.sf_scale.value
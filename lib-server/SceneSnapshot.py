@@ -0,0 +1,220 @@
+#!/usr/bin/python
+
+## @file
+# Contains classes SceneSnapshot and SceneSnapshotRing.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from Visualization import calc_bounding_boxes
+from TransformBatch import transform_batch
+from PickBroadPhase import pick_broad_phase
+
+# import python libraries
+import array
+import collections
+import os
+import time
+
+## @var ENABLED_FLAG
+# Bit in SceneSnapshot.flags saying that an object is enabled.
+ENABLED_FLAG = 1
+
+## @var HIGHLIGHT_FLAG
+# Bit in SceneSnapshot.flags saying that an object is highlighted.
+HIGHLIGHT_FLAG = 2
+
+## The local transformations and enable and highlight states of all objects of a scene at one point in time.
+# The matrices are stored as 16 doubles per object and the states as one byte per object in flat arrays.
+# Each object's transform_version is stored as well, so capturing only reads the matrices of objects moved
+# since the previous snapshot and restoring only writes the objects whose state differs from the snapshot.
+class SceneSnapshot:
+
+  ## Custom constructor.
+  # @param OBJECTS List of the InteractiveObjects captured, in depth-first order.
+  # @param MATRICES Array of 16 doubles per object containing the local transformations in row-major order.
+  # @param VERSIONS Array containing the transform_version of each object.
+  # @param FLAGS Array containing one byte of ENABLED_FLAG and HIGHLIGHT_FLAG bits per object.
+  def __init__(self, OBJECTS, MATRICES, VERSIONS, FLAGS):
+
+    ## @var objects
+    # List of the InteractiveObjects captured, in depth-first order.
+    self.objects = OBJECTS
+
+    ## @var matrices
+    # Array of 16 doubles per object containing the local transformations in row-major order.
+    self.matrices = MATRICES
+
+    ## @var versions
+    # Array containing the transform_version of each object.
+    self.versions = VERSIONS
+
+    ## @var flags
+    # Array containing one byte of ENABLED_FLAG and HIGHLIGHT_FLAG bits per object.
+    self.flags = FLAGS
+
+    ## @var timestamp
+    # Point in time when the snapshot was taken.
+    self.timestamp = time.time()
+
+  ## Captures the current state of a scene.
+  # @param SCENE The SceneObject to be captured.
+  # @param PREVIOUS_SNAPSHOT A former SceneSnapshot of the same scene whose matrices are reused for unmoved objects or None.
+  @staticmethod
+  def capture(SCENE, PREVIOUS_SNAPSHOT):
+
+    _objects = SCENE.hierarchy.get_objects()
+    _matrices = array.array("d")
+    _versions = array.array("q")
+    _flags = array.array("B")
+
+    _previous_indices = {}
+
+    if PREVIOUS_SNAPSHOT != None:
+      _previous_indices = dict((_object, _i) for _i, _object in enumerate(PREVIOUS_SNAPSHOT.objects))
+
+    for _object in _objects:
+
+      _previous_index = _previous_indices.get(_object)
+
+      if _previous_index != None and PREVIOUS_SNAPSHOT.versions[_previous_index] == _object.transform_version:
+        _matrices.extend(PREVIOUS_SNAPSHOT.matrices[_previous_index * 16:_previous_index * 16 + 16])
+
+      else:
+        _mat = _object.get_local_transform()
+        _matrices.extend([_mat.get_element(_row, _column) for _row in range(4) for _column in range(4)])
+
+      _versions.append(_object.transform_version)
+
+      _flag = 0
+
+      if _object.enabled == True:
+        _flag |= ENABLED_FLAG
+
+      if _object.sf_highlight_flag.value == True:
+        _flag |= HIGHLIGHT_FLAG
+
+      _flags.append(_flag)
+
+    return SceneSnapshot(_objects, _matrices, _versions, _flags)
+
+  ## Restores the captured state of a scene in a single pass. Objects created after the snapshot are left untouched
+  # and objects removed since are skipped. Returns the number of objects whose transformation was restored.
+  # @param SCENE The SceneObject the snapshot was captured from.
+  def restore(self, SCENE):
+
+    _existing_objects = set(SCENE.objects)
+    _moved_objects = []
+
+    for _i, _object in enumerate(self.objects):
+
+      if _object not in _existing_objects:
+        continue
+
+      # a transformation queued in the same frame, e.g. by a drag, would overwrite the restored one
+      transform_batch.remove(_object)
+
+      if _object.transform_version != self.versions[_i]:
+        _mat = avango.gua.make_identity_mat()
+
+        for _j in range(16):
+          _mat.set_element(_j // 4, _j % 4, self.matrices[_i * 16 + _j])
+
+        _object.get_node().Transform.value = _mat
+        _object.transform_version = self.versions[_i]
+
+        # version 0 is the home transformation, which needs no reset
+        if _object.transform_version != 0:
+          SCENE.mark_object_modified(_object)
+
+        _moved_objects.append(_object)
+
+      _enabled = (self.flags[_i] & ENABLED_FLAG) != 0
+      _highlighted = (self.flags[_i] & HIGHLIGHT_FLAG) != 0
+
+      if _object.enabled != _enabled:
+        _object.enable_object(_enabled)
+
+      if _object.sf_highlight_flag.value != _highlighted:
+        _object.sf_highlight_flag.value = _highlighted
+
+    if len(_moved_objects) > 0:
+
+      # bookkeeping of set_local_transform, once for all moved objects
+      transform_batch.clear_cache()
+      pick_broad_phase.invalidate()
+
+      _visualizations = set()
+
+      for _object in _moved_objects:
+
+        for _ancestor in _object.hierarchy_ancestors:
+          _ancestor.bb_vis.invalidate_bb()
+          _visualizations.add(_ancestor.bb_vis)
+
+      calc_bounding_boxes(list(_visualizations))
+
+    return len(_moved_objects)
+
+  ## Returns the number of bytes used by the arrays of this snapshot.
+  def get_size(self):
+
+    return len(self.matrices) * self.matrices.itemsize + \
+           len(self.versions) * self.versions.itemsize + \
+           len(self.flags) * self.flags.itemsize
+
+
+## Bounded ring of the most recent SceneSnapshots of a scene. The oldest snapshot is dropped when it is full.
+class SceneSnapshotRing:
+
+  ## Custom constructor.
+  # @param CAPACITY Maximum number of snapshots kept.
+  def __init__(self, CAPACITY):
+
+    ## @var snapshots
+    # Deque of the kept snapshots, oldest first.
+    self.snapshots = collections.deque(maxlen = CAPACITY)
+
+  ## Creates a SceneSnapshotRing with the capacity given by the environment variable NVF_SNAPSHOT_CAPACITY, 16 by default.
+  @staticmethod
+  def create_from_environment():
+
+    return SceneSnapshotRing(int(os.environ.get("NVF_SNAPSHOT_CAPACITY", "16")))
+
+  ## Captures the current state of a scene and appends it to the ring. Returns the new SceneSnapshot.
+  # @param SCENE The SceneObject to be captured.
+  def capture(self, SCENE):
+
+    _snapshot = SceneSnapshot.capture(SCENE, self.get(0))
+    self.snapshots.append(_snapshot)
+
+    return _snapshot
+
+  ## Returns a snapshot by its age or None if there is no such snapshot.
+  # @param INDEX Number of snapshots taken after the requested one, i.e. 0 for the most recent one.
+  def get(self, INDEX):
+
+    if INDEX < 0 or INDEX >= len(self.snapshots):
+      return None
+
+    return self.snapshots[-1 - INDEX]
+
+  ## Removes the most recent snapshot from the ring and returns it or None if the ring is empty.
+  def pop(self):
+
+    if len(self.snapshots) == 0:
+      return None
+
+    return self.snapshots.pop()
+
+  ## Returns the number of snapshots kept.
+  def get_count(self):
+
+    return len(self.snapshots)
+
+  ## Returns the number of bytes used by all snapshots kept.
+  def get_size(self):
+
+    return sum([_snapshot.get_size() for _snapshot in self.snapshots])
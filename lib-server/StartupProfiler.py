@@ -0,0 +1,203 @@
+#!/usr/bin/python
+
+## @file
+# Contains class StartupProfiler and its global instance startup_profiler.
+
+# import framework libraries
+from ConsoleIO import *
+
+# import python libraries
+import contextlib
+import json
+import os
+import time
+
+## Records wall time and scenegraph node count deltas of nested startup phases.
+# Top-level phases count the whole scenegraph. Sub-phases count only the subtrees they create,
+# either below a root node passed to phase or below the nodes passed to count_created.
+# Disabled by default. Setting the environment variable NVF_STARTUP_PROFILE enables it,
+# NVF_STARTUP_PROFILE_JSON additionally names a file the results are written to.
+class StartupProfiler:
+
+  ## Default constructor.
+  def __init__(self):
+
+    ## @var enabled
+    # Boolean saying if phases are recorded.
+    self.enabled = False
+
+    ## @var root_node
+    # Scenegraph node below which nodes are counted or None if nodes are not counted.
+    self.root_node = None
+
+    ## @var records
+    # List of dictionaries describing all finished phases in the order they were started.
+    self.records = []
+
+    ## @var phase_stack
+    # Names of the phases currently running, outermost first.
+    self.phase_stack = []
+
+    ## @var created_stack
+    # Node counts collected for the phases currently running, outermost first. Each entry is a list
+    # of the nodes passed to count_created within the phase (or None) and the summed deltas of its sub-phases.
+    self.created_stack = []
+
+    ## @var start_time
+    # Point in time when the profiler was enabled.
+    self.start_time = None
+
+  ## Enables the profiler.
+  # @param ROOT_NODE Scenegraph node below which nodes are counted for the node deltas.
+  def enable(self, ROOT_NODE = None):
+
+    self.enabled = True
+    self.root_node = ROOT_NODE
+    self.start_time = time.time()
+
+  ## Enables the profiler if the environment variable NVF_STARTUP_PROFILE is set.
+  # @param ROOT_NODE Scenegraph node below which nodes are counted for the node deltas.
+  def enable_from_environment(self, ROOT_NODE = None):
+
+    if os.environ.get("NVF_STARTUP_PROFILE", "") not in ["", "0"] or \
+       os.environ.get("NVF_STARTUP_PROFILE_JSON", "") != "":
+      self.enable(ROOT_NODE)
+
+  ## Counts all nodes below a node without recursion.
+  # @param NODE Node to start counting at. Defaults to the root node.
+  def count_nodes(self, NODE = None):
+
+    if NODE == None:
+      NODE = self.root_node
+
+    if NODE == None:
+      return 0
+
+    _count = 0
+    _stack = [NODE]
+
+    while len(_stack) > 0:
+      _node = _stack.pop()
+      _count += 1
+      _stack.extend(_node.Children.value)
+
+    return _count
+
+  ## Adds the nodes of a subtree created in the innermost running phase to its node delta.
+  # @param NODE Root node of the created subtree.
+  def count_created(self, NODE):
+
+    if self.enabled == False or len(self.created_stack) == 0:
+      return
+
+    _counts = self.created_stack[-1]
+
+    if _counts[0] == None:
+      _counts[0] = 0
+
+    _counts[0] += self.count_nodes(NODE)
+
+  ## Context manager recording a phase. Phases may be nested to form sub-phases.
+  # Top-level phases count the whole scenegraph before and after the phase. Sub-phases count the subtree
+  # below ROOT_NODE before and after the phase if given, otherwise the subtrees passed to count_created
+  # within the phase, otherwise the summed node deltas of their own sub-phases.
+  # @param NAME Name of the phase, e.g. "SceneManager" or "init_geometry town".
+  # @param ROOT_NODE Optional node below which the phase creates its nodes.
+  @contextlib.contextmanager
+  def phase(self, NAME, ROOT_NODE = None):
+
+    if self.enabled == False:
+      yield
+      return
+
+    _record = {"name" : NAME, "path" : "/".join(self.phase_stack + [NAME]), "depth" : len(self.phase_stack), "node_delta" : None}
+    self.records.append(_record)
+
+    # nodes are counted outside of any measured duration
+    if ROOT_NODE != None:
+      _nodes_before = self.count_nodes(ROOT_NODE)
+    elif _record["depth"] == 0:
+      _nodes_before = self.count_nodes()
+
+    _counts = [None, None]
+    self.created_stack.append(_counts)
+    self.phase_stack.append(NAME)
+    _start = time.time()
+
+    try:
+      yield
+    finally:
+      _record["duration"] = time.time() - _start
+      self.phase_stack.pop()
+      self.created_stack.pop()
+
+      if ROOT_NODE != None:
+        _record["node_delta"] = self.count_nodes(ROOT_NODE) - _nodes_before
+      elif _record["depth"] == 0:
+        _record["node_delta"] = self.count_nodes() - _nodes_before
+      elif _counts[0] != None:
+        _record["node_delta"] = _counts[0]
+      else:
+        _record["node_delta"] = _counts[1]
+
+      # let the enclosing phase fall back to the deltas of its sub-phases
+      if _record["node_delta"] != None and len(self.created_stack) > 0:
+        _parent_counts = self.created_stack[-1]
+
+        if _parent_counts[1] == None:
+          _parent_counts[1] = 0
+
+        _parent_counts[1] += _record["node_delta"]
+
+  ## Returns the finished phase records sorted by decreasing wall time.
+  def get_sorted_records(self):
+
+    return sorted([_record for _record in self.records if "duration" in _record], key = lambda _record: _record["duration"], reverse = True)
+
+  ## Prints all recorded phases sorted by decreasing wall time.
+  def print_report(self):
+
+    if self.enabled == False:
+      return
+
+    print_headline("Startup profile (" + str(round(time.time() - self.start_time, 3)) + " s since start)")
+
+    print("{0:>10} {1:>10}  {2}".format("time [s]", "nodes", "phase"))
+
+    for _record in self.get_sorted_records():
+
+      if _record["node_delta"] == None: # sub-phase without counted nodes
+        print("{0:>10.3f} {1:>10}  {2}".format(_record["duration"], "-", _record["path"]))
+      else:
+        print("{0:>10.3f} {1:>+10d}  {2}".format(_record["duration"], _record["node_delta"], _record["path"]))
+
+    print("")
+
+  ## Writes all recorded phases in start order to a JSON file.
+  # @param PATH File path to write to.
+  def write_json(self, PATH):
+
+    if self.enabled == False:
+      return
+
+    with open(PATH, "w") as _file:
+      json.dump({"total" : time.time() - self.start_time, "phases" : self.records}, _file, indent = 2)
+
+  ## Prints the report, writes the JSON file if NVF_STARTUP_PROFILE_JSON is set and disables the profiler,
+  # so that assets loaded after the startup do not count nodes anymore.
+  def finish(self):
+
+    self.print_report()
+
+    _json_path = os.environ.get("NVF_STARTUP_PROFILE_JSON", "")
+
+    if _json_path != "":
+      self.write_json(_json_path)
+      print_message("Startup profile written to " + _json_path)
+
+    self.enabled = False
+
+
+## @var startup_profiler
+# Global StartupProfiler instance shared by all framework classes.
+startup_profiler = StartupProfiler()
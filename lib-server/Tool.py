@@ -14,6 +14,7 @@ import avango.daemon
 from ApplicationManager import *
 from VisibilityHandler import *
 from TrackingReader import TrackingTargetReader
+from FrameScheduler import frame_scheduler
 import Utilities
 
 ## Geometric representation of a Tool in a DisplayGroup. 
@@ -61,8 +62,9 @@ class ToolRepresentation(avango.script.Script):
     self.tool_transform_node = avango.gua.nodes.TransformNode(Name = TOOL_TRANSFORM_NODE_NAME)
     self.USER_REPRESENTATION.view_transform_node.Children.value.append(self.tool_transform_node)
 
-    # set evaluation policy
-    self.always_evaluate(True)
+    ## @var frame_task
+    # FrameTask performing the tool node transformation whenever the tracking matrix changed.
+    self.frame_task = frame_scheduler.register("ToolRepresentation", self.perform_tool_node_transformation, [self.TOOL_INSTANCE.tracking_reader.sf_abs_mat])
 
   ## Computes the world transformation of the tool_transform_node.
   def get_world_transform(self):
@@ -88,10 +90,11 @@ class ToolRepresentation(avango.script.Script):
   def reset_visualization_group_names(self):
     raise NotImplementedError( "To be implemented by a subclass." )
 
-  ## Evaluated every frame.
-  def evaluate(self):
-
-    self.perform_tool_node_transformation()
+  ## Sets the GroupNames field of this ToolRepresentation's visualization to the reset state followed by a list of strings.
+  # Only the GroupNames fields whose content changes are written.
+  # @param LIST_OF_STRINGS The strings to be appended to the reset state.
+  def set_visualization_group_names(self, LIST_OF_STRINGS):
+    raise NotImplementedError( "To be implemented by a subclass." )
 
 
 ###############################################################################################
@@ -142,9 +145,6 @@ class Tool(VisibilityHandler2D):
     self.tracking_reader.set_transmitter_offset(self.WORKSPACE_INSTANCE.transmitter_offset)
     self.tracking_reader.set_receiver_offset(avango.gua.make_identity_mat())
 
-    # set evaluation policy
-    self.always_evaluate(True)
-
   ## Creates a ToolRepresentation for this Tool at a DISPLAY_GROUP. 
   # @param DISPLAY_GROUP The DisplayGroup instance to create the representation for.
   # @param USER_REPRESENTATION The UserRepresentation this representation will belong to.
@@ -212,7 +212,9 @@ class Tool(VisibilityHandler2D):
   # @param VISIBILITY_TABLE A matrix containing visibility rules according to the DisplayGroups' visibility tags. 
   def change_visiblity_table(self, VISIBILITY_TABLE):
 
-    self.visibility_table = VISIBILITY_TABLE
+    # an identical table compiles to the same matrix, so no GroupNames change
+    if self.set_visibility_table(VISIBILITY_TABLE) == False:
+      return
 
     for _display_group in self.WORKSPACE_INSTANCE.display_groups:
       self.handle_correct_visibility_groups_for(_display_group)
@@ -251,32 +253,25 @@ class Tool(VisibilityHandler2D):
 
       # check for navigation of corresponding user and compare it to assigned user
 
-      # reset initial GroupName state
-      _tool_repr.reset_visualization_group_names()
-
       # if user does not share the assigned user's navigation, hide the tool representation
       if _tool_repr.USER_REPRESENTATION.connected_navigation_id != _tool_repr_of_assigned_user.USER_REPRESENTATION.connected_navigation_id:
-        _tool_repr.append_to_visualization_group_names("do_not_display_group")
-        _assigned_user_tool_visible_for.append(_tool_repr.USER_REPRESENTATION.view_transform_node.Name.value)
+        _tool_repr.set_visualization_group_names(["do_not_display_group"])
+        _assigned_user_tool_visible_for.append(_tool_repr.USER_REPRESENTATION.get_view_group_name())
+
+      # keep initial GroupName state
+      elif _tool_repr != _tool_repr_of_assigned_user:
+        _tool_repr.set_visualization_group_names([])
+
+    # bitmask of all visibility tags for which the handled display group is visible
+    _viewer_mask = self.visibility_matrix.get_viewer_mask(_handled_display_group_instance.visibility_tag)
 
     # check for all user representations outside the handled display group
     for _user_repr in ApplicationManager.all_user_representations:
       if _user_repr.DISPLAY_GROUP != _handled_display_group_instance:
 
         # consider visibility table
-        _handled_display_group_tag = _handled_display_group_instance.visibility_tag
-        _user_repr_display_group_tag = _user_repr.DISPLAY_GROUP.visibility_tag
-        
-        _visible = self.visibility_table[_user_repr_display_group_tag][_handled_display_group_tag]
-
-        #print "Does", _user_repr.view_transform_node.Name.value, "(", _user_repr_display_group_tag, ") see"
-        #, _handled_display_group_tag, "?", _visible
-        if _visible:
-          if _user_repr.view_transform_node.Name.value == "scene_matrix":
-            _assigned_user_tool_visible_for.append(_user_repr.view_transform_node.Parent.value.Name.value + "_" + _user_repr.head.Name.value)
-          else:
-            _assigned_user_tool_visible_for.append(_user_repr.view_transform_node.Name.value)
+        if (_viewer_mask & VisibilityMatrix.get_tag_bit(_user_repr.DISPLAY_GROUP.visibility_tag)) != 0:
+          _assigned_user_tool_visible_for.append(_user_repr.get_visibility_group_name())
 
     # make tool holder tool representation visible for all others on different navigations and display groups
-    for _string in _assigned_user_tool_visible_for:
-      _tool_repr_of_assigned_user.append_to_visualization_group_names(_string)
\ No newline at end of file
+    _tool_repr_of_assigned_user.set_visualization_group_names(_assigned_user_tool_visible_for)
\ No newline at end of file
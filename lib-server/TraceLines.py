@@ -10,6 +10,8 @@ import avango.gua
 # import framework libraries
 import Utilities
 from scene_config import scenegraphs
+from NodeDistributor import node_distributor
+from GeometryCache import geometry_cache
 
 # import python libraries
 import time
@@ -47,21 +49,20 @@ class Trace:
     # A transform node that is the parent of all line segments. It groups the line segments in the scene graph as the given identifier is added to its name and therefore allows multiple instances of this class.
     self.transform_node = avango.gua.nodes.TransformNode(Name = 'nav_trace_' + str(IDENTIFIER))
     #self.transform_node = avango.gua.nodes.TransformNode(Name = 'nav_trace_' + str(0))
-    scenegraphs[0]["/net"].distribute_object(self.transform_node)
-    scenegraphs[0]["/net"].Children.value.append(self.transform_node)
 
     # create each line segment node by loading the geometry and appending it to the parent node
-    _loader = avango.gua.nodes.TriMeshLoader()
     for i in range(self.num_lines):
-      _line = _loader.create_geometry_from_file('line_geometry_' + str(i), 'data/objects/cube.obj', 'data/materials/' + TRACE_MATERIAL + '.gmd', avango.gua.LoaderFlags.DEFAULTS)
+      _line = geometry_cache.create_geometry_from_file('line_geometry_' + str(i), 'data/objects/cube.obj', 'data/materials/' + TRACE_MATERIAL + '.gmd', avango.gua.LoaderFlags.DEFAULTS)
       _line.Transform.value = avango.gua.make_scale_mat(0, 0, 0)
       _line.ShadowMode.value = avango.gua.ShadowMode.OFF
-      scenegraphs[0]["/net"].distribute_object(_line)
       self.lines.append(_line)
 
     # append all line segments to the transform_node that groups the tracing lines of different platforms.
     self.transform_node.Children.value = self.lines
 
+    # append and distribute the whole trace subtree at once
+    node_distributor.attach(scenegraphs[0]["/net"], self.transform_node)
+
     ## @var crrnt_idx
     # The index of the current point in the list of lines.
     self.crrnt_idx = 0
@@ -0,0 +1,153 @@
+#!/usr/bin/python
+
+## @file
+# Contains class TransformBatch and its global instance transform_batch.
+
+# import avango-guacamole libraries
+import avango
+import avango.gua
+
+# import framework libraries
+from ConsoleIO import *
+from FrameScheduler import frame_scheduler
+
+## Collects world transformations for InteractiveObjects during a frame and writes them in one pass.
+# Setting a world transformation requires the inverse of the parent's world transformation. These inverses
+# are cached per parent object until the parent or one of its ancestors is moved, so objects sharing a parent
+# and objects dragged over several frames below a resting parent do not invert the same matrix again. Targets
+# set several times before the batch is written, e.g. by several users, are only written once.
+class TransformBatch:
+
+  ## Default constructor.
+  def __init__(self):
+
+    ## @var targets
+    # Dictionary mapping InteractiveObjects to the world transformations to be set.
+    self.targets = {}
+
+    ## @var parent_inverses
+    # Dictionary mapping InteractiveObjects to the inverses of their world transformations.
+    self.parent_inverses = {}
+
+    ## @var frame_task
+    # FrameTask executing flush while targets are pending. Registered with the first target.
+    self.frame_task = None
+
+    ## @var written_count
+    # Number of world transformations written.
+    self.written_count = 0
+
+    ## @var coalesced_count
+    # Number of world transformations replaced by another one for the same object before they were written.
+    self.coalesced_count = 0
+
+    ## @var inversion_count
+    # Number of parent inverses calculated.
+    self.inversion_count = 0
+
+    ## @var cached_inversion_count
+    # Number of parent inverses taken from the cache.
+    self.cached_inversion_count = 0
+
+  ## Sets the world transformation of an object with the next flush, at the latest in the next frame.
+  # @param OBJECT The InteractiveObject to be transformed.
+  # @param MATRIX The world transformation to be set.
+  def set_world_transform(self, OBJECT, MATRIX):
+
+    if self.frame_task == None:
+      # high priority, so drags are not deferred behind other tasks under a frame budget
+      self.frame_task = frame_scheduler.register("TransformBatch", self.flush, [], 900)
+
+    if OBJECT in self.targets:
+      self.coalesced_count += 1
+
+    self.targets[OBJECT] = MATRIX
+    self.frame_task.active = True
+
+  ## Writes all pending world transformations as local transformations, parents before their children.
+  def flush(self):
+
+    if self.frame_task != None:
+      self.frame_task.active = False
+
+    if len(self.targets) == 0:
+      return
+
+    _targets = self.targets
+    self.targets = {}
+
+    for _object in sorted(_targets, key = lambda _object: _object.hierarchy_level):
+
+      _parent_object = _object.get_parent_object()
+
+      if _parent_object == None: # scene root
+        _object.set_local_transform(_targets[_object])
+
+      else: # interactive object
+        _object.set_local_transform(self.get_parent_inverse(_parent_object, _targets) * _targets[_object])
+
+      self.written_count += 1
+
+  ## Returns the inverse world transformation of a parent object, from the cache if the parent did not move.
+  # @param PARENT_OBJECT The InteractiveObject whose inverse world transformation is requested.
+  # @param TARGETS Dictionary of the world transformations written in the current flush.
+  def get_parent_inverse(self, PARENT_OBJECT, TARGETS):
+
+    if PARENT_OBJECT in self.parent_inverses:
+      self.cached_inversion_count += 1
+      return self.parent_inverses[PARENT_OBJECT]
+
+    # a parent written in the current flush has its target as world transformation
+    if PARENT_OBJECT in TARGETS:
+      _inverse = avango.gua.make_inverse_mat(TARGETS[PARENT_OBJECT])
+    else:
+      _inverse = avango.gua.make_inverse_mat(PARENT_OBJECT.get_world_transform())
+
+    self.parent_inverses[PARENT_OBJECT] = _inverse
+    self.inversion_count += 1
+
+    return _inverse
+
+  ## Drops the cached inverses of an object and all objects below it, e.g. because it was moved.
+  # @param OBJECT The InteractiveObject which was moved.
+  def invalidate(self, OBJECT):
+
+    if len(self.parent_inverses) == 0:
+      return
+
+    for _object in OBJECT.SCENE.hierarchy.get_subtree(OBJECT):
+      self.parent_inverses.pop(_object, None)
+
+  ## Drops the pending world transformation and the cached inverse of an object, e.g. because it is destroyed.
+  # @param OBJECT The InteractiveObject to be removed.
+  def remove(self, OBJECT):
+
+    self.targets.pop(OBJECT, None)
+    self.parent_inverses.pop(OBJECT, None)
+
+  ## Drops all cached inverses, e.g. because a node above the interactive objects was moved.
+  def clear_cache(self):
+
+    self.parent_inverses = {}
+
+  ## Returns a dictionary with the numbers of written and coalesced transformations and calculated and cached inverses.
+  def get_statistics(self):
+
+    return {"written" : self.written_count
+          , "coalesced" : self.coalesced_count
+          , "inversions" : self.inversion_count
+          , "cached_inversions" : self.cached_inversion_count}
+
+  ## Prints the statistics on the console.
+  def print_statistics(self):
+
+    _statistics = self.get_statistics()
+    print_message("Transform batch: " + str(_statistics["written"]) + " world transformations written" + \
+                  ", " + str(_statistics["coalesced"]) + " coalesced" + \
+                  ", " + str(_statistics["inversions"]) + " parent inverses calculated" + \
+                  ", " + str(_statistics["cached_inversions"]) + " taken from the cache")
+
+
+## @var transform_batch
+# Global TransformBatch instance shared by all tools manipulating objects.
+transform_batch = TransformBatch()
@@ -15,6 +15,10 @@ from Intersection import *
 from TrackingReader import *
 from VisibilityHandler import *
 from ConsoleIO import *
+from GroupNameRegistry import group_name_registry
+from GeometryCache import geometry_cache
+from PLODBudgetController import plod_budget_controller
+from FrameScheduler import frame_scheduler
 import Utilities
 
 # import math libraries
@@ -80,6 +84,7 @@ class UserRepresentation:
     # Head node of the user.
     self.head = avango.gua.nodes.TransformNode(Name = HEAD_NODE_NAME)
     self.view_transform_node.Children.value.append(self.head)
+    plod_budget_controller.add_head_node(self.head)
 
     ## @var left_eye
     # Left eye node of the user.
@@ -110,16 +115,20 @@ class UserRepresentation:
     # If this is a portal user representation, ID giving the display index within the display group. -1 otherwise.
     self.virtual_user_repr_display_index = VIRTUAL_USER_REPR_DISPLAY_INDEX
 
-    ## @var frame_trigger
-    # Triggers framewise evaluation of frame_callback method.
-    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = True)
+    ## @var frame_task
+    # FrameTask evaluating the frame_callback method. Physical user representations only depend on the headtracking matrix,
+    # virtual ones on world transformations which are no watchable fields, so they are evaluated every frame.
+    if self.virtual_user_repr_display_index == -1:
+      self.frame_task = frame_scheduler.register("UserRepresentation", self.frame_callback, [self.USER.headtracking_reader.sf_abs_mat])
+    else:
+      self.frame_task = frame_scheduler.register("UserRepresentation", self.frame_callback)
 
     ## @var thumbnail_mode
     # Boolean indicating if the portal if a default viewing setup is activated although the portal might suggest it differently.
     self.thumbnail_mode = False
 
 
-  ## Evaluated every frame.
+  ## Evaluated whenever the headtracking matrix changed, every frame for virtual user representations.
   def frame_callback(self):
   
     if self.execute_transformation_policy:
@@ -218,6 +227,19 @@ class UserRepresentation:
     
     self.avatar.append_to_group_names(STRING)
 
+  ## Returns the group token other entities have to carry to be visible for this UserRepresentation.
+  def get_visibility_group_name(self):
+
+    if self.view_transform_node.Name.value == "scene_matrix":
+      return group_name_registry.get_token(self.view_transform_node.Parent.value.Name.value + "_" + self.head.Name.value)
+
+    return group_name_registry.get_token(self.view_transform_node.Name.value)
+
+  ## Returns the group token named after the view_transform_node.
+  def get_view_group_name(self):
+
+    return group_name_registry.get_token(self.view_transform_node.Name.value)
+
   ## Adds a screen visualization for a display instance to the avatar.
   # @param DISPLAY_INSTANCE The Display instance to retrieve the screen visualization from.
   def add_screen_visualization_for(self, DISPLAY_INSTANCE):
@@ -237,9 +259,7 @@ class UserRepresentation:
     self.view_transform_node.Children.value.append(_screen)
     self.screens.append(_screen)
 
-    _loader = avango.gua.nodes.TriMeshLoader()
-
-    _navigation_color_geometry = _loader.create_geometry_from_file('nav_color_plane',
+    _navigation_color_geometry = geometry_cache.create_geometry_from_file('nav_color_plane',
                                                                    'data/objects/plane.obj',
                                                                    'data/materials/' + self.DISPLAY_GROUP.navigations[0].trace_material + 'Shadeless.gmd',
                                                                     avango.gua.LoaderFlags.LOAD_MATERIALS)
@@ -250,7 +270,7 @@ class UserRepresentation:
                                                   avango.gua.make_rot_mat(90, 1, 0, 0) * \
                                                   avango.gua.make_scale_mat(_scale, _scale, _scale)
     _navigation_color_geometry.ShadowMode.value = avango.gua.ShadowMode.OFF
-    _navigation_color_geometry.GroupNames.value = ["w" + str(self.workspace_id) + "_dg" + str(self.DISPLAY_GROUP.id) + "_u" + str(self.USER.id)]
+    _navigation_color_geometry.GroupNames.value = [group_name_registry.get_user_token(self.workspace_id, self.DISPLAY_GROUP.id, self.USER.id)]
     _screen.Children.value.append(_navigation_color_geometry)
 
 
@@ -404,17 +424,20 @@ class User(VisibilityHandler2D):
                                           , self.headtracking_reader.sf_abs_mat
                                           , 5.0
                                           , "screen_proxy_group"
-                                          , False)
+                                          , False
+                                          , "User")
     self.mf_screen_pick_result.connect_from(self.intersection_tester.mf_pick_result)
 
     ## @var last_seen_display_group
     # DisplayGroup instance for which the user's viewing ray lastly hit a screen proxy geometry.
     self.last_seen_display_group = None
 
-    self.always_evaluate(True)
+    ## @var frame_task
+    # FrameTask evaluating the frame_callback method whenever the screen intersections or the head position changed.
+    self.frame_task = frame_scheduler.register("User activity", self.frame_callback, [self.mf_screen_pick_result, self.headtracking_reader.sf_abs_vec])
 
-  ## Evaluated every frame.
-  def evaluate(self):
+  ## Evaluated whenever the screen intersections or the head position changed.
+  def frame_callback(self):
 
     # evaluate viewing ray intersections with screen proxy geometries
     for _i in range(len(self.mf_screen_pick_result.value)):
@@ -443,7 +466,9 @@ class User(VisibilityHandler2D):
   # @param VISIBILITY_TABLE A matrix containing visibility rules according to the DisplayGroups' visibility tags. 
   def change_visiblity_table(self, VISIBILITY_TABLE):
 
-    self.visibility_table = VISIBILITY_TABLE
+    # an identical table compiles to the same matrix, so no GroupNames change
+    if self.set_visibility_table(VISIBILITY_TABLE) == False:
+      return
 
     for _display_group in self.WORKSPACE_INSTANCE.display_groups:
       self.handle_correct_visibility_groups_for(_display_group)
@@ -525,49 +550,52 @@ class User(VisibilityHandler2D):
       
       if _user_repr.DISPLAY_GROUP == DISPLAY_GROUP:
         _user_representations_at_display_group.append(_user_repr)
-        
-    # for all found user representations in the given display group
-    for _user_repr_at_display_group in _user_representations_at_display_group:
 
-      # display group instance belonging to DISPLAY_GROUP
-      _handled_display_group_instance = _user_repr_at_display_group.DISPLAY_GROUP
+    if len(_user_representations_at_display_group) == 0:
+      return
+
+    # when video avatars are enabled, do not make josephs visible
+    if ApplicationManager.current_avatar_mode != "JOSEPH":
+
+      for _user_repr_at_display_group in _user_representations_at_display_group:
+        # prevent wildcard from rendering the avatar
+        _user_repr_at_display_group.set_avatar_group_names(["do_not_display_group"])
+
+      return
+
+    ## determine which group names have to be added to the user representations ##
+
+    # all user representations in the handled display group
+    _all_user_reprs_at_display_group = []
 
-      _all_user_reprs_at_display_group = []
+    # group names of all user representations outside the handled display group for which the handled display group is visible
+    _visible_for_outside_display_group = []
 
-      for _user_repr in ApplicationManager.all_user_representations:
-        if _user_repr.DISPLAY_GROUP == _handled_display_group_instance:
-          _all_user_reprs_at_display_group.append(_user_repr)
+    # bitmask of all visibility tags for which the handled display group is visible
+    _viewer_mask = self.visibility_matrix.get_viewer_mask(DISPLAY_GROUP.visibility_tag)
+
+    # walk all user representations only once for all user representations at the display group
+    for _user_repr in ApplicationManager.all_user_representations:
+
+      if _user_repr.DISPLAY_GROUP == DISPLAY_GROUP:
+        _all_user_reprs_at_display_group.append(_user_repr)
+
+      # consider visibility table
+      elif (_viewer_mask & VisibilityMatrix.get_tag_bit(_user_repr.DISPLAY_GROUP.visibility_tag)) != 0:
+        _visible_for_outside_display_group.append(_user_repr.get_visibility_group_name())
+
+    # for all found user representations in the given display group
+    for _user_repr_at_display_group in _user_representations_at_display_group:
 
-      ## determine which group names have to be added to the user representations ##
       _user_visible_for = []
 
-      # when video avatars are enabled, do not make josephs visible
-      if ApplicationManager.current_avatar_mode == "JOSEPH":
-        
-        # append all names of user representations which are not on same navigation
-        for _user_repr in _all_user_reprs_at_display_group:
-
-          if _user_repr.connected_navigation_id != _user_repr_at_display_group.connected_navigation_id:
-            _user_visible_for.append(_user_repr.view_transform_node.Name.value)
-
-        # check for all user representations outside the handled display group
-        for _user_repr in ApplicationManager.all_user_representations:
-          if _user_repr.DISPLAY_GROUP != _handled_display_group_instance:
-
-            # consider visibility table
-            _handled_display_group_tag = _handled_display_group_instance.visibility_tag
-            _user_repr_display_group_tag = _user_repr.DISPLAY_GROUP.visibility_tag
-            
-            try:
-              _visible = self.visibility_table[_user_repr_display_group_tag][_handled_display_group_tag]
-            except:
-              _visible = False
-            
-            if _visible:
-              if _user_repr.view_transform_node.Name.value == "scene_matrix":
-                _user_visible_for.append(_user_repr.view_transform_node.Parent.value.Name.value + "_" + _user_repr.head.Name.value)
-              else:
-                _user_visible_for.append(_user_repr.view_transform_node.Name.value)
+      # append all names of user representations which are not on same navigation
+      for _user_repr in _all_user_reprs_at_display_group:
+
+        if _user_repr.connected_navigation_id != _user_repr_at_display_group.connected_navigation_id:
+          _user_visible_for.append(_user_repr.get_view_group_name())
+
+      _user_visible_for += _visible_for_outside_display_group
 
       # apply the obtained group names to the user representation
       if len(_user_visible_for) == 0:
@@ -577,5 +605,4 @@ class User(VisibilityHandler2D):
 
       else:
 
-        for _string in _user_visible_for:
-          _user_repr_at_display_group.set_avatar_group_names(_user_visible_for)
\ No newline at end of file
+        _user_repr_at_display_group.set_avatar_group_names(_user_visible_for)
@@ -10,6 +10,7 @@ import avango.gua
 # import framework libraries
 from ConsoleIO import *
 from VisibilityHandler import *
+from FrameScheduler import frame_scheduler
 from scene_config import scenegraphs
 
 ## Geometric representation of a Video3D object in a Navigation.
@@ -45,16 +46,15 @@ class Video3DRepresentation:
 
     PARENT_NODE.Children.value.append(self.video_node)
 
-    # init trigger callback
-    ## @var frame_trigger
-    # Triggers framewise evaluation of frame_callback method
-    self.frame_trigger = avango.script.nodes.Update(Callback = self.frame_callback, Active = True)
+    ## @var frame_task
+    # FrameTask evaluating the frame_callback method whenever the navigation matrix changed.
+    self.frame_task = frame_scheduler.register("Video3DRepresentation", self.frame_callback, [self.NAVIGATION_INSTANCE.sf_nav_mat])
 
   ## Sets a list of strings at the GroupNames field of the video node.
   # @param LIST_OF_STRINGS The list of group names to be set.
   def set_group_names(self, LIST_OF_STRINGS):
 
-    self.video_node.GroupNames.value = LIST_OF_STRINGS
+    apply_group_names([self.video_node], LIST_OF_STRINGS)
 
   ## Appends a string to the GroupNames field of the video node.
   # @param STRING The string to be appended.
@@ -62,7 +62,7 @@ class Video3DRepresentation:
 
     self.video_node.GroupNames.value.append(STRING)
 
-  ## Callback: evaluated every frame
+  ## Callback: evaluated whenever the navigation matrix changed
   def frame_callback(self):
 
     self.video_node.Transform.value = self.NAVIGATION_INSTANCE.sf_nav_mat.value * \
@@ -112,7 +112,9 @@ class Video3D(VisibilityHandler2D):
   # @param VISIBILITY_TABLE A matrix containing visibility rules according to the DisplayGroups' visibility tags. 
   def change_visiblity_table(self, VISIBILITY_TABLE):
 
-    self.visibility_table = VISIBILITY_TABLE
+    # an identical table compiles to the same matrix, so no GroupNames change
+    if self.set_visibility_table(VISIBILITY_TABLE) == False:
+      return
 
     for _display_group in self.WORKSPACE_INSTANCE.display_groups:
       for _navigation in _display_group.navigations:
@@ -156,30 +158,20 @@ class Video3D(VisibilityHandler2D):
     # if the navigation is not used, hide the video representation, also when avatar mode is not set to video
     if len(NAVIGATION_INSTANCE.active_user_representations) > 0 and ApplicationManager.current_avatar_mode == "VIDEO":
 
+      # bitmask of all visibility tags for which the navigation's display group is visible
+      _viewer_mask = self.visibility_matrix.get_viewer_mask(_nav_display_group.visibility_tag)
+
+      # if tags are identical, show video due to different navigations (see below)
+      _viewer_mask |= VisibilityMatrix.get_tag_bit(_nav_display_group.visibility_tag)
+
       # loop over all user representations to find the ones for which the video is visible
       for _user_repr in ApplicationManager.all_user_representations:
 
         # video is only visible for users not on the corresponding navigation to avoid physical overlap
         if _user_repr.DISPLAY_GROUP.navigations[_user_repr.connected_navigation_id] != NAVIGATION_INSTANCE:
 
-          _nav_display_group_tag = _nav_display_group.visibility_tag
-          _user_repr_display_group_tag = _user_repr.DISPLAY_GROUP.visibility_tag
-
-          # if tags are identical, show video due to different navigations (see above)
-          if _nav_display_group_tag == _user_repr_display_group_tag:
-            _visible = True
-          else:
-            try:
-              _visible = self.visibility_table[_user_repr_display_group_tag][_nav_display_group_tag]
-            except:
-              _visible = False
-
-
-          if _visible:
-            if _user_repr.view_transform_node.Name.value == "scene_matrix":
-              _video_visible_for.append(_user_repr.view_transform_node.Parent.value.Name.value + "_" + _user_repr.head.Name.value)
-            else:
-              _video_visible_for.append(_user_repr.view_transform_node.Name.value)
+          if (_viewer_mask & VisibilityMatrix.get_tag_bit(_user_repr.DISPLAY_GROUP.visibility_tag)) != 0:
+            _video_visible_for.append(_user_repr.get_visibility_group_name())
 
 
     # apply the obtained group names to the video representation
@@ -190,5 +182,4 @@ class Video3D(VisibilityHandler2D):
 
     else:
 
-      for _string in _video_visible_for:
-        _video_representation_at_navigation.set_group_names(_video_visible_for)
\ No newline at end of file
+      _video_representation_at_navigation.set_group_names(_video_visible_for)
\ No newline at end of file
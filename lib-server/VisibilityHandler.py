@@ -1,13 +1,121 @@
 #!/usr/bin/python
 
 ## @file
-# Contains interfaces VisibilityHandler1D and VisibilityHandler2D.
+# Contains class VisibilityMatrix, interfaces VisibilityHandler1D and VisibilityHandler2D
+# and function apply_group_names.
 
 # import avango-guacamole libraries
 import avango
 import avango.gua
 import avango.script
 
+## Compiled form of a visibility list or table.
+# Every visibility tag is mapped to a bit index once. A visibility list becomes a single bitmask
+# and a visibility table becomes one bitmask of visible tags per viewing tag, so lookups and
+# comparisons of whole tables are integer operations instead of nested dictionary accesses.
+class VisibilityMatrix:
+
+  ## @var tag_indices
+  # Dictionary mapping every visibility tag seen so far to its bit index. Shared by all matrices.
+  tag_indices = {}
+
+  ## Returns the bit of a visibility tag, registering the tag if it is new.
+  # @param TAG The visibility tag to get the bit for.
+  @staticmethod
+  def get_tag_bit(TAG):
+
+    if TAG not in VisibilityMatrix.tag_indices:
+      VisibilityMatrix.tag_indices[TAG] = len(VisibilityMatrix.tag_indices)
+
+    return 1 << VisibilityMatrix.tag_indices[TAG]
+
+  ## Returns the bitmask of all tags set to True in a visibility list.
+  # @param VISIBILITY_LIST A dictionary mapping visibility tags to booleans.
+  @staticmethod
+  def compile_list(VISIBILITY_LIST):
+
+    _mask = 0
+
+    for _tag, _visible in VISIBILITY_LIST.items():
+      if _visible:
+        _mask |= VisibilityMatrix.get_tag_bit(_tag)
+
+    return _mask
+
+  ## Custom constructor.
+  # @param VISIBILITY_TABLE A matrix containing visibility rules according to the DisplayGroups' visibility tags.
+  def __init__(self, VISIBILITY_TABLE):
+
+    ## @var rows
+    # Dictionary mapping the bit of a viewing tag to the bitmask of tags visible for it. Empty rows are omitted.
+    self.rows = {}
+
+    ## @var columns
+    # Dictionary mapping the bit of a visible tag to the bitmask of viewing tags it is visible for. Empty columns are omitted.
+    self.columns = {}
+
+    for _viewer_tag, _visibility_list in VISIBILITY_TABLE.items():
+
+      _viewer_bit = VisibilityMatrix.get_tag_bit(_viewer_tag)
+      _mask = VisibilityMatrix.compile_list(_visibility_list)
+
+      if _mask == 0:
+        continue
+
+      self.rows[_viewer_bit] = _mask
+
+      _remaining_mask = _mask
+
+      while _remaining_mask != 0:
+        _target_bit = _remaining_mask & -_remaining_mask
+        self.columns[_target_bit] = self.columns.get(_target_bit, 0) | _viewer_bit
+        _remaining_mask ^= _target_bit
+
+  ## Returns a boolean saying if entities in a display group tagged TARGET_TAG are visible for users in a display group tagged VIEWER_TAG.
+  # Tags missing in the table are treated as invisible.
+  # @param VIEWER_TAG Visibility tag of the viewing display group.
+  # @param TARGET_TAG Visibility tag of the display group the entity is in.
+  def is_visible(self, VIEWER_TAG, TARGET_TAG):
+
+    return (self.rows.get(VisibilityMatrix.get_tag_bit(VIEWER_TAG), 0) & VisibilityMatrix.get_tag_bit(TARGET_TAG)) != 0
+
+  ## Returns the bitmask of all viewing tags for which entities in a display group tagged TARGET_TAG are visible.
+  # @param TARGET_TAG Visibility tag of the display group the entity is in.
+  def get_viewer_mask(self, TARGET_TAG):
+
+    return self.columns.get(VisibilityMatrix.get_tag_bit(TARGET_TAG), 0)
+
+  ## Returns a boolean saying if two matrices contain the same visibility rules.
+  # @param OTHER The VisibilityMatrix to compare with.
+  def __eq__(self, OTHER):
+
+    return isinstance(OTHER, VisibilityMatrix) and self.rows == OTHER.rows
+
+  ## Returns a boolean saying if two matrices contain different visibility rules.
+  # @param OTHER The VisibilityMatrix to compare with.
+  def __ne__(self, OTHER):
+
+    return not self.__eq__(OTHER)
+
+
+## Sets the GroupNames field of several nodes to a list of strings.
+# Only the fields whose content differs are written, so unchanged nodes are not marked dirty
+# and not distributed again. Returns the number of fields written.
+# @param NODES List of scenegraph nodes to set the GroupNames field for.
+# @param LIST_OF_STRINGS The list of group names to be set.
+def apply_group_names(NODES, LIST_OF_STRINGS):
+
+  _edit_count = 0
+
+  for _node in NODES:
+
+    if list(_node.GroupNames.value) != LIST_OF_STRINGS:
+      _node.GroupNames.value = list(LIST_OF_STRINGS)
+      _edit_count += 1
+
+  return _edit_count
+
+
 ## Function interface to be implemented by all entities
 # whose visibilities should be regulated in different display groups.
 class VisibilityHandler1D(avango.script.Script):
@@ -20,6 +128,16 @@ class VisibilityHandler1D(avango.script.Script):
     # A list containing visibility rules according to the DisplayGroups' visibility tags. 
     self.visibility_list = VISIBILITY_LIST
 
+    ## @var visibility_mask
+    # Bitmask of all visibility tags set to True in visibility_list.
+    self.visibility_mask = VisibilityMatrix.compile_list(VISIBILITY_LIST)
+
+  ## Returns a boolean saying if this entity is visible for users in a display group tagged TAG.
+  # @param TAG Visibility tag of the viewing display group.
+  def is_visible_for(self, TAG):
+
+    return (self.visibility_mask & VisibilityMatrix.get_tag_bit(TAG)) != 0
+
   ## Triggers the correct GroupNames for the different DisplayGroups.
   def handle_correct_visibility_groups(self):
 
@@ -37,8 +155,25 @@ class VisibilityHandler2D(avango.script.Script):
     # A matrix containing visibility rules according to the DisplayGroups' visibility tags.
     self.visibility_table = VISIBILITY_TABLE
 
+    ## @var visibility_matrix
+    # VisibilityMatrix compiled from visibility_table.
+    self.visibility_matrix = VisibilityMatrix(VISIBILITY_TABLE)
+
+  ## Replaces the visibility table and compiles it.
+  # Returns a boolean saying if the new table contains different visibility rules.
+  # @param VISIBILITY_TABLE A matrix containing visibility rules according to the DisplayGroups' visibility tags.
+  def set_visibility_table(self, VISIBILITY_TABLE):
+
+    _visibility_matrix = VisibilityMatrix(VISIBILITY_TABLE)
+    _changed = _visibility_matrix != self.visibility_matrix
+
+    self.visibility_table = VISIBILITY_TABLE
+    self.visibility_matrix = _visibility_matrix
+
+    return _changed
+
   ## Triggers the correct GroupNames of all instances at a display group.
   # @param DISPLAY_GROUP The display group to set new GroupNames for.
   def handle_correct_visibility_groups_for(self, DISPLAY_GROUP):
 
-    raise NotImplementedError( "To be implemented by a subclass." )
\ No newline at end of file
+    raise NotImplementedError( "To be implemented by a subclass." )
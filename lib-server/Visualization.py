@@ -1,7 +1,7 @@
 #!/usr/bin/python
 
 ## @file
-# Contains class BoundingBoxVisualization.
+# Contains class BoundingBoxVisualization and function calc_bounding_boxes.
 
 # import guacamole libraries
 import avango
@@ -9,21 +9,57 @@ import avango.gua
 import avango.script
 from avango.script import field_has_changed
 
+# import framework libraries
+from GeometryCache import geometry_cache
+from NodeDistributor import node_distributor
+from FrameScheduler import frame_scheduler
+
 # import python libraries
 import time
 
 ## Initializes a bounding box visualization of an object in the scene.
+# The visualization is a box node with twelve edge nodes which is only created when the object is highlighted
+# for the first time. It is removed again when the object has not been highlighted for release_timeout seconds.
+# The box node follows the object's world transformation; the edges keep a thickness of edge_thickness meters
+# regardless of the size of the box and the scale of the object. A single wireframe mesh node cannot do this,
+# since one transformation scales the thickness of its edges with the box axes, and the renderer offers no line
+# primitives. The twelve edge nodes only exist while the object is highlighted or within release_timeout after.
 class BoundingBoxVisualization(avango.script.Script):
 
   # internal fields
   ## @var sf_node_mat
-  # Matrix to represent the WorldTransform of the object to be handled.
+  # Matrix to represent the WorldTransform of the object to be handled. Only connected while the box node exists.
   sf_node_mat = avango.gua.SFMatrix4()
 
   ## @var sf_enable_flag
   # Boolean field indicating if this bounding box visualization is activated.
   sf_enable_flag = avango.SFBool()
 
+  ## @var release_timeout
+  # Time in seconds after which the box node of a visualization that is not shown anymore is removed.
+  release_timeout = 10.0
+
+  ## @var edge_thickness
+  # Thickness of the bounding box edges in meters.
+  edge_thickness = 0.01
+
+  ## @var waiting_visualizations
+  # Static list of the visualizations whose hidden box nodes wait to be released, in the order they were hidden.
+  waiting_visualizations = []
+
+  ## @var release_task
+  # Static FrameTask releasing the box nodes of the waiting visualizations. Registered with the first hidden box node.
+  release_task = None
+
+  ## @var shown_dirty_visualizations
+  # Static set of the shown visualizations whose bounding boxes were invalidated, e.g. because an object below was dragged.
+  shown_dirty_visualizations = set()
+
+  ## @var recalc_task
+  # Static FrameTask calculating the bounding boxes of the shown dirty visualizations once per frame.
+  # Registered with the first invalidated shown visualization.
+  recalc_task = None
+
   ## Default constructor.
   def __init__(self):
     self.super(BoundingBoxVisualization).__init__()
@@ -44,241 +80,289 @@ class BoundingBoxVisualization(avango.script.Script):
     # Reference to the scenegraph in which the handled object is located.
     self.SCENEGRAPH = SCENEGRAPH
 
-    ## @var bb_thickness
-    # Thickness of the bounding box lines in meters.
-    self.bb_thickness	= 0.01
+    ## @var NET_TRANS_NODE
+    # Active nettrans node the box node is appended to.
+    self.NET_TRANS_NODE = NET_TRANS_NODE
 
     # variables
-    ## @var lf_node_mat
-    # Last frame matrix of the handled object to detect changes.
-    self.lf_node_mat = avango.gua.make_identity_mat()
+    ## @var material
+    # Material string to be used for the visualization.
+    self.material = MATERIAL
 
     ## @var bb
-    # The bounding box to be visualized.
+    # The bounding box to be visualized in world coordinates at the time it was calculated or None if it was never calculated.
     self.bb = None
 
-    # init nodes    
-    _loader = avango.gua.nodes.TriMeshLoader()
-            
-    ## @var edge_group
-    # Scenegraph transformation node to group all the bounding box edges.
-    self.edge_group = avango.gua.nodes.TransformNode()
-    NET_TRANS_NODE.Children.value.append(self.edge_group)
-    
-    ## @var edge1
-    # Geometry node representing the first edge of the visualized bounding box.
-    self.edge1 = _loader.create_geometry_from_file("edge1", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge1.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge1)
-
-    ## @var edge2
-    # Geometry node representing the second edge of the visualized bounding box.
-    self.edge2 = _loader.create_geometry_from_file("edge2", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge2.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge2)
-
-    ## @var edge3
-    # Geometry node representing the third edge of the visualized bounding box.
-    self.edge3 = _loader.create_geometry_from_file("edge3", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge3.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge3)
-
-    ## @var edge4
-    # Geometry node representing the fourth edge of the visualized bounding box.
-    self.edge4 = _loader.create_geometry_from_file("edge4", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge4.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge4)
-
-    ## @var edge5
-    # Geometry node representing the fifth edge of the visualized bounding box.
-    self.edge5 = _loader.create_geometry_from_file("edge5", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge5.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge5)
-
-    ## @var edge6
-    # Geometry node representing the sixth edge of the visualized bounding box.
-    self.edge6 = _loader.create_geometry_from_file("edge6", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge6.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge6)
- 
-    ## @var edge7
-    # Geometry node representing the seventh edge of the visualized bounding box.
-    self.edge7 = _loader.create_geometry_from_file("edge7", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge7.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge7)
-
-    ## @var edge8
-    # Geometry node representing the eighth edge of the visualized bounding box.
-    self.edge8 = _loader.create_geometry_from_file("edge8", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge8.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge8)
-
-    ## @var edge9
-    # Geometry node representing the nineth edge of the visualized bounding box.
-    self.edge9 = _loader.create_geometry_from_file("edge9", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge9.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge9)
-
-    ## @var edge10
-    # Geometry node representing the tenth edge of the visualized bounding box.
-    self.edge10 = _loader.create_geometry_from_file("edge10", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge10.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge10)
-
-    ## @var edge11
-    # Geometry node representing the eleventh edge of the visualized bounding box.
-    self.edge11 = _loader.create_geometry_from_file("edge11", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge11.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge11)
-
-    ## @var edge12
-    # Geometry node representing the twelveth edge of the visualized bounding box.
-    self.edge12 = _loader.create_geometry_from_file("edge12", "data/objects/cube.obj", MATERIAL, avango.gua.LoaderFlags.DEFAULTS)
-    self.edge12.ShadowMode.value = avango.gua.ShadowMode.OFF
-    self.edge_group.Children.value.append(self.edge12)
-    
+    ## @var bb_mat
+    # Transformation of the unit cube into the bounding box in the object's coordinate system.
+    self.bb_mat = avango.gua.make_identity_mat()
+
+    ## @var bb_dirty
+    # Boolean saying if the bounding box has to be calculated again because the object's subtree changed.
+    self.bb_dirty = True
+
+    ## @var box_node
+    # Transformation node grouping the edge nodes or None if the visualization is not created.
+    self.box_node = None
+
+    ## @var edge_nodes
+    # List of the twelve geometry nodes representing the edges of the box.
+    self.edge_nodes = []
+
+    ## @var edge_scale
+    # Scale of the object's world transformation the edges were last fitted to.
+    self.edge_scale = None
+
+    ## @var hide_timestamp
+    # Point in time when the visualization was hidden the last time.
+    self.hide_timestamp = 0.0
+
     # init field connection
-    self.sf_node_mat.connect_from(OBJECT.get_node().WorldTransform)
     self.sf_enable_flag.connect_from(OBJECT.sf_highlight_flag)
-  
-    self.edge_group.Transform.connect_from(self.sf_node_mat)
-  
-  
+
 
   # callbacks
   ## Called whenever sf_enable_flag changes.
   @field_has_changed(sf_enable_flag)
   def sf_enable_flag_changed(self):
-    
+
     if self.sf_enable_flag.value == True: # set geometry visible
-      self.edge1.GroupNames.value = []
-      self.edge2.GroupNames.value = []      
-      self.edge3.GroupNames.value = []
-      self.edge4.GroupNames.value = []
-      self.edge5.GroupNames.value = []
-      self.edge6.GroupNames.value = []
-      self.edge7.GroupNames.value = []
-      self.edge8.GroupNames.value = []
-      self.edge9.GroupNames.value = []
-      self.edge10.GroupNames.value = []
-      self.edge11.GroupNames.value = []
-      self.edge12.GroupNames.value = []
-
-    else: # set geometry invisible
-      self.edge1.GroupNames.value = ["do_not_display_group"]
-      self.edge2.GroupNames.value = ["do_not_display_group"]
-      self.edge3.GroupNames.value = ["do_not_display_group"]
-      self.edge4.GroupNames.value = ["do_not_display_group"]
-      self.edge5.GroupNames.value = ["do_not_display_group"]
-      self.edge6.GroupNames.value = ["do_not_display_group"]
-      self.edge7.GroupNames.value = ["do_not_display_group"]  
-      self.edge8.GroupNames.value = ["do_not_display_group"]
-      self.edge9.GroupNames.value = ["do_not_display_group"]
-      self.edge10.GroupNames.value = ["do_not_display_group"]
-      self.edge11.GroupNames.value = ["do_not_display_group"]
-      self.edge12.GroupNames.value = ["do_not_display_group"]
-  
-  
+
+      if self in BoundingBoxVisualization.waiting_visualizations:
+        BoundingBoxVisualization.waiting_visualizations.remove(self)
+
+      if self.box_node == None:
+        self.create_box_node()
+      elif self.bb_dirty == True:
+        calc_bounding_boxes([self])
+
+      self.box_node.GroupNames.value = []
+
+    elif self.box_node != None: # set geometry invisible
+      self.box_node.GroupNames.value = ["do_not_display_group"]
+
+      self.hide_timestamp = time.time()
+      BoundingBoxVisualization.waiting_visualizations.append(self)
+
+      if BoundingBoxVisualization.release_task == None:
+        BoundingBoxVisualization.release_task = frame_scheduler.register("BoundingBoxVisualization release", BoundingBoxVisualization.release_callback)
+
+      BoundingBoxVisualization.release_task.active = True
+
+
   ## Called whenever sf_node_mat changes.
   @field_has_changed(sf_node_mat)
   def sf_node_mat_changed(self):
 
-    #print "object moved"
-    _lf_scale = self.lf_node_mat.get_scale()
-    _scale = self.sf_node_mat.value.get_scale()
+    self.update_bb_scale()
+
+  ## Evaluated once per frame while shown visualizations were invalidated. Calculates their bounding boxes in one pass.
+  # Runs with a low priority, so transformations written by other tasks in the same frame are included.
+  @staticmethod
+  def recalc_callback():
+
+    BoundingBoxVisualization.recalc_task.active = False
+
+    _visualizations = BoundingBoxVisualization.shown_dirty_visualizations
+    BoundingBoxVisualization.shown_dirty_visualizations = set()
+
+    # the scenegraph cache is updated once per scenegraph
+    _groups = {}
+
+    for _visualization in _visualizations:
+      _groups.setdefault(id(_visualization.SCENEGRAPH), []).append(_visualization)
+
+    for _group in _groups.values():
+      calc_bounding_boxes(_group)
+
+  ## Evaluated every frame while hidden box nodes exist. Releases the box nodes hidden longer than release_timeout.
+  @staticmethod
+  def release_callback():
 
-    #if _lf_scale != _scale: # scale has changed
-    #  self.update_bb_scale()
-      
-    self.lf_node_mat = self.sf_node_mat.value
+    _waiting_visualizations = BoundingBoxVisualization.waiting_visualizations
+    _now = time.time()
+
+    # ordered by hide time, so the first box node not yet expired ends the search
+    while len(_waiting_visualizations) > 0 and _now - _waiting_visualizations[0].hide_timestamp > BoundingBoxVisualization.release_timeout:
+      _waiting_visualizations[0].release_box_node()
+
+    if len(_waiting_visualizations) == 0:
+      BoundingBoxVisualization.release_task.active = False
 
 
   # functions
+  ## Creates the box node and its edge nodes, appends it to the nettrans node and distributes it.
+  def create_box_node(self):
+
+    self.box_node = avango.gua.nodes.TransformNode(Name = "bounding_box_" + str(id(self)))
+    self.edge_nodes = []
+    self.edge_scale = None
+
+    for _i in range(12):
+      _edge = geometry_cache.create_geometry_from_file("edge" + str(_i + 1)
+                                                      , "data/objects/cube.obj"
+                                                      , self.material
+                                                      , avango.gua.LoaderFlags.DEFAULTS)
+      _edge.ShadowMode.value = avango.gua.ShadowMode.OFF
+      self.box_node.Children.value.append(_edge)
+      self.edge_nodes.append(_edge)
+
+    node_distributor.attach(self.NET_TRANS_NODE, self.box_node)
+
+    self.sf_node_mat.connect_from(self.OBJECT.get_node().WorldTransform)
+
+    if self.bb_dirty == True:
+      calc_bounding_boxes([self])
+    else:
+      self.update_bb_scale()
+
+  ## Disconnects the box node and removes it from the scenegraph, so it can be freed.
+  def release_box_node(self):
+
+    if self in BoundingBoxVisualization.waiting_visualizations:
+      BoundingBoxVisualization.waiting_visualizations.remove(self)
+
+    BoundingBoxVisualization.shown_dirty_visualizations.discard(self)
+
+    if self.box_node == None:
+      return
+
+    self.sf_node_mat.disconnect()
+
+    node_distributor.forget_subtree(self.box_node)
+
+    if self.box_node in self.NET_TRANS_NODE.Children.value:
+      self.NET_TRANS_NODE.Children.value.remove(self.box_node)
+
+    self.box_node = None
+    self.edge_nodes = []
+
+  ## Disconnects this visualization from its object and removes its nodes from the scenegraph.
+  def destroy(self):
+
+    self.release_box_node()
+    self.sf_enable_flag.disconnect()
+
   ## Changes the material of the visualized bounding box.
   # @param MATERIAL The material string to be set and used.
   def set_material(self, MATERIAL):
 
-    self.edge1.Material.value = MATERIAL
-    self.edge2.Material.value = MATERIAL
-    self.edge3.Material.value = MATERIAL
-    self.edge4.Material.value = MATERIAL
-    self.edge5.Material.value = MATERIAL
-    self.edge6.Material.value = MATERIAL
-    self.edge7.Material.value = MATERIAL
-    self.edge8.Material.value = MATERIAL
-    self.edge9.Material.value = MATERIAL
-    self.edge10.Material.value = MATERIAL
-    self.edge11.Material.value = MATERIAL
-    self.edge12.Material.value = MATERIAL
-      
+    self.material = MATERIAL
+
+    for _edge in self.edge_nodes:
+      _edge.Material.value = MATERIAL
+
+  ## Marks the bounding box to be calculated again, e.g. because an object below this one moved.
+  # A shown bounding box is calculated again in the current or next frame, hidden ones when they are shown.
+  def invalidate_bb(self):
+
+    self.bb_dirty = True
+
+    if self.box_node == None or self.sf_enable_flag.value == False:
+      return
+
+    BoundingBoxVisualization.shown_dirty_visualizations.add(self)
+
+    if BoundingBoxVisualization.recalc_task == None:
+      BoundingBoxVisualization.recalc_task = frame_scheduler.register("BoundingBoxVisualization recalc", BoundingBoxVisualization.recalc_callback, [], -100)
+
+    BoundingBoxVisualization.recalc_task.active = True
+
+  ## Returns a boolean saying if the bounding box has to be calculated, i.e. if it is dirty and visualized.
+  def needs_calc_bb(self):
+
+    return self.bb_dirty == True and self.box_node != None
+
   ## Calculates the bounding box of the current object.
+  # The scenegraph cache must be up to date, see calc_bounding_boxes.
   def calc_bb(self):
 
-    self.SCENEGRAPH.update_cache()
-  
     _node = self.OBJECT.get_node()
 
     self.bb = _node.BoundingBox.value
+    self.bb_dirty = False
     #print _node.Name.value, len(_node.Children.value), self.bb.Min.value, self.bb.Max.value
 
+    _node_mat = _node.WorldTransform.value
+    _bb_min = avango.gua.make_inverse_mat(_node_mat) * self.bb.Min.value
+    _bb_max = avango.gua.make_inverse_mat(_node_mat) * self.bb.Max.value
+
+    _center = avango.gua.Vec3((_bb_min.x + _bb_max.x) * 0.5, (_bb_min.y + _bb_max.y) * 0.5, (_bb_min.z + _bb_max.z) * 0.5)
+
+    self.bb_mat = avango.gua.make_trans_mat(_center) * \
+                  avango.gua.make_scale_mat(_bb_max.x - _bb_min.x, _bb_max.y - _bb_min.y, _bb_max.z - _bb_min.z)
+
+    self.edge_scale = None
     self.update_bb_scale()
 
-  ## Computes and sets the correct transformations for the edges of the visualized bounding box.
+  ## Sets the transformation of the box node to the object's world transformation and fits the edges
+  # to the visualized bounding box if it or the scale of the object changed.
   def update_bb_scale(self):
-    
-    if self.bb != None:
 
-      _bb_min = avango.gua.make_inverse_mat(self.sf_node_mat.value) * self.bb.Min.value
-      _bb_max = avango.gua.make_inverse_mat(self.sf_node_mat.value) * self.bb.Max.value
+    if self.box_node == None:
+      return
 
-      _x_min	= _bb_min.x    
-      _x_max	= _bb_max.x
-      _dist_x	= _x_max - _x_min
-      _center_x	= _x_min + _dist_x * 0.5
+    self.box_node.Transform.value = self.sf_node_mat.value
+
+    _scale = self.sf_node_mat.value.get_scale()
 
-      _y_min	= _bb_min.y
-      _y_max	= _bb_max.y
-      _dist_y	= _y_max - _y_min
-      _center_y	= _y_min + _dist_y * 0.5
+    if self.edge_scale != None and \
+       self.edge_scale.x == _scale.x and self.edge_scale.y == _scale.y and self.edge_scale.z == _scale.z:
+      return
 
-      _z_min	= _bb_min.z
-      _z_max	= _bb_max.z
-      _dist_z	= _z_max - _z_min
-      _center_z	= _z_min + _dist_z * 0.5
+    self.edge_scale = _scale
 
+    _center = self.bb_mat.get_translate()
+    _size = self.bb_mat.get_scale()
 
-      _world_mat = self.OBJECT.get_world_transform()
-      _scale = _world_mat.get_scale()
+    _center = [_center.x, _center.y, _center.z]
+    _size = [_size.x, _size.y, _size.z]
 
-      # depth edges
-      _scale_mat = avango.gua.make_scale_mat(self.bb_thickness/_scale.x, _dist_y + self.bb_thickness/_scale.y, self.bb_thickness/_scale.z)
+    # edge thickness in the object's coordinate system, compensating the object's scale
+    _thickness = [BoundingBoxVisualization.edge_thickness / _scale.x
+                , BoundingBoxVisualization.edge_thickness / _scale.y
+                , BoundingBoxVisualization.edge_thickness / _scale.z]
 
-      self.edge1.Transform.value = avango.gua.make_trans_mat(_x_min, _center_y, _z_min) * _scale_mat
+    _i = 0
 
-      self.edge2.Transform.value = avango.gua.make_trans_mat(_x_max, _center_y, _z_min) * _scale_mat
+    # four edges along each axis, at the minimum and maximum of the two other axes
+    for _axis in range(3):
+      _u = (_axis + 1) % 3
+      _v = (_axis + 2) % 3
 
-      self.edge3.Transform.value = avango.gua.make_trans_mat(_x_min, _center_y, _z_max) * _scale_mat
+      for _u_sign in [-0.5, 0.5]:
+        for _v_sign in [-0.5, 0.5]:
 
-      self.edge4.Transform.value = avango.gua.make_trans_mat(_x_max, _center_y, _z_max) * _scale_mat
+          _position = list(_center)
+          _position[_u] += _u_sign * _size[_u]
+          _position[_v] += _v_sign * _size[_v]
 
-      # width edges
-      _scale_mat = avango.gua.make_scale_mat(_dist_x + self.bb_thickness/_scale.x, self.bb_thickness/_scale.y, self.bb_thickness/_scale.z)
+          _edge_size = list(_thickness)
+          _edge_size[_axis] = _size[_axis] + _thickness[_axis]
 
-      self.edge5.Transform.value = avango.gua.make_trans_mat(_center_x, _y_min, _z_min) * _scale_mat
+          self.edge_nodes[_i].Transform.value = avango.gua.make_trans_mat(_position[0], _position[1], _position[2]) * \
+                                                avango.gua.make_scale_mat(_edge_size[0], _edge_size[1], _edge_size[2])
+          _i += 1
 
-      self.edge6.Transform.value = avango.gua.make_trans_mat(_center_x, _y_max, _z_min) * _scale_mat
 
-      self.edge7.Transform.value = avango.gua.make_trans_mat(_center_x, _y_min, _z_max) * _scale_mat
-      
-      self.edge8.Transform.value = avango.gua.make_trans_mat(_center_x, _y_max, _z_max) * _scale_mat
+## Calculates the bounding boxes of several visualizations in one pass.
+# The scenegraph cache is updated only once and only if any of the visualizations is dirty and shown,
+# instead of once per object. Returns the number of bounding boxes calculated.
+# @param VISUALIZATIONS List of BoundingBoxVisualization instances to be considered.
+# @param INCLUDE_HIDDEN Boolean saying if dirty visualizations are calculated even if they are not shown, e.g. because they are about to be.
+def calc_bounding_boxes(VISUALIZATIONS, INCLUDE_HIDDEN = False):
 
-      # height edges
-      _scale_mat = avango.gua.make_scale_mat(self.bb_thickness/_scale.x, self.bb_thickness/_scale.y, _dist_z + self.bb_thickness/_scale.z)
+  if INCLUDE_HIDDEN == True:
+    _dirty_visualizations = [_visualization for _visualization in VISUALIZATIONS if _visualization.bb_dirty == True]
+  else:
+    _dirty_visualizations = [_visualization for _visualization in VISUALIZATIONS if _visualization.needs_calc_bb()]
 
-      self.edge9.Transform.value = avango.gua.make_trans_mat(_x_min, _y_min, _center_z) * _scale_mat
+  if len(_dirty_visualizations) == 0:
+    return 0
 
-      self.edge10.Transform.value = avango.gua.make_trans_mat(_x_min, _y_max, _center_z) * _scale_mat
+  _dirty_visualizations[0].SCENEGRAPH.update_cache()
 
-      self.edge11.Transform.value = avango.gua.make_trans_mat(_x_max, _y_min, _center_z) * _scale_mat
+  for _visualization in _dirty_visualizations:
+    _visualization.calc_bb()
 
-      self.edge12.Transform.value = avango.gua.make_trans_mat(_x_max, _y_max, _center_z) * _scale_mat
+  return len(_dirty_visualizations)
@@ -13,6 +13,13 @@ from ApplicationManager import *
 from Portal import *
 from PortalCamera import *
 from Device import *
+from StartupProfiler import startup_profiler
+import MaterialPreloader
+from NodeDistributor import node_distributor
+from GroupNameRegistry import group_name_registry
+from GeometryCache import geometry_cache
+from PLODBudgetController import plod_budget_controller
+from AssetLoader import asset_loader
 
 from scene_config import scenegraphs
 
@@ -40,28 +47,34 @@ def start():
   else:
     start_clients = False
 
+  # profile startup phases if requested
+  startup_profiler.enable_from_environment(scenegraphs[0].Root.value)
+
   # preload materials and shading models
-  avango.gua.load_shading_models_from("data/materials")
-  avango.gua.load_materials_from("data/materials")
+  with startup_profiler.phase("preload_materials"):
+    MaterialPreloader.preload_materials(workspace_config)
 
   # initialize application manager
-  application_manager = ApplicationManager()
-  application_manager.my_constructor(WORKSPACE_CONFIG = workspace_config, START_CLIENTS = start_clients)
+  with startup_profiler.phase("ApplicationManager"):
+    application_manager = ApplicationManager()
+    application_manager.my_constructor(WORKSPACE_CONFIG = workspace_config, START_CLIENTS = start_clients)
 
   # initialize scene
-  scene_manager = SceneManager()
+  with startup_profiler.phase("SceneManager"):
+    scene_manager = SceneManager()
 
   # initialize touch devices
   multi_touch_device = None
 
-  for _workspace in application_manager.workspaces:
-    for _display_group in _workspace.display_groups:
-      for _display in _display_group.displays:
-        if "TUIO" in _display.get_touch_protocols():
-          if None == multi_touch_device:
-            device = TUIODevice()
-            device.my_constructor(scenegraphs[0], _display, scenegraphs[0]["/net"], scene_manager, application_manager)
-            multi_touch_device = device
+  with startup_profiler.phase("TUIO setup"):
+    for _workspace in application_manager.workspaces:
+      for _display_group in _workspace.display_groups:
+        for _display in _display_group.displays:
+          if "TUIO" in _display.get_touch_protocols():
+            if None == multi_touch_device:
+              device = TUIODevice()
+              device.my_constructor(scenegraphs[0], _display, scenegraphs[0]["/net"], scene_manager, application_manager)
+              multi_touch_device = device
 
 
   # initialize animation manager
@@ -70,25 +83,20 @@ def start():
   #                               , [ application_manager.navigation_list[0]])
 
   ## distribute all nodes in the scenegraph
-  distribute_all_nodes(scenegraphs[0]["/net"], scenegraphs[0]["/net"])
-
-  # run application loop
-  application_manager.run(locals(), globals())
+  with startup_profiler.phase("distribute_subtree"):
+    node_distributor.distribute_subtree(scenegraphs[0]["/net"])
 
-## Registers a scenegraph node and all of its children at a NetMatrixTransform node for distribution.
-# @param NET_TRANS_NODE The NetMatrixTransform node on which all nodes should be marked distributable.
-# @param PARENT_NODE The node that should be registered distributable with all of its children.
-def distribute_all_nodes(NET_TRANS_NODE, NODE):
+  node_distributor.print_statistics()
+  geometry_cache.print_statistics()
+  plod_budget_controller.print_statistics()
+  asset_loader.print_statistics()
 
-  # do not distribute the nettrans node itself
-  if NODE != NET_TRANS_NODE:
-    NET_TRANS_NODE.distribute_object(NODE)
-    #print "distribute", NODE, NODE.Name.value, NODE.Path.value
+  group_name_registry.dump_from_environment()
 
-  # iterate over children and make them distributable
-  for _child in NODE.Children.value:
-    distribute_all_nodes(NET_TRANS_NODE, _child)
+  startup_profiler.finish()
 
+  # run application loop
+  application_manager.run(locals(), globals())
 
 if __name__ == '__main__':
   start()
@@ -3,6 +3,7 @@
 # Usage: start.sh WORKSPACE_CONFIG_FILE [OPTION]
 # OPTION = server: just starts server
 # OPTION = daemon: just starts daemon
+# OPTION = headless: just starts server without server control monitor, see NVF_HEADLESS_* in HeadlessRunner.py
 
 # kill running python on this machine
 if [ "$2" != false ] ; then
@@ -43,7 +44,9 @@ else
 fi
 
 # run program
-if [ "$2" != "server" ] ; then
+if [ "$2" == "headless" ] ; then
+    cd "$DIR" && NVF_HEADLESS=1 python3 ./lib-server/main.py $1 False
+elif [ "$2" != "server" ] ; then
     cd "$DIR" && python3 ./lib-server/main.py $1 True
 else 
 	  cd "$DIR" && python3 ./lib-server/main.py $1 False